@@ -75,7 +75,7 @@ setuptools.setup(
     ],
     install_requires=REQUIRES,
     extras_require={
-        "dev": ["pytest", "parse", "numpy", "pytest-cov"],
+        "dev": ["pytest", "parse", "numpy", "pytest-cov", "asyncpg"],
         "docs": [
             "mkdocs",
             "pygments",
@@ -84,5 +84,6 @@ setuptools.setup(
             "mike",
         ],
         "text_embedding": ["sentence-transformers==2.*"],
+        "async": ["asyncpg"],
     },
 )
@@ -0,0 +1,346 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import vecs
+
+RECORDS = [
+    ("0", [0, 0, 0, 1], {"year": 1990}, "0", 1, 0, 3, 4),
+    ("1", [1, 0, 0, 0], {"year": 1995}, "1", 1, 1, 3, 4),
+    ("2", [1, 1, 0, 0], {"year": 2005}, "2", 1, 2, 3, 4),
+    ("3", [1, 1, 1, 0], {"year": 2001}, "3", 1, 3, 3, 4),
+]
+
+
+async def create_bar(vx: vecs.AsyncClient) -> vecs.AsyncCollection:
+    bar = await vx.get_or_create_collection(name="bar", dimension=4)
+    await bar.upsert(RECORDS)
+    await bar.create_index(measure=vecs.IndexMeasure.cosine_distance)
+    return bar
+
+
+def test_async_collection(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            assert vx.vector_version.count(".") >= 2
+
+            bar = await vx.get_or_create_collection(name="bar", dimension=4)
+            assert repr(bar) == 'vecs.AsyncCollection(name="bar", dimension=4)'
+
+            await bar.upsert(RECORDS)
+            await bar.upsert(RECORDS, method="copy")
+            assert await bar.count() == 4
+
+            # same dimension resolves to the existing collection
+            await vx.get_or_create_collection(name="bar", dimension=4)
+            assert len(await vx.list_collections()) == 1
+
+            fetched = await bar.fetch(["1", "3", "missing"])
+            assert sorted(x[0] for x in fetched) == ["1", "3"]
+
+            with pytest.warns(UserWarning):
+                res = await bar.query(data=[1, 0, 0, 0], limit=2)
+            assert res == ["1", "2"]
+
+            await bar.create_index(measure=vecs.IndexMeasure.cosine_distance)
+            assert await bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+            with pytest.raises(vecs.exc.ArgError):
+                await bar.create_index(replace=False)
+
+            res = await bar.query(
+                data=[1, 0, 0, 0],
+                limit=3,
+                filters={"year": {"$gte": 2000}},
+                include_value=True,
+                include_metadata=True,
+            )
+            assert [x[0] for x in res] == ["2", "3"]
+            assert res[0][2] == {"year": 2005}
+
+            assert sorted(await bar.delete(filters={"year": {"$lt": 2000}})) == [
+                "0",
+                "1",
+            ]
+            assert await bar.delete(ids=["2"]) == ["2"]
+            assert await bar.count() == 1
+
+            with pytest.raises(vecs.exc.MismatchedDimension):
+                await vx.get_or_create_collection(name="bar", dimension=5)
+
+            await vx.delete_collection("bar")
+            assert await vx.list_collections() == []
+
+    asyncio.run(run())
+
+
+def test_async_binary_vectors(clean_db: str) -> None:
+    async def run() -> None:
+        vx = await vecs.create_async_client(clean_db, binary_vectors=True)
+        try:
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((10, 8)).astype(np.float32)
+            await docs.upsert(
+                [
+                    (f"vec{ix}", vec, {}, None, None, None)
+                    for ix, vec in enumerate(vectors)
+                ],
+                method="copy",
+            )
+            [record] = await docs.fetch(["vec4"])
+            assert np.array_equal(record[1], vectors[4])
+
+            await docs.create_index()
+            res = await docs.query(data=vectors[4], limit=1, include_vector=True)
+            assert res[0][0] == "vec4"
+            assert np.array_equal(res[0][1], vectors[4])
+        finally:
+            await vx.disconnect()
+
+    asyncio.run(run())
+
+
+def test_async_query_many(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            res = await bar.query_many(data=[[1, 0, 0, 0], [0, 1, 1, 0]], limit=2)
+            assert res == [["1", "2"], ["3", "2"]]
+            assert await bar.query_many(data=[], limit=2) == []
+
+    asyncio.run(run())
+
+
+def test_async_ivfflat_sampled_build(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((10, 8))
+            await docs.upsert(
+                [(f"vec{ix}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)]
+            )
+
+            await docs.create_index(
+                method=vecs.IndexMethod.ivfflat,
+                index_arguments=vecs.IndexArgsIVFFlat(n_lists=2, sample_size=4),
+            )
+            assert await docs.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+            assert await docs.count() == 10
+            assert await docs.query(data=vectors[4], limit=1, probes=2) == ["vec4"]
+
+    asyncio.run(run())
+
+
+def test_async_create_index_concurrently(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((10, 8))
+            await docs.upsert(
+                [(f"vec{ix}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)]
+            )
+            await docs.create_index(method=vecs.IndexMethod.ivfflat)
+
+            progress = []
+            await docs.create_index(
+                method=vecs.IndexMethod.hnsw,
+                concurrently=True,
+                maintenance_work_mem="64MB",
+                progress=progress.append,
+            )
+            # the index it replaces is dropped once the new one is valid
+            assert "hnsw" in await docs.index()
+            assert len((await vx._collection_info("docs")).indexes) == 1
+            assert await docs.query(data=vectors[4], limit=1) == ["vec4"]
+
+    asyncio.run(run())
+
+
+def test_async_tenant_indexes(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            assert await bar.create_tenant_indexes(min_records=1) == [4]
+            assert "app4" in await bar.index_for_measure(app_id=4)
+            assert await bar.query(data=[1, 0, 0, 0], limit=2, app_id=4) == ["1", "2"]
+            assert await bar.query(data=[1, 0, 0, 0], limit=2, app_id=5) == []
+
+            # tenants with an index are skipped
+            assert await bar.create_tenant_indexes(min_records=1) == []
+
+    asyncio.run(run())
+
+
+def test_async_query_filtered(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((100, 8))
+            await docs.upsert(
+                [
+                    (f"vec{ix}", vec, {"even": ix % 2 == 0}, "", 0, ix)
+                    for ix, vec in enumerate(vectors)
+                ]
+            )
+            await docs.create_index(method=vecs.IndexMethod.hnsw)
+
+            res = await docs.query_filtered(
+                data=vectors[4],
+                limit=3,
+                filters={"even": {"$eq": True}},
+                ef_search=1,
+                include_metadata=True,
+            )
+            assert len(res.results) == 3
+            assert res.results[0][0] == "vec4"
+            assert all(x[1] == {"even": True} for x in res.results)
+
+    asyncio.run(run())
+
+
+def test_async_rerank(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((100, 8))
+            await docs.upsert(
+                [(f"vec{ix}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)]
+            )
+            await docs.create_index(method=vecs.IndexMethod.hnsw)
+
+            res = await docs.query(
+                data=vectors[4], limit=2, include_value=True, rerank=3
+            )
+            assert len(res) == 2
+            assert res[0][0] == "vec4"
+            assert abs(res[0][1]) < 1e-6
+            assert res[0][1] <= res[1][1]
+
+    asyncio.run(run())
+
+
+def test_async_query_within(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            res = [
+                x
+                async for x in bar.query_within(
+                    data=[1, 0, 0, 0], max_distance=0.5, include_value=True
+                )
+            ]
+            assert [x[0] for x in res] == ["1", "2", "3"]
+            assert all(x[1] <= 0.5 for x in res)
+
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((1500, 8))
+            await docs.upsert(
+                [(f"vec{ix}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)]
+            )
+            await docs.create_index(method=vecs.IndexMethod.hnsw)
+            if not vx._supports_iterative_scan():
+                # an hnsw scan returns at most 1000 records, short of the whole radius
+                with pytest.warns(UserWarning, match="hnsw.ef_search"):
+                    res = [
+                        x
+                        async for x in docs.query_within(
+                            data=vectors[3], max_distance=2.0
+                        )
+                    ]
+                assert len(res) == vecs.collection.HNSW_MAX_EF_SEARCH
+
+    asyncio.run(run())
+
+
+def test_async_query_iter(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            res = [x async for x in bar.query_iter(data=[1, 0, 0, 0], limit=3)]
+            assert res == ["1", "2", "3"]
+            res = [x async for x in bar.query_iter(data=[1, 0, 0, 0], batch_size=1)]
+            assert res == ["1", "2", "3", "0"]
+
+            docs = await vx.get_or_create_collection(name="docs", dimension=8)
+            vectors = np.random.random((1500, 8))
+            await docs.upsert(
+                [(f"vec{ix}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)]
+            )
+            await docs.create_index(method=vecs.IndexMethod.hnsw)
+            if not vx._supports_iterative_scan():
+                # without a limit an hnsw scan returns at most 1000 records
+                with pytest.warns(UserWarning, match="hnsw.ef_search"):
+                    res = [x async for x in docs.query_iter(data=vectors[3])]
+                assert len(res) == vecs.collection.HNSW_MAX_EF_SEARCH
+
+    asyncio.run(run())
+
+
+def test_async_iter_records(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            ids = [x async for x in bar.iter_records(columns=["id"], batch_size=3)]
+            assert ids == ["0", "1", "2", "3"]
+            records = [x async for x in bar.iter_records(allow={"id": ["2", "0"]})]
+            assert [x[0] for x in records] == ["0", "2"]
+            assert records[1][2] == {"year": 2005}
+
+            blocks = [
+                x
+                async for x in bar.iter_records(
+                    filters={"year": {"$gte": 2000}}, columns=["vec"], as_blocks=True
+                )
+            ]
+            assert len(blocks) == 1
+            assert blocks[0].ids == ["2", "3"]
+            assert blocks[0].vectors.shape == (2, 4)
+
+    asyncio.run(run())
+
+
+def test_async_fetch_iter(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            fetched = [x async for x in bar.fetch_iter(["3", "1"], columns=["id"])]
+            assert fetched == ["1", "3"]
+            fetched = [
+                x async for x in bar.fetch_iter(["2", "missing", "0"], batch_size=1)
+            ]
+            assert [x[0] for x in fetched] == ["0", "2"]
+            assert fetched[0][2] == {"year": 1990}
+            with pytest.raises(vecs.exc.ArgError):
+                bar.fetch_iter("abc")
+
+    asyncio.run(run())
+
+
+def test_async_replace_document(clean_db: str) -> None:
+    async def run() -> None:
+        async with await vecs.create_async_client(clean_db) as vx:
+            bar = await create_bar(vx)
+            await bar.upsert([("other", [0, 1, 0, 0], {}, "other", 2, 0)])
+
+            res = await bar.replace_document(
+                1, [("1", [1, 0, 0, 0], {"year": 1995}, "1", 1, 1, 3, 4)]
+            )
+            assert res.unchanged == ["1"] and sorted(res.deleted) == ["0", "2", "3"]
+
+            res = await bar.replace_document(
+                1, [("1", [1, 0, 0, 0], {"year": 1995}, "one", 1, 1, 3, 4)]
+            )
+            assert res.written == ["1"] and res.deleted == []
+            [record] = await bar.fetch(["1"])
+            assert record[3] == "one"
+
+            # ids of another document's records are not taken over
+            with pytest.raises(vecs.exc.ArgError, match="other"):
+                await bar.replace_document(1, [("other", [1, 0, 0, 0], {}, "o", 1, 0)])
+            [record] = await bar.fetch(["other"])
+            assert record[3:5] == ("other", 2)
+            # nor is the rest of the replacement written
+            [record] = await bar.fetch(["1"])
+            assert record[3] == "one"
+
+    asyncio.run(run())
@@ -60,3 +60,100 @@ def test_dispose(client: vecs.Client) -> None:
     # engine.dispose re-creates the connection pool so
     # confirm that the client can still re-connect transparently
     assert len(client.list_collections()) == 1
+
+
+def test_session_settings(clean_db: str) -> None:
+    from sqlalchemy import event, exc, text
+
+    vx = vecs.create_client(
+        clean_db, session_settings={"jit": "off", "work_mem": "8MB"}
+    )
+    docs = vx.get_or_create_collection(name="docs", dimension=2)
+    docs.upsert([("a", [1, 2], {}, "a", 1, 0)])
+    docs.create_index()
+
+    statements = []
+
+    @event.listens_for(vx.engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def n_set_config() -> int:
+        n = sum("set_config" in x for x in statements)
+        statements.clear()
+        return n
+
+    # settings are applied once per connection
+    assert docs.query(data=[1, 2]) == ["a"]
+    assert n_set_config() == 1
+    assert docs.query(data=[1, 2]) == ["a"]
+    assert n_set_config() == 0
+
+    # and re-applied when they change
+    assert docs.query(data=[1, 2], probes=5) == ["a"]
+    assert n_set_config() == 1
+
+    with vx.Session() as sess:
+        assert sess.execute(text("show jit")).scalar() == "off"
+        assert sess.execute(text("show work_mem")).scalar() == "8MB"
+        assert sess.execute(text("show ivfflat.probes")).scalar() == "5"
+
+    # settings applied by a transaction that rolls back are undone, and re-applied later
+    with pytest.raises(exc.StatementError):
+        docs.query(data=[1, 2, 3], probes=6)
+    assert n_set_config() == 1
+    with vx.Session() as sess:
+        assert sess.execute(text("show ivfflat.probes")).scalar() == "5"
+    assert docs.query(data=[1, 2], probes=6) == ["a"]
+    assert n_set_config() == 1
+    with vx.Session() as sess:
+        assert sess.execute(text("show ivfflat.probes")).scalar() == "6"
+
+    vx.disconnect()
+
+
+def test_catalog(client: vecs.Client) -> None:
+    from sqlalchemy import event
+
+    docs = client.get_or_create_collection(name="docs", dimension=2)
+    books = client.get_or_create_collection(name="books", dimension=2)
+    books.create_index(measure=vecs.IndexMeasure.l2_distance)
+
+    # indexes are scoped to their collection
+    assert docs.index is None
+    assert not docs.is_indexed_for_measure(vecs.IndexMeasure.l2_distance)
+    assert books.is_indexed_for_measure(vecs.IndexMeasure.l2_distance)
+
+    statements = []
+
+    @event.listens_for(client.engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # catalog lookups are served from the cache
+    client.get_or_create_collection(name="docs", dimension=2)
+    assert books.index is not None
+    assert statements == []
+
+    # index changes made by other clients are picked up on refresh
+    other = vecs.create_client(client.engine.url.render_as_string(hide_password=False))
+    other.get_or_create_collection(name="docs", dimension=2).create_index()
+    assert not docs.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    client.refresh_catalog()
+    assert docs.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    assert len(statements) == 1
+
+    # collections created by other clients are found without a refresh
+    other.get_or_create_collection(name="movies", dimension=3)
+    other.disconnect()
+    with pytest.raises(vecs.exc.MismatchedDimension):
+        client.get_or_create_collection(name="movies", dimension=4)
+
+
+def test_version_supports_halfvec() -> None:
+    from vecs.client import version_supports_halfvec
+
+    assert version_supports_halfvec("0.7.0")
+    assert version_supports_halfvec("0.10.1")
+    assert not version_supports_halfvec("0.6.2")
+    assert not version_supports_halfvec("")
@@ -87,9 +87,38 @@ def test_fetch(client: vecs.Client) -> None:
     res = movies.fetch(ids=fetch_ids)
     assert len(res) == 2
 
+    # every id is bound as a single array parameter
+    res = movies.fetch(ids=[f"vec{ix}" for ix in range(100)] * 20)
+    assert len(res) == 100
+    assert movies.fetch(ids=[]) == []
+
     # bad input
     with pytest.raises(vecs.exc.ArgError):
         movies.fetch(ids="should_be_a_list")
+    with pytest.raises(vecs.exc.ArgError):
+        movies.fetch(ids=[1, 2])
+
+
+def test_fetch_iter(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    vectors = np.random.random((100, 4)).astype(np.float32)
+    bar.upsert([(f"vec{ix:02}", vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)])
+    fetch_ids = ["vec42", "vec07", "missing", "vec99"]
+
+    # ids are validated on the call, without iterating
+    with pytest.raises(ArgError):
+        bar.fetch_iter(ids="vec07")
+
+    res = list(bar.fetch_iter(ids=fetch_ids, batch_size=2))
+    assert [x[0] for x in res] == ["vec07", "vec42", "vec99"]
+    assert np.allclose(res[0][1], vectors[7])
+
+    res = list(bar.fetch_iter(ids=fetch_ids, columns=["order"]))
+    assert [tuple(x) for x in res] == [("vec07", 7), ("vec42", 42), ("vec99", 99)]
+
+    [block] = bar.fetch_iter(ids=fetch_ids, columns=["vec"], as_blocks=True)
+    assert block.ids == ["vec07", "vec42", "vec99"]
+    assert np.allclose(block.vectors, vectors[[7, 42, 99]])
 
 
 def test_delete(client: vecs.Client) -> None:
@@ -634,6 +663,113 @@ def test_filters_in(client: vecs.Client) -> None:
         )
 
 
+def test_filters_columns(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+
+    records = [
+        ("0", [0, 0, 0, 1], {"year": 1990}, "0", 10, 0, 3, 1),
+        ("1", [1, 0, 0, 0], {"year": 1995}, "1", 10, 1, 3, 1),
+        ("2", [1, 1, 0, 0], {"year": 2005}, "2", 20, 2, None, 2),
+        ("3", [1, 1, 1, 0], {"year": 2001}, "3", 30, 3, 4, None),
+    ]
+    bar.upsert(records)
+    bar.create_index()
+
+    def query(filters):
+        return sorted(bar.query(data=[1, 0, 0, 0], limit=10, filters=filters))
+
+    assert query({"$app_id": {"$eq": 1}}) == ["0", "1"]
+    assert query({"$app_id": {"$ne": 1}}) == ["2"]
+    assert query({"$app_id": {"$eq": None}}) == ["3"]
+    assert query({"$memento_membership": {"$ne": None}}) == ["0", "1", "3"]
+    assert query({"$doc_instance_id": {"$in": [20, 30]}}) == ["2", "3"]
+    assert query({"$order": {"$gte": 2}}) == ["2", "3"]
+    assert query({"$order": {"$lt": 1}}) == ["0"]
+
+    # column and metadata filters combine
+    assert query(
+        {"$and": [{"$doc_instance_id": {"$eq": 10}}, {"year": {"$gt": 1990}}]}
+    ) == ["1"]
+    assert query({"$or": [{"$app_id": {"$eq": 2}}, {"year": {"$eq": 1990}}]}) == [
+        "0",
+        "2",
+    ]
+
+    # keys that do not name a column are metadata keys
+    assert query({"$year": {"$eq": 1990}}) == []
+
+    for filters in [
+        {"$app_id": 1},
+        {"$app_id": {"$eq": "1"}},
+        {"$app_id": {"$eq": True}},
+        {"$app_id": {"$lt": None}},
+        {"$app_id": {"$in": [1, "2"]}},
+        {"$app_id": {"$contains": 1}},
+    ]:
+        with pytest.raises(vecs.exc.FilterError):
+            query(filters)
+
+    assert sorted(bar.delete(filters={"$doc_instance_id": {"$eq": 10}})) == ["0", "1"]
+    assert len(bar) == 2
+
+
+def test_allow_deny_lists(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert(
+        [
+            (str(ix), [ix, 1, 1, 1], {"even": ix % 2 == 0}, "", ix // 10, 0, None, 0)
+            for ix in range(100)
+        ]
+    )
+    bar.create_index()
+
+    def query(**kwargs):
+        return sorted(
+            bar.query(data=[1, 1, 1, 1], limit=100, ef_search=100, **kwargs), key=int
+        )
+
+    allowed = [str(ix) for ix in range(0, 100, 3)] + ["missing"]
+    assert query(allow={"id": allowed}) == allowed[:-1]
+    assert query(allow={"id": []}) == []
+    assert query(allow={"doc_instance_id": [2, 9]}) == [
+        str(ix) for ix in [*range(20, 30), *range(90, 100)]
+    ]
+    assert query(deny={"id": allowed}) == [str(ix) for ix in range(100) if ix % 3 != 0]
+    # records without a value are never denied
+    assert len(query(deny={"memento_membership": [1]})) == 100
+    assert len(query(allow={"memento_membership": [1]})) == 0
+
+    # lists combine with each other and with filters
+    assert query(
+        allow={"id": allowed},
+        deny={"doc_instance_id": [0, 1, 2, 3, 4, 5, 6, 7, 8]},
+        filters={"even": {"$eq": True}},
+    ) == ["90", "96"]
+    assert bar.query_many(
+        data=[[1, 1, 1, 1], [99, 1, 1, 1]], limit=1, allow={"id": ["5", "50"]}
+    ) == [["5"], ["50"]]
+
+    for kwargs in [
+        {"allow": {"text": ["a"]}},
+        {"allow": {"id": "abc"}},
+        {"allow": {"id": [1, 2]}},
+        {"deny": {"doc_instance_id": ["1"]}},
+        {"deny": ["1"]},
+    ]:
+        with pytest.raises(ArgError):
+            query(**kwargs)
+
+    deleted = bar.delete(allow={"doc_instance_id": [0]}, deny={"id": ["1", "2"]})
+    assert sorted(deleted, key=int) == ["0", *map(str, range(3, 10))]
+    assert sorted(
+        bar.delete(filters={"even": {"$eq": True}}, allow={"id": ["10", "11", "12"]})
+    ) == ["10", "12"]
+    assert len(bar) == 90
+
+    with pytest.raises(ArgError):
+        bar.delete(ids=["1"], allow={"id": ["1"]})
+
+
 def test_access_index(client: vecs.Client) -> None:
     dim = 4
     bar = client.get_or_create_collection(name="bar", dimension=dim)
@@ -872,3 +1008,1293 @@ def test_hnsw_unavailable_error(client: vecs.Client) -> None:
     bar = client.get_or_create_collection(name="bar", dimension=dim)
     with pytest.raises(ArgError):
         bar.create_index(method=IndexMethod.hnsw)
+
+
+def test_upsert_copy(client: vecs.Client) -> None:
+    n_records = 1200
+    dim = 384
+
+    movies = client.get_or_create_collection(name="ping", dimension=dim)
+
+    records = [
+        (
+            f"vec{ix}",
+            vec,
+            {"genre": "drama", "title": 'tabs\tnewlines\n and "quotes" \\ too'},
+            "line one\nline two",
+            ix,
+            0,
+            None,
+            4,
+        )
+        for ix, vec in enumerate(np.random.random((n_records, dim)))
+    ]
+
+    movies.upsert(records, method="copy")
+    assert len(movies) == n_records
+
+    _, vec, metadata, text, doc_instance_id, order, memento_membership, app_id = movies[
+        "vec7"
+    ]
+    assert np.allclose(vec, records[7][1])
+    assert metadata == records[7][2]
+    assert text == records[7][3]
+    assert doc_instance_id == 7
+    assert memento_membership is None
+    assert app_id == 4
+
+    # upserting overwrites vec and metadata
+    movies.upsert(
+        [("vec7", np.zeros(dim), {"genre": "action"}, "text", 0, 0, 2, 3)],
+        method=vecs.UpsertMethod.copy,
+    )
+    assert len(movies) == n_records
+    _, vec, metadata, *_ = movies["vec7"]
+    assert not vec.any()
+    assert metadata == {"genre": "action"}
+
+    # records may omit the trailing optional fields
+    movies.upsert([("short", np.ones(dim), {}, None, None, None)], method="copy")
+    assert movies["short"][7] is None
+
+    # missing metadata is stored as an empty object, as with the insert method
+    movies.upsert(
+        [("no_meta", np.ones(dim), None, None, None, None)],
+        method="copy",
+        skip_adapter=True,
+    )
+    assert movies["no_meta"][2] == {}
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert(records, method="does not exist")
+
+
+def test_upsert_parallel(client: vecs.Client) -> None:
+    n_records = 3000
+    dim = 8
+
+    movies = client.get_or_create_collection(name="ping", dimension=dim)
+
+    records = [
+        (f"vec{ix}", vec, {"ix": ix}, "text", 1, ix, None, None)
+        for ix, vec in enumerate(np.random.random((n_records, dim)))
+    ]
+
+    movies.upsert(records, workers=4)
+    assert len(movies) == n_records
+
+    movies.upsert(records, method="copy", workers=3)
+    assert len(movies) == n_records
+
+    # a failing chunk is reported and its worker's transaction is rolled back
+    bad_records = [
+        (f"bad{ix}", np.random.random(dim), {}, "text", 1, ix, None, None)
+        for ix in range(600)
+    ] + [("wrong_dim", [1, 2, 3], {}, "text", 1, 0, None, None)]
+
+    with pytest.raises(vecs.exc.UpsertError) as e:
+        movies.upsert(bad_records, workers=2)
+    assert len(e.value.errors) >= 1
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert(records, workers=0)
+
+
+def test_upsert_arrays(client: vecs.Client, tmp_path) -> None:
+    n_records = 6000
+    dim = 16
+
+    movies = client.get_or_create_collection(name="ping", dimension=dim)
+
+    vectors = np.memmap(
+        tmp_path / "vectors.f32", dtype=np.float32, mode="w+", shape=(n_records, dim)
+    )
+    vectors[:] = np.random.random((n_records, dim))
+    ids = [f"vec{ix}" for ix in range(n_records)]
+
+    movies.upsert_arrays(
+        ids,
+        vectors,
+        metadata=[{"ix": ix} for ix in range(n_records)],
+        text=["chunk\ttext"] * n_records,
+        doc_instance_id=np.arange(n_records),
+        order=np.zeros(n_records, dtype=np.int64),
+        app_id=[None, 7] * (n_records // 2),
+    )
+    assert len(movies) == n_records
+
+    _, vec, metadata, text, doc_instance_id, order, memento_membership, app_id = movies[
+        "vec5001"
+    ]
+    assert np.allclose(vec, vectors[5001])
+    assert metadata == {"ix": 5001}
+    assert text == "chunk\ttext"
+    assert doc_instance_id == 5001
+    assert order == 0
+    assert memento_membership is None
+    assert app_id == 7
+
+    # upserting overwrites and defaults metadata to an empty dict
+    movies.upsert_arrays(["vec0"], np.ones((1, dim), dtype=np.float64), workers=2)
+    _, vec, metadata, *_ = movies["vec0"]
+    assert np.allclose(vec, 1)
+    assert metadata == {}
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert_arrays(ids, vectors[:, :3])
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert_arrays(ids, vectors[:10])
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert_arrays(ids[:1], vectors[:1], text=["a", "b"])
+
+    with pytest.raises(vecs.exc.ArgError):
+        movies.upsert_arrays(ids[:1], vectors[0])
+
+
+@pytest.mark.filterwarnings("ignore:Query does")
+def test_binary_vectors(clean_db: str) -> None:
+    dim = 1536
+
+    with vecs.create_client(clean_db, binary_vectors=True) as client:
+        docs = client.get_or_create_collection(name="docs", dimension=dim)
+
+        vectors = np.random.random((20, dim)).astype(np.float32)
+        records = [
+            (f"vec{ix}", vec, {"ix": ix}, "text", ix, 0, None, 1)
+            for ix, vec in enumerate(vectors)
+        ]
+        docs.upsert(records, method="copy")
+        assert len(docs) == 20
+
+        id_, vec, metadata, *_ = docs["vec3"]
+        assert id_ == "vec3"
+        assert metadata == {"ix": 3}
+        assert vec.dtype == np.float32
+        assert np.array_equal(vec, vectors[3])
+
+        res = docs.query(data=vectors[3], limit=2, include_vector=True)
+        assert res[0][0] == "vec3"
+        assert np.array_equal(res[0][1], vectors[3])
+
+        with pytest.raises(vecs.exc.ArgError):
+            docs.upsert([("bad", [1, 2, 3], {}, None, None, None)], method="copy")
+
+        # missing metadata is stored as an empty object, as with the insert method
+        docs.upsert(
+            [("no_meta", vectors[0], None, None, None, None)],
+            method="copy",
+            skip_adapter=True,
+        )
+        assert docs["no_meta"][2] == {}
+
+
+@pytest.mark.filterwarnings("ignore:Query does")
+def test_query_include_vector(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert([("a", [1, 2, 3, 4], {}, "a", 1, 0, 3, 4)])
+
+    res = bar.query(data=[1, 2, 3, 4], limit=1, include_value=True, include_vector=True)
+    assert len(res[0]) == 3
+    assert np.array_equal(res[0][2], [1, 2, 3, 4])
+
+
+def test_query_many(client: vecs.Client) -> None:
+    dim = 4
+    bar = client.get_or_create_collection(name="bar", dimension=dim)
+    records = [
+        (f"vec{ix}", vec, {"even": ix % 2 == 0}, f"text{ix}", ix, ix, ix, ix)
+        for ix, vec in enumerate(np.random.random((100, dim)))
+    ]
+    bar.upsert(records)
+
+    queries = [records[3][1], records[40][1].tolist(), records[77][1]]
+    res = bar.query_many(data=queries, limit=5)
+    assert len(res) == 3
+    for query_vec, query_res in zip(queries, res):
+        assert query_res == bar.query(data=query_vec, limit=5)
+
+    res = bar.query_many(data=queries, limit=2, include_value=True)
+    assert [x[0][0] for x in res] == ["vec3", "vec40", "vec77"]
+    assert all(abs(x[0][1]) < 1e-6 for x in res)
+    assert all(x[0][1] <= x[1][1] for x in res)
+
+    res = bar.query_many(
+        data=queries,
+        limit=3,
+        filters={"even": {"$eq": True}},
+        include_metadata=True,
+        include_text=True,
+    )
+    assert all(r[1] == {"even": True} for x in res for r in x)
+    assert res[1][0][0] == "vec40"
+    assert res[1][0][-1] == "text40"
+
+    assert bar.query_many(data=[]) == []
+
+    with pytest.raises(vecs.exc.ArgError):
+        bar.query_many(data=queries, limit=1001)
+
+
+def test_query_stmt_cache(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert(
+        [
+            ("0", [1, 0, 0, 0], {"a": 1}, "0", 1, 0, 3, 4),
+            ("1", [0, 1, 0, 0], {"a": 2}, "1", 1, 0, 3, 4),
+            ("2", [0, 0, 1, 0], {"a": 3}, "2", 1, 0, 3, 4),
+        ]
+    )
+    bar.create_index()
+
+    # statements of the same shape are reused regardless of the filter values
+    assert bar.query(data=[1, 0, 0, 0], filters={"a": {"$in": [1]}}) == ["0"]
+    n_compiled = len(client.engine._compiled_cache)
+    assert bar.query(data=[0, 1, 0, 0], filters={"a": {"$in": [2, 3]}}) == ["1", "2"]
+    assert bar.query(data=[0, 0, 1, 0], filters={"a": {"$in": [3, 4, 5]}}) == ["2"]
+    assert len(bar._stmt_cache) == 1
+    assert len(client.engine._compiled_cache) == n_compiled
+
+    # a different shape is cached separately
+    assert bar.query(data=[0, 0, 1, 0], filters={"a": {"$gte": 2}}) == ["2", "1"]
+    assert len(bar._stmt_cache) == 2
+
+
+def test_ivfflat_sampled_build(client: vecs.Client) -> None:
+    from sqlalchemy import text
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    records = [
+        (f"vec{ix}", vec, {"ix": ix}, f"text{ix}", ix, ix, ix, ix)
+        for ix, vec in enumerate(np.random.random((1000, 4)))
+    ]
+    bar.upsert(records)
+
+    def index_names():
+        with client.Session() as sess:
+            return (
+                sess.execute(
+                    text("select indexname from pg_indexes where tablename = 'bar'")
+                )
+                .scalars()
+                .all()
+            )
+
+    indexes_before = index_names()
+
+    bar.create_index(
+        method=IndexMethod.ivfflat,
+        measure=vecs.IndexMeasure.l2_distance,
+        index_arguments=IndexArgsIVFFlat(n_lists=4, sample_size=50),
+    )
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.l2_distance)
+    assert len(bar) == 1000
+
+    # the primary key and column indexes survive the rebuild
+    l2_index = bar.index_for_measure(vecs.IndexMeasure.l2_distance)
+    assert sorted(index_names()) == sorted(indexes_before + [l2_index])
+    bar.upsert([("vec0", [1, 1, 1, 1], {"ix": -1}, "", 0, 0, 0, 0)])
+    assert len(bar) == 1000
+    assert bar.query(
+        data=[1, 1, 1, 1], limit=1, measure="l2_distance", include_metadata=True
+    )[0][:2] == ("vec0", {"ix": -1})
+
+    # collections no larger than the sample are indexed in place
+    bar.create_index(
+        method=IndexMethod.ivfflat,
+        measure=vecs.IndexMeasure.cosine_distance,
+        index_arguments=IndexArgsIVFFlat(n_lists=4, sample_size=1000),
+    )
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    assert sorted(index_names()) == sorted(
+        indexes_before + [l2_index, bar.index_for_measure("cosine_distance")]
+    )
+
+    # other vector indexes survive a sampled rebuild
+    bar.create_index(
+        method=IndexMethod.ivfflat,
+        measure=vecs.IndexMeasure.l2_distance,
+        index_arguments=IndexArgsIVFFlat(n_lists=4, sample_size=50),
+    )
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    assert bar.index_for_measure(vecs.IndexMeasure.l2_distance) != l2_index
+    assert len(index_names()) == len(indexes_before) + 2
+
+
+def test_ivfflat_default_build_in_place(client: vecs.Client) -> None:
+    from sqlalchemy import text
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert(
+        [
+            (f"vec{ix}", vec, {}, "", 0, ix)
+            for ix, vec in enumerate(np.random.random((2000, 4)))
+        ]
+    )
+
+    def table_oid():
+        with client.Session() as sess:
+            return sess.execute(text("select 'vecs.bar'::regclass::oid")).scalar()
+
+    # pgvector already samples 50 records per list, so the default sample needs no rebuild
+    oid = table_oid()
+    bar.create_index(method=IndexMethod.ivfflat)
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    assert table_oid() == oid
+
+    assert not bar._needs_sampled_build(2000, 30, 1500, None)
+    assert not bar._needs_sampled_build(2000, 30, 100, 5)
+    assert not bar._needs_sampled_build(80, 4, 100, None)
+    assert bar._needs_sampled_build(2000, 30, 100, None)
+
+    # the sample is shuffled before it is cut to size
+    ddl = bar._sampled_build_ddl("shadow", 0.1, 100, "", [])
+    assert "order by random()" in ddl[1]
+
+    # a smaller sample rebuilds the table
+    bar.create_index(
+        method=IndexMethod.ivfflat,
+        index_arguments=IndexArgsIVFFlat(n_lists=4, sample_size=50),
+    )
+    assert table_oid() != oid
+    assert len(bar) == 2000
+
+
+def test_ivfflat_sampled_build_keeps_table_state(client: vecs.Client) -> None:
+    from sqlalchemy import text
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert(
+        [
+            (f"vec{ix}", vec, {}, "", 0, ix)
+            for ix, vec in enumerate(np.random.random((500, 4)))
+        ]
+    )
+
+    with client.Session() as sess:
+        with sess.begin():
+            sess.execute(
+                text(
+                    """
+                    do $$ begin
+                      if not exists (select 1 from pg_roles where rolname = 'vecs_reader') then
+                        create role vecs_reader;
+                      end if;
+                    end $$;
+                    grant select on vecs.bar to vecs_reader;
+                    grant update (metadata) on vecs.bar to vecs_reader;
+                    alter table vecs.bar enable row level security;
+                    create policy app_only on vecs.bar for select to vecs_reader
+                      using (app_id = 1);
+                    create function vecs.touch() returns trigger language plpgsql
+                      as 'begin return new; end';
+                    create trigger bar_touch before update on vecs.bar
+                      for each row execute function vecs.touch();
+                    comment on table vecs.bar is 'movies';
+                    """
+                )
+            )
+
+    def table_state():
+        with client.Session() as sess:
+            return sess.execute(
+                text(
+                    """
+                    select
+                      has_table_privilege('vecs_reader', 'vecs.bar', 'select'),
+                      has_column_privilege('vecs_reader', 'vecs.bar', 'metadata', 'update'),
+                      has_table_privilege('vecs_reader', 'vecs.bar', 'update'),
+                      c.relrowsecurity,
+                      (select string_agg(polname, ',') from pg_policy where polrelid = c.oid),
+                      (select string_agg(tgname, ',') from pg_trigger
+                        where tgrelid = c.oid and not tgisinternal),
+                      obj_description(c.oid, 'pg_class')
+                    from pg_class c
+                    where c.oid = 'vecs.bar'::regclass
+                    """
+                )
+            ).one()
+
+    state_before = table_state()
+    assert state_before == (True, True, False, True, "app_only", "bar_touch", "movies")
+
+    bar.create_index(
+        method=IndexMethod.ivfflat,
+        index_arguments=IndexArgsIVFFlat(n_lists=4, sample_size=50),
+    )
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+    assert table_state() == state_before
+
+
+def test_create_index_concurrently(client: vecs.Client, monkeypatch) -> None:
+    from sqlalchemy import text
+
+    import vecs.collection
+
+    monkeypatch.setattr(vecs.collection, "INDEX_PROGRESS_INTERVAL", 0.001)
+
+    bar = client.get_or_create_collection(name="bar", dimension=32)
+    bar.upsert(
+        [
+            (f"vec{ix}", vec, {}, "", 0, 0, 0, 0)
+            for ix, vec in enumerate(np.random.random((2000, 32)))
+        ]
+    )
+
+    def vector_indexes():
+        with client.Session() as sess:
+            return (
+                sess.execute(
+                    text(
+                        "select indexname from pg_indexes where tablename = 'bar' and indexname like 'ix_vector%'"
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+    bar.create_index(method=IndexMethod.ivfflat)
+    assert vector_indexes() == [bar.index]
+
+    reports: list = []
+    bar.create_index(
+        method=IndexMethod.hnsw,
+        concurrently=True,
+        maintenance_work_mem="128MB",
+        max_parallel_maintenance_workers=0,
+        progress=reports.append,
+    )
+    assert reports
+    assert all(isinstance(x.phase, str) for x in reports)
+
+    # the previous index is replaced once the new one is built
+    assert vector_indexes() == [bar.index]
+    assert "hnsw" in bar.index
+    assert bar.is_indexed_for_measure(vecs.IndexMeasure.cosine_distance)
+
+    # build settings do not outlive the build
+    with client.engine.connect() as conn:
+        assert conn.execute(text("show maintenance_work_mem")).scalar() != "128MB"
+
+    with pytest.raises(ArgError):
+        bar.create_index(concurrently=True, replace=False)
+
+    with pytest.raises(ArgError):
+        bar.create_index(max_parallel_maintenance_workers=-1)
+
+
+def test_multiple_indexes(client: vecs.Client) -> None:
+    import warnings
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    bar.upsert(
+        [
+            (f"vec{ix}", vec, {}, "", 0, 0, 0, 0)
+            for ix, vec in enumerate(np.random.random((100, 4)))
+        ]
+    )
+    assert bar.index_for_measure() is None
+
+    bar.create_index(method=IndexMethod.hnsw)
+    bar.create_index(
+        method=IndexMethod.ivfflat, measure=vecs.IndexMeasure.max_inner_product
+    )
+    cosine_index = bar.index_for_measure(vecs.IndexMeasure.cosine_distance)
+    ip_index = bar.index_for_measure("max_inner_product")
+    assert "hnsw" in cosine_index
+    assert "ivfflat" in ip_index
+    assert bar.index_for_measure(vecs.IndexMeasure.l2_distance) is None
+    assert bar.index_for_measure("invalid") is None
+
+    # both measures are served by an index
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        bar.query(data=[1, 0, 0, 0], limit=1, measure="cosine_distance")
+        bar.query(data=[1, 0, 0, 0], limit=1, measure="max_inner_product")
+
+    # replacing is scoped to the index's measure
+    with pytest.raises(ArgError):
+        bar.create_index(
+            method=IndexMethod.hnsw,
+            measure=vecs.IndexMeasure.max_inner_product,
+            replace=False,
+        )
+    bar.create_index(
+        method=IndexMethod.hnsw, measure=vecs.IndexMeasure.l2_distance, replace=False
+    )
+    bar.create_index(method=IndexMethod.hnsw, measure=vecs.IndexMeasure.cosine_distance)
+    assert bar.index_for_measure("cosine_distance") not in (None, cosine_index)
+    assert bar.index_for_measure("max_inner_product") == ip_index
+    assert len(client._collection_info("bar").indexes) == 3
+
+
+def test_tenant_indexes(client: vecs.Client) -> None:
+    import warnings
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    app_ids = [1] * 300 + [2] * 50 + [None] * 50
+    bar.upsert(
+        [
+            (f"vec{ix}", vec, {}, "", 0, 0, 0, app_id)
+            for ix, (vec, app_id) in enumerate(
+                zip(np.random.random((len(app_ids), 4)), app_ids)
+            )
+        ]
+    )
+    bar.create_index(method=IndexMethod.hnsw)
+    global_index = bar.index_for_measure()
+
+    assert bar.create_tenant_indexes(min_records=100) == [1]
+    assert bar.create_tenant_indexes(min_records=10) == [2]
+    assert bar.create_tenant_indexes(min_records=10) == []
+
+    tenant_index = bar.index_for_measure(app_id=1)
+    assert tenant_index not in (None, global_index)
+    assert "app1" in tenant_index
+    assert bar.index_for_measure(app_id=3) == global_index
+    assert bar.index_for_measure() == global_index
+
+    # a tenant's index is replaced without touching the others
+    bar.create_index(method=IndexMethod.hnsw, app_id=1)
+    assert bar.index_for_measure(app_id=1) not in (None, tenant_index)
+    assert bar.index_for_measure() == global_index
+    with pytest.raises(ArgError):
+        bar.create_index(app_id=2, replace=False)
+
+    # tenants without a partial index are indexed by the ivfflat build in place
+    bar.create_index(
+        method=IndexMethod.ivfflat, measure=vecs.IndexMeasure.l2_distance, app_id=1
+    )
+    assert "app1" in bar.index_for_measure("l2_distance", app_id=1)
+    assert bar.index_for_measure("l2_distance") is None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        res = bar.query(
+            data=[1, 0, 0, 0], limit=400, include_metadata=True, app_id=1, ef_search=400
+        )
+        assert len(res) == 300
+        assert {x[-1] for x in res} == {1}
+        res = bar.query(data=[1, 0, 0, 0], limit=400, include_metadata=True, app_id=3)
+        assert res == []
+        res = bar.query_many(data=[[1, 0, 0, 0], [0, 1, 0, 0]], limit=5, app_id=2)
+        assert [len(x) for x in res] == [5, 5]
+        bar.query(data=[1, 0, 0, 0], limit=1, measure="l2_distance", app_id=1)
+        # filters pinning the tenant are routed to its index as well
+        res = bar.query(
+            data=[1, 0, 0, 0],
+            limit=1,
+            measure="l2_distance",
+            filters={"$and": [{"$app_id": {"$eq": 1}}, {"$order": {"$gte": 0}}]},
+            include_metadata=True,
+        )
+        assert res[0][-1] == 1
+
+    with pytest.warns(UserWarning):
+        bar.query(data=[1, 0, 0, 0], limit=1, measure="l2_distance", app_id=2)
+
+    # the tenant's index serves its queries
+    stmt, *_ = bar._query_stmt(
+        [1, 0, 0, 0], 5, app_id=1, info=client._collection_info("bar")
+    )
+    compiled = stmt.compile(dialect=client.engine.dialect)
+    with client.engine.connect() as conn:
+        conn.exec_driver_sql("analyze vecs.bar")
+        conn.exec_driver_sql("set enable_seqscan = off")
+        plan = (
+            conn.exec_driver_sql(
+                "explain " + str(compiled),
+                {**compiled.params, "query_vec": "[1,0,0,0]"},
+            )
+            .scalars()
+            .all()
+        )
+    assert bar.index_for_measure(app_id=1) in "\n".join(plan)
+
+
+def test_query_filtered(clean_db: str) -> None:
+    from sqlalchemy import text
+
+    vx = vecs.create_client(clean_db, session_settings={"enable_seqscan": "off"})
+    bar = vx.get_or_create_collection(name="bar", dimension=8)
+    bar.upsert(
+        [
+            (str(ix), vec, {"tag": ix % 50}, "", 0, 0, 0, 0)
+            for ix, vec in enumerate(np.random.random((2000, 8)))
+        ]
+    )
+    # no index can evaluate the filter, so it is applied to the vector index's candidates
+    filters = {"tag": {"$gte": 49}}
+
+    bar.create_index(method=IndexMethod.hnsw)
+    assert len(bar.query(data=np.ones(8), limit=10, filters=filters)) < 10
+
+    res = bar.query_filtered(
+        data=np.ones(8), limit=10, filters=filters, include_metadata=True
+    )
+    assert len(res.results) == 10
+    assert all(x[1] == {"tag": 49} for x in res.results)
+    assert res.rounds > 1
+    assert (
+        res.ef_search == 40 * vecs.collection.FILTERED_SEARCH_GROWTH ** (res.rounds - 1)
+        or res.ef_search == vecs.collection.HNSW_MAX_EF_SEARCH
+    )
+
+    # the grown ef_search does not outlive the search
+    with vx.Session() as sess:
+        bar._set_search_params(sess, 10, 40)
+        assert sess.execute(text("show hnsw.ef_search")).scalar() == "40"
+
+    bar.create_index(
+        method=IndexMethod.ivfflat, index_arguments=IndexArgsIVFFlat(n_lists=20)
+    )
+    res = bar.query_filtered(data=np.ones(8), limit=10, filters=filters, probes=1)
+    assert len(res.results) == 10
+    assert res.rounds > 1
+    assert res.probes > 1
+
+    # an exhausted budget returns what was found
+    res = bar.query_filtered(
+        data=np.ones(8), limit=100, filters=filters, probes=1, max_rounds=2
+    )
+    assert res.rounds == 2
+    assert res.probes == 4
+    assert len(res.results) < 100
+
+    with pytest.raises(ArgError):
+        bar.query_filtered(data=np.ones(8), max_rounds=0)
+
+    # pgvector 0.8.0 and later search hnsw indexes with a single iterative scan
+    vx.vector_version = "0.8.0"
+    index = vecs.collection.IndexInfo("ix", "hnsw", "vector_cosine_ops")
+    assert bar._filtered_search_plan(index, 10, 40, 4, 5000) == [(10, 40, 5000)]
+    assert bar._search_settings(10, 40, 5000)["hnsw.iterative_scan"] == "strict_order"
+    assert bar._search_settings(10, 40)["hnsw.iterative_scan"] == "off"
+
+    vx.disconnect()
+
+
+def test_query_filtered_pinned_tenant(client: vecs.Client, monkeypatch) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=8)
+    bar.upsert(
+        [
+            (str(ix), vec, {"tag": ix % 50}, "", 0, 0, 0, 1)
+            for ix, vec in enumerate(np.random.random((2000, 8)))
+        ]
+    )
+    bar.create_index(
+        method=IndexMethod.ivfflat, index_arguments=IndexArgsIVFFlat(n_lists=20)
+    )
+    bar.create_index(method=IndexMethod.hnsw, app_id=1)
+
+    planned = []
+    plan = bar._filtered_search_plan
+    monkeypatch.setattr(
+        bar,
+        "_filtered_search_plan",
+        lambda index, *args: planned.append(index) or plan(index, *args),
+    )
+
+    # the search is planned for the tenant's hnsw index, not the global ivfflat index
+    res = bar.query_filtered(
+        data=np.ones(8),
+        limit=10,
+        filters={"$and": [{"$app_id": {"$eq": 1}}, {"tag": {"$gte": 49}}]},
+    )
+    assert len(res.results) == 10
+    assert [index.name for index in planned] == [bar.index_for_measure(app_id=1)]
+    assert planned[0].method == "hnsw"
+
+
+def test_query_rerank(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=16)
+    vectors = np.random.random((1000, 16)).astype(np.float32)
+    bar.upsert(
+        [
+            (str(ix), vec, {"even": ix % 2 == 0}, f"text{ix}", ix, 0, 0, 0)
+            for ix, vec in enumerate(vectors)
+        ]
+    )
+    query_vec = np.random.random(16)
+
+    for measure in vecs.IndexMeasure:
+        exact = bar.query(data=query_vec, limit=10, measure=measure, include_value=True)
+        reranked = bar.query(
+            data=query_vec, limit=10, measure=measure, include_value=True, rerank=3
+        )
+        assert [x[0] for x in reranked] == [x[0] for x in exact]
+        assert np.allclose([x[1] for x in reranked], [x[1] for x in exact], atol=1e-5)
+
+    # a low ef_search index search recovers recall from the wider candidate pool
+    truth = set(bar.query(data=query_vec, limit=10))
+    bar.create_index(method=IndexMethod.hnsw)
+    plain = bar.query(data=query_vec, limit=10, ef_search=10)
+    reranked = bar.query(data=query_vec, limit=10, ef_search=10, rerank=10)
+    assert len(reranked) == 10
+    assert len(truth.intersection(reranked)) >= len(truth.intersection(plain))
+    assert len(truth.intersection(reranked)) >= 8
+
+    res = bar.query(
+        data=query_vec,
+        limit=3,
+        filters={"even": {"$eq": True}},
+        include_metadata=True,
+        include_text=True,
+        include_vector=True,
+        rerank=4,
+    )
+    assert len(res) == 3
+    for id, metadata, doc_instance_id, order, memento, app_id, txt, vec in res:
+        assert metadata == {"even": True}
+        assert doc_instance_id == int(id)
+        assert txt == f"text{id}"
+        assert np.array_equal(vec, vectors[int(id)])
+
+    with pytest.raises(ArgError):
+        bar.query(data=query_vec, rerank=0)
+
+
+def test_halfvec_storage(client: vecs.Client) -> None:
+    if not client._supports_halfvec():
+        with pytest.raises(ArgError):
+            client.get_or_create_collection(
+                name="half", dimension=4, storage=vecs.VectorStorage.halfvec
+            )
+        with pytest.raises(ArgError):
+            client.get_or_create_collection(name="bar", dimension=4).create_index(
+                half_precision=True
+            )
+        pytest.skip("pgvector < 0.7.0 has no halfvec type")
+
+    half = client.get_or_create_collection(
+        name="half", dimension=4, storage=vecs.VectorStorage.halfvec
+    )
+    assert client._collection_info("half").storage == "halfvec"
+    # the storage of an existing collection is read from the database
+    assert client.get_or_create_collection(name="half").storage == "halfvec"
+    with pytest.raises(ArgError):
+        client.get_or_create_collection(
+            name="half", dimension=4, storage=vecs.VectorStorage.vector
+        )
+
+    vectors = np.random.random((100, 4)).astype(np.float32)
+    records = [(str(ix), vec, {}) for ix, vec in enumerate(vectors)]
+    half.upsert(records[:50])
+    half.upsert(records[50:], method="copy")
+
+    [(id, vec, _, *_)] = half.fetch(["7"])
+    assert vec.dtype == np.float32
+    assert np.allclose(vec, vectors[7], atol=1e-3)
+    assert half.query(data=vectors[7], limit=1) == ["7"]
+
+    half.create_index(method=IndexMethod.hnsw)
+    assert half.index_for_measure().startswith("ix_halfvec_cosine_ops_hnsw")
+    assert half.query(data=vectors[7], limit=1, ef_search=100) == ["7"]
+    assert half.query_many(data=[vectors[7], vectors[8]], limit=1) == [["7"], ["8"]]
+
+    # vector collections can index their vectors at half precision
+    full = client.get_or_create_collection(name="full", dimension=4)
+    full.upsert(records)
+    full.create_index(method=IndexMethod.hnsw, half_precision=True)
+    assert full.index_for_measure().startswith("ix_halfvec_cosine_ops_hnsw")
+    res = full.query(data=vectors[7], limit=1, include_vector=True, rerank=4)
+    assert res[0][0] == "7"
+    assert np.array_equal(res[0][1], vectors[7])
+
+    # the half precision index replaces the full precision index for the measure
+    full.create_index(method=IndexMethod.hnsw)
+    assert full.index_for_measure().startswith("ix_vector_cosine_ops_hnsw")
+    assert len(client._collection_info("full").indexes) == 1
+
+
+def test_half_precision_index_ddl(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    assert client._collection_info("bar").storage == "vector"
+
+    ddl = bar._index_ddl(IndexMethod.hnsw, "halfvec_l2_ops", None)
+    assert "(vec::halfvec(4)) halfvec_l2_ops" in ddl
+    ddl = bar._index_ddl(IndexMethod.hnsw, "vector_l2_ops", None)
+    assert "(vec vector_l2_ops)" in ddl
+
+    half = vecs.Collection("half", 4, client, storage=vecs.VectorStorage.halfvec)
+    ddl = half._index_ddl(IndexMethod.ivfflat, "halfvec_l2_ops", None, 100)
+    assert "(vec halfvec_l2_ops)" in ddl
+
+    with pytest.raises(ArgError):
+        vecs.Collection("half", 4, client, storage="float")
+
+
+def test_half_precision_tenant_index_stmt(client: vecs.Client) -> None:
+    from sqlalchemy.dialects import postgresql
+
+    from vecs.catalog import CollectionInfo, IndexInfo
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    info = CollectionInfo(
+        "bar",
+        4,
+        (
+            IndexInfo(
+                "ix_app1",
+                "hnsw",
+                "halfvec_cosine_ops",
+                predicate="(app_id = 1)",
+                expression="(vec::halfvec(4))",
+            ),
+        ),
+    )
+
+    # the tenant's half precision index is matched whether app_id is passed or pinned by filters
+    for kwargs in ({"app_id": 1}, {"filters": {"$app_id": {"$eq": 1}}}):
+        stmt, _, _, _, _, app_id = bar._query_stmt(
+            [1, 2, 3, 4], limit=3, info=info, **kwargs
+        )
+        assert app_id == 1
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "CAST(vecs.bar.vec AS HALFVEC(4))" in sql
+
+        stmt, *_ = bar._query_many_stmt([[1, 2, 3, 4]], limit=3, info=info, **kwargs)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "CAST(vecs.bar.vec AS HALFVEC(4))" in sql
+
+
+def test_binary_quantized_shortlist_stmt(client: vecs.Client) -> None:
+    from sqlalchemy.dialects import postgresql
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    if not client._supports_binary_quantize():
+        with pytest.raises(ArgError):
+            bar.query(data=[1, 2, 3, 4], shortlist=20)
+        with pytest.raises(ArgError):
+            bar.create_index(binary_quantized=True)
+        client.vector_version = "0.7.0"
+
+    with pytest.raises(ArgError):
+        bar.query(data=[1, 2, 3, 4], limit=10, shortlist=5)
+    with pytest.raises(ArgError):
+        bar.create_index(binary_quantized=True, half_precision=True)
+
+    stmt, _, _, _, ef_search, _ = bar._query_stmt(
+        [1, 2, 3, 4], limit=3, filters={"a": {"$eq": 1}}, shortlist=200
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    # candidates are shortlisted by hamming distance, with the filters applied
+    inner = sql[sql.index("FROM (") :]
+    assert "metadata @>" in inner
+    assert "CAST(binary_quantize(vecs.bar.vec) AS BIT(4)) <~> binary_quantize(" in inner
+    # then ordered by the real measure
+    assert sql.endswith("ORDER BY shortlist.vec <=> %(query_vec)s \n LIMIT %(param_2)s")
+    assert ef_search == 200
+
+    ddl = bar._index_ddl(IndexMethod.hnsw, "bit_hamming_ops", None)
+    assert "((binary_quantize(vec)::bit(4)) bit_hamming_ops)" in ddl
+
+
+def test_binary_quantized_shortlist(client: vecs.Client) -> None:
+    if not client._supports_binary_quantize():
+        pytest.skip("pgvector < 0.7.0 has no binary_quantize")
+
+    bar = client.get_or_create_collection(name="bar", dimension=16)
+    vectors = np.random.random((1000, 16)) - 0.5
+    bar.upsert(
+        [
+            (str(ix), vec, {"even": ix % 2 == 0}, "", 0, ix)
+            for ix, vec in enumerate(vectors)
+        ]
+    )
+
+    bar.create_index(method=IndexMethod.hnsw)
+    bar.create_index(method=IndexMethod.hnsw, binary_quantized=True)
+    info = client._collection_info("bar")
+    assert sorted(ix.ops for ix in info.indexes) == [
+        "bit_hamming_ops",
+        "vector_cosine_ops",
+    ]
+    # the binary quantized index does not serve a measure directly
+    assert bar.index_for_measure().startswith("ix_vector_cosine_ops")
+    assert bar.index == bar.index_for_measure()
+
+    query_vec = vectors[7]
+    res = bar.query(data=query_vec, limit=5, shortlist=100, include_value=True)
+    assert res[0][0] == "7"
+    assert [x[1] for x in res] == sorted(x[1] for x in res)
+
+    res = bar.query(
+        data=query_vec,
+        limit=5,
+        shortlist=100,
+        filters={"even": {"$eq": False}},
+        include_metadata=True,
+    )
+    assert res[0][0] == "7"
+    assert all(x[1] == {"even": False} for x in res)
+
+    # a binary quantized index only replaces another binary quantized index
+    bar.create_index(method=IndexMethod.ivfflat, binary_quantized=True)
+    info = client._collection_info("bar")
+    assert len(info.indexes) == 2
+
+
+def test_prefix_index_stmt(client: vecs.Client) -> None:
+    from sqlalchemy.dialects import postgresql
+
+    from vecs.catalog import IndexInfo
+
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    if not client._supports_subvector():
+        with pytest.raises(ArgError):
+            bar.create_index(prefix_dimension=2)
+        client.vector_version = "0.7.0"
+
+    with pytest.raises(ArgError):
+        bar.query(data=[1, 2, 3, 4], prefix_dimension=2)
+    with pytest.raises(ArgError):
+        bar.query(data=[1, 2, 3, 4], shortlist=20, prefix_dimension=4)
+    with pytest.raises(ArgError):
+        bar.create_index(prefix_dimension=0)
+    with pytest.raises(ArgError):
+        bar.create_index(prefix_dimension=2, binary_quantized=True)
+
+    stmt, _, _, _, ef_search, _ = bar._query_stmt(
+        [1, 2, 3, 4], limit=3, shortlist=50, prefix_dimension=2
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    # candidates are shortlisted by the measure over the prefix
+    inner = sql[sql.index("FROM (") :]
+    assert (
+        "CAST(subvector(vecs.bar.vec, 1, 2) AS VECTOR(2)) <=> "
+        "CAST(subvector(CAST(%(query_vec)s AS VECTOR(4)), 1, 2) AS VECTOR(2))"
+    ) in inner
+    # then ordered by the measure over the whole vectors
+    assert sql.endswith("ORDER BY shortlist.vec <=> %(query_vec)s \n LIMIT %(param_2)s")
+    assert ef_search == 50
+
+    ddl = bar._index_ddl(IndexMethod.hnsw, "vector_l2_ops", None, prefix_dimension=2)
+    assert "((subvector(vec, 1, 2)::vector(2)) vector_l2_ops)" in ddl
+    ddl = bar._index_ddl(IndexMethod.hnsw, "halfvec_l2_ops", None, prefix_dimension=2)
+    assert "((subvector(vec, 1, 2)::halfvec(2)) halfvec_l2_ops)" in ddl
+
+    prefix_index = IndexInfo(
+        "ix", "hnsw", "vector_l2_ops", expression="(subvector(vec, 1, 2)::vector(2))"
+    )
+    assert prefix_index.prefix_dimension == 2
+    assert IndexInfo("ix", "hnsw", "vector_l2_ops").prefix_dimension is None
+
+
+def test_prefix_index(client: vecs.Client) -> None:
+    if not client._supports_subvector():
+        pytest.skip("pgvector < 0.7.0 has no subvector")
+
+    bar = client.get_or_create_collection(name="bar", dimension=16)
+    vectors = np.random.random((1000, 16)) - 0.5
+    bar.upsert([(str(ix), vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)])
+
+    bar.create_index(method=IndexMethod.hnsw)
+    bar.create_index(method=IndexMethod.hnsw, prefix_dimension=4)
+    info = client._collection_info("bar")
+    assert sorted(ix.prefix_dimension or 0 for ix in info.indexes) == [0, 4]
+    # the prefix index does not serve the measure over the whole vectors
+    assert bar.index_for_measure() == next(
+        ix.name for ix in info.indexes if ix.prefix_dimension is None
+    )
+    assert bar.index == bar.index_for_measure()
+
+    query_vec = vectors[7]
+    res = bar.query(
+        data=query_vec, limit=5, shortlist=200, prefix_dimension=4, include_value=True
+    )
+    assert res[0][0] == "7"
+    assert [x[1] for x in res] == sorted(x[1] for x in res)
+
+    # a prefix index only replaces another prefix index
+    bar.create_index(method=IndexMethod.hnsw, prefix_dimension=8)
+    info = client._collection_info("bar")
+    assert sorted(ix.prefix_dimension or 0 for ix in info.indexes) == [0, 8]
+
+
+def test_query_within(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=16)
+    vectors = np.random.random((1000, 16)) - 0.5
+    bar.upsert(
+        [
+            (str(ix), vec, {"even": ix % 2 == 0}, "", 0, ix)
+            for ix, vec in enumerate(vectors)
+        ]
+    )
+    query_vec = vectors[7]
+
+    with pytest.raises(ArgError):
+        bar.query(data=query_vec, max_distance=0.5, min_similarity=0.5)
+    with pytest.raises(ArgError):
+        bar.query(data=query_vec, measure="l2_distance", min_similarity=0.5)
+    with pytest.raises(ArgError):
+        list(bar.query_within(data=query_vec))
+    with pytest.raises(ArgError):
+        list(bar.query_within(data=query_vec, max_distance=0.5, batch_size=0))
+
+    everything = bar.query(data=query_vec, limit=1000, include_value=True)
+    truth = [x[0] for x in everything if x[1] <= 0.5]
+    assert 1 < len(truth) < 1000
+
+    # top-k searches are cut at the radius
+    res = bar.query(data=query_vec, limit=1000, max_distance=0.5)
+    assert res == truth
+    res = bar.query(data=query_vec, limit=1000, min_similarity=0.5)
+    assert res == truth
+    res = bar.query(data=query_vec, limit=5, max_distance=0.5, include_value=True)
+    assert [x[0] for x in res] == truth[:5]
+
+    # radius searches are not limited
+    res = list(bar.query_within(data=query_vec, max_distance=0.5, batch_size=7))
+    assert res == truth
+    res = list(
+        bar.query_within(
+            data=query_vec,
+            min_similarity=0.5,
+            filters={"even": {"$eq": True}},
+            include_value=True,
+            include_metadata=True,
+        )
+    )
+    assert [x[0] for x in res] == [x for x in truth if int(x) % 2 == 0]
+    assert all(x[1] <= 0.5 and x[2] == {"even": True} for x in res)
+
+    res = list(
+        bar.query_within(
+            data=query_vec,
+            max_distance=-0.5,
+            measure="max_inner_product",
+            include_vector=True,
+        )
+    )
+    assert all(np.dot(x[1], query_vec) >= 0.5 - 1e-5 for x in res)
+
+    # the stream can be abandoned part way
+    stream = bar.query_within(data=query_vec, max_distance=0.5, batch_size=2)
+    assert next(stream) == "7"
+    stream.close()
+    assert bar.query(data=query_vec, limit=1) == ["7"]
+
+
+def test_query_within_hnsw(client: vecs.Client) -> None:
+    import warnings
+
+    bar = client.get_or_create_collection(name="bar", dimension=16)
+    vectors = np.random.random((1500, 16)) - 0.5
+    bar.upsert([(str(ix), vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)])
+    query_vec = vectors[7]
+    truth = [
+        x[0]
+        for x in bar.query(data=query_vec, limit=1000, include_value=True)
+        if x[1] <= 0.7
+    ]
+    assert 40 < len(truth) < 1000
+
+    bar.create_index(method=IndexMethod.hnsw)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        res = list(bar.query_within(data=query_vec, max_distance=0.7))
+    # the scan is not cut at the default ef_search of 40
+    assert len(res) > 0.9 * len(truth)
+    assert set(res) <= set(truth)
+
+    if not client._supports_iterative_scan():
+        # an hnsw scan returns at most 1000 records, short of the whole radius
+        with pytest.warns(UserWarning, match="hnsw.ef_search"):
+            res = list(bar.query_within(data=query_vec, max_distance=2.0))
+        assert len(res) == vecs.collection.HNSW_MAX_EF_SEARCH
+
+        # a tenant's index caps the scan when filters pin the tenant
+        tenant = client.get_or_create_collection(name="tenant", dimension=16)
+        tenant.upsert(
+            [(str(ix), vec, {}, "", 0, ix, 0, 1) for ix, vec in enumerate(vectors)]
+        )
+        tenant.create_index(method=IndexMethod.hnsw, app_id=1)
+        with pytest.warns(UserWarning, match="hnsw.ef_search"):
+            res = list(
+                tenant.query_within(
+                    data=query_vec,
+                    max_distance=2.0,
+                    filters={"$app_id": {"$eq": 1}},
+                )
+            )
+
+
+def test_query_iter(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=8)
+    vectors = np.random.random((1500, 8))
+    bar.upsert(
+        [
+            (str(ix), vec, {"even": ix % 2 == 0}, "", 0, ix)
+            for ix, vec in enumerate(vectors)
+        ]
+    )
+    query_vec = vectors[3]
+
+    with pytest.raises(ArgError):
+        list(bar.query_iter(data=query_vec, limit=0))
+    with pytest.raises(ArgError):
+        list(bar.query_iter(data=query_vec, batch_size=0))
+
+    # every record, beyond the 1000 result cap of query
+    res = list(bar.query_iter(data=query_vec, include_value=True, batch_size=128))
+    assert len(res) == 1500
+    assert res[0][0] == "3"
+    assert [x[1] for x in res] == sorted(x[1] for x in res)
+    assert [x[0] for x in res[:10]] == bar.query(data=query_vec, limit=10)
+
+    res = list(
+        bar.query_iter(
+            data=query_vec,
+            limit=1200,
+            filters={"even": {"$eq": False}},
+            include_metadata=True,
+        )
+    )
+    assert len(res) == 750
+    assert all(x[1] == {"even": False} for x in res)
+
+    res = list(bar.query_iter(data=query_vec, limit=5, measure="l2_distance"))
+    assert res == bar.query(data=query_vec, limit=5, measure="l2_distance")
+
+    # the stream can be abandoned part way
+    stream = bar.query_iter(data=query_vec, batch_size=10)
+    assert next(stream) == "3"
+    stream.close()
+
+
+def test_query_iter_hnsw(client: vecs.Client) -> None:
+    import warnings
+
+    bar = client.get_or_create_collection(name="bar", dimension=8)
+    vectors = np.random.random((1500, 8))
+    bar.upsert([(str(ix), vec, {}, "", 0, ix) for ix, vec in enumerate(vectors)])
+    query_vec = vectors[3]
+    bar.create_index(method=IndexMethod.hnsw)
+
+    # the scan is not cut at the default ef_search of 40
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        res = list(bar.query_iter(data=query_vec, limit=500))
+    assert len(res) == 500
+
+    if client._supports_iterative_scan():
+        assert len(list(bar.query_iter(data=query_vec))) > 1000
+    else:
+        # without a limit an hnsw scan returns at most 1000 records, short of the whole table
+        with pytest.warns(UserWarning, match="hnsw.ef_search"):
+            res = list(bar.query_iter(data=query_vec))
+        assert len(res) == vecs.collection.HNSW_MAX_EF_SEARCH
+
+        # a tenant's index caps the scan when filters pin the tenant
+        tenant = client.get_or_create_collection(name="tenant", dimension=8)
+        tenant.upsert(
+            [(str(ix), vec, {}, "", 0, ix, 0, 1) for ix, vec in enumerate(vectors)]
+        )
+        tenant.create_index(method=IndexMethod.hnsw, app_id=1)
+        with pytest.warns(UserWarning, match="hnsw.ef_search"):
+            res = list(
+                tenant.query_iter(data=query_vec, filters={"$app_id": {"$eq": 1}})
+            )
+
+
+def test_iter_records(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=4)
+    vectors = np.random.random((250, 4)).astype(np.float32)
+    bar.upsert(
+        [
+            (f"vec{ix:03}", vec, {"even": ix % 2 == 0}, f"text{ix}", 1, ix)
+            for ix, vec in enumerate(vectors)
+        ]
+    )
+
+    with pytest.raises(ArgError):
+        list(bar.iter_records(batch_size=0))
+    with pytest.raises(ArgError):
+        list(bar.iter_records(columns=["missing"]))
+    with pytest.raises(ArgError):
+        list(bar.iter_records(columns="vec"))
+
+    # every column, in primary key order
+    records = list(bar.iter_records(batch_size=16))
+    assert [x[0] for x in records] == [f"vec{ix:03}" for ix in range(250)]
+    assert np.allclose(records[5][1], vectors[5])
+    assert records[5][2:6] == ({"even": False}, "text5", 1, 5)
+
+    # projected and filtered
+    records = list(
+        bar.iter_records(
+            filters={"even": {"$eq": True}},
+            deny={"id": ["vec000"]},
+            columns=["order", "text"],
+        )
+    )
+    assert len(records) == 124
+    assert tuple(records[0]) == ("vec002", 2, "text2")
+    assert list(bar.iter_records(columns=["id"], allow={"id": ["vec007"]})) == [
+        "vec007"
+    ]
+
+    # numpy blocks
+    blocks = list(
+        bar.iter_records(columns=["vec", "order"], batch_size=100, as_blocks=True)
+    )
+    assert [len(x.ids) for x in blocks] == [100, 100, 50]
+    assert blocks[1].ids[0] == "vec100"
+    assert blocks[1].vectors.dtype == np.float32
+    assert np.allclose(np.concatenate([x.vectors for x in blocks]), vectors)
+    assert blocks[2].columns == {"order": list(range(200, 250))}
+
+    blocks = list(bar.iter_records(columns=["text"], as_blocks=True))
+    assert blocks[0].vectors is None
+    assert len(blocks[0].columns["text"]) == 250
+
+
+def test_replace_document(client: vecs.Client) -> None:
+    bar = client.get_or_create_collection(name="bar", dimension=2)
+    bar.upsert([("other", [1, 1], {}, "other", 2, 0)])
+
+    def chunks(texts, **metadata):
+        return [
+            (f"doc1-{text}", [ix, 1], metadata, text, None, ix)
+            for ix, text in enumerate(texts)
+        ]
+
+    with pytest.raises(ArgError):
+        bar.replace_document("1", chunks(["a"]))
+    with pytest.raises(ArgError):
+        bar.replace_document(1, [("x", [1, 1], {}, "x", 2, 0)])
+    with pytest.raises(ArgError):
+        bar.replace_document(1, [("x", [1, 1], {}, "x", 1, None)])
+    with pytest.raises(ArgError):
+        bar.replace_document(1, chunks(["a", "a"]))
+
+    res = bar.replace_document(1, chunks(["a", "b", "c"]))
+    assert res == vecs.ReplaceDocumentResult(
+        written=["doc1-a", "doc1-b", "doc1-c"], deleted=[], unchanged=[]
+    )
+
+    # an edit writes only the chunks that changed
+    res = bar.replace_document(1, chunks(["a", "B", "c", "d"]))
+    assert res.written == ["doc1-B", "doc1-d"]
+    assert res.deleted == ["doc1-b"]
+    assert res.unchanged == ["doc1-a", "doc1-c"]
+
+    # changed metadata rewrites a chunk, and every column is overwritten
+    res = bar.replace_document(1, chunks(["a", "c"], tag=1))
+    assert res.written == ["doc1-a", "doc1-c"]
+    assert sorted(res.deleted) == ["doc1-B", "doc1-d"]
+    [record] = bar.fetch(["doc1-c"])
+    assert record[2:6] == ({"tag": 1}, "c", 1, 1)
+
+    assert bar.replace_document(1, chunks(["a", "c"], tag=1)).written == []
+
+    # ids of another document's records are not taken over
+    with pytest.raises(ArgError, match="other"):
+        bar.replace_document(1, [*chunks(["a", "c"]), ("other", [1, 1], {}, "o", 1, 2)])
+    [record] = bar.fetch(["other"])
+    assert record[3:6] == ("other", 2, 0)
+    assert bar.replace_document(1, chunks(["a", "c"], tag=1)).written == []
+    assert sorted(bar.replace_document(1, []).deleted) == ["doc1-a", "doc1-c"]
+    assert list(bar.iter_records(columns=["id"])) == ["other"]
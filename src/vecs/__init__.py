@@ -1,11 +1,19 @@
 from vecs import exc
+from vecs.async_client import AsyncClient
+from vecs.async_collection import AsyncCollection
 from vecs.client import Client
 from vecs.collection import (
     Collection,
+    FilteredQueryResult,
     IndexArgsHNSW,
     IndexArgsIVFFlat,
+    IndexBuildProgress,
     IndexMeasure,
     IndexMethod,
+    RecordBlock,
+    ReplaceDocumentResult,
+    UpsertMethod,
+    VectorStorage,
 )
 
 __project__ = "vecs"
@@ -15,14 +23,27 @@ __version__ = "0.4.2"
 __all__ = [
     "IndexArgsIVFFlat",
     "IndexArgsHNSW",
+    "IndexBuildProgress",
+    "FilteredQueryResult",
+    "RecordBlock",
+    "ReplaceDocumentResult",
     "IndexMethod",
     "IndexMeasure",
+    "UpsertMethod",
+    "VectorStorage",
     "Collection",
     "Client",
+    "AsyncCollection",
+    "AsyncClient",
     "exc",
 ]
 
 
-def create_client(connection_string: str) -> Client:
-    """Creates a client from a Postgres connection string"""
-    return Client(connection_string)
+def create_client(connection_string: str, **kwargs) -> Client:
+    """Creates a client from a Postgres connection string. Keyword arguments are passed to `vecs.Client`"""
+    return Client(connection_string, **kwargs)
+
+
+async def create_async_client(connection_string: str, **kwargs) -> AsyncClient:
+    """Creates and connects an async client from a Postgres connection string. Keyword arguments are passed to `vecs.AsyncClient`"""
+    return await AsyncClient(connection_string, **kwargs).connect()
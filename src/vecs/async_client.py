@@ -0,0 +1,284 @@
+"""
+Defines the 'AsyncClient' class
+
+Importing from the `vecs.async_client` directly is not supported.
+All public classes, enums, and functions are re-exported by the top level `vecs` module.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlalchemy import MetaData, make_url, text
+
+from vecs.adapter import Adapter
+from vecs.catalog import CATALOG_QUERY, CollectionInfo, parse_catalog
+from vecs.client import Client, settings_stmt, track_settings
+from vecs.exc import MissingDependency
+
+if TYPE_CHECKING:
+    from vecs.async_collection import AsyncCollection
+    from vecs.collection import VectorStorage
+
+
+class AsyncClient:
+    """
+    The `vecs.AsyncClient` class is the asyncio counterpart of `vecs.Client`. It manages a pool of
+    connections through the asyncpg driver and creates `vecs.AsyncCollection` instances whose
+    `upsert`, `query`, `fetch`, `delete` and `create_index` methods are awaitable.
+
+    Filters, adapters and the underlying tables are shared with `vecs.Client`, so collections created by
+    either client can be used by the other.
+
+    Example usage:
+
+        DB_CONNECTION = "postgresql://<user>:<password>@<host>:<port>/<db_name>"
+
+        async with await vecs.create_async_client(DB_CONNECTION) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=3)
+            await docs.query(data=[0.4, 0.5, 0.6])
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        *,
+        binary_vectors: bool = False,
+        session_settings: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize an AsyncClient instance.
+
+        The connection pool is created immediately but no connection is opened until
+        `AsyncClient.connect` is awaited, which `vecs.create_async_client` does.
+
+        Args:
+            connection_string (str): A string representing the database connection information.
+                The asyncpg driver is used regardless of the driver named in the string.
+            binary_vectors (bool, optional): Whether to move vectors in pgvector's binary format.
+                See `vecs.Client`. Defaults to False.
+            session_settings (Dict[str, Any], optional): PostgreSQL settings applied to connections before
+                they run similarity searches. See `vecs.Client`. Defaults to None.
+
+        Raises:
+            MissingDependency: If the asyncpg library is not installed.
+
+        Returns:
+            None
+        """
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError:
+            raise MissingDependency(
+                "Missing feature vecs[async]. Hint: `pip install 'vecs[async]'`"
+            )
+
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = make_url(connection_string).set(drivername="postgresql+asyncpg")
+
+        self.binary_vectors = binary_vectors
+        self.session_settings = {
+            str(k): str(v) for k, v in (session_settings or {}).items()
+        }
+        self.engine = create_async_engine(url, pool_size=0, pool_pre_ping=True)
+        track_settings(self.engine.sync_engine)
+        self.meta = MetaData(schema="vecs")
+        self.Session = async_sessionmaker(self.engine)
+        self._catalog: Optional[Dict[str, CollectionInfo]] = None
+        self.vector_version: str = ""
+
+    async def connect(self) -> "AsyncClient":
+        """
+        Prepare the database for use by vecs and read the installed pgvector version.
+
+        Returns:
+            AsyncClient: The current instance of the AsyncClient.
+        """
+        async with self.Session() as sess:
+            async with sess.begin():
+                await sess.execute(text("create schema if not exists vecs;"))
+                await sess.execute(text("create extension if not exists vector;"))
+                self.vector_version = (
+                    await sess.execute(
+                        text(
+                            "select installed_version from pg_available_extensions where name = 'vector' limit 1;"
+                        )
+                    )
+                ).scalar_one()
+        return self
+
+    _supports_hnsw = Client._supports_hnsw
+    _supports_iterative_scan = Client._supports_iterative_scan
+    _supports_halfvec = Client._supports_halfvec
+    _supports_binary_quantize = Client._supports_binary_quantize
+    _supports_subvector = Client._supports_subvector
+
+    async def _apply_settings(self, sess, settings: Dict[str, str]) -> None:
+        """
+        PRIVATE
+
+        Applies *settings* and the client's `session_settings` to the session's connection,
+        skipping any the connection already has. See `vecs.Client._apply_settings`.
+
+        Args:
+            sess (AsyncSession): The session to apply the settings to.
+            settings (Dict[str, str]): Setting names and values.
+        """
+        conn = await sess.connection()
+        stmt = settings_stmt(conn.info, {**self.session_settings, **settings})
+        if stmt is not None:
+            await sess.execute(*stmt)
+
+    async def refresh_catalog(self) -> None:
+        """
+        Reloads the client's cache of collections and their indexes from the database.
+
+        See `vecs.Client.refresh_catalog`.
+
+        Returns:
+            None
+        """
+        await self._load_catalog()
+
+    async def _load_catalog(self) -> Dict[str, CollectionInfo]:
+        """
+        PRIVATE
+
+        Loads the catalog of collections and their vector indexes in a single query.
+
+        Returns:
+            Dict[str, CollectionInfo]: The collections keyed by name.
+        """
+        async with self.Session() as sess:
+            catalog = parse_catalog(await sess.execute(CATALOG_QUERY))
+        self._catalog = catalog
+        return catalog
+
+    _invalidate_catalog = Client._invalidate_catalog
+
+    async def _collection_info(self, name: str) -> Optional[CollectionInfo]:
+        """
+        PRIVATE
+
+        Looks up a collection in the catalog. See `vecs.Client._collection_info`.
+
+        Args:
+            name (str): The name of the collection.
+
+        Returns:
+            Optional[CollectionInfo]: The collection, or None if it does not exist.
+        """
+        catalog = self._catalog
+        if catalog is None or name not in catalog:
+            catalog = await self._load_catalog()
+        return catalog.get(name)
+
+    async def get_or_create_collection(
+        self,
+        name: str,
+        *,
+        dimension: Optional[int] = None,
+        adapter: Optional[Adapter] = None,
+        storage: Optional[VectorStorage] = None,
+    ) -> AsyncCollection:
+        """
+        Get a vector collection by name, or create it if no collection with
+        *name* exists.
+
+        Args:
+            name (str): The name of the collection.
+
+        Keyword Args:
+            dimension (int): The dimensionality of the vectors in the collection.
+            adapter (Adapter): The adapter to transform records and queries with.
+            storage (VectorStorage): The precision vectors are stored at. See `vecs.Client.get_or_create_collection`.
+
+        Returns:
+            AsyncCollection: The found or created collection.
+
+        Raises:
+            MismatchedDimension: If the dimension does not match an existing collection's dimension.
+            ArgError: If *storage* does not match an existing collection's storage.
+        """
+        from vecs.async_collection import AsyncCollection
+
+        adapter_dimension = adapter.exported_dimension if adapter else None
+
+        if storage is None:
+            info = await self._collection_info(name)
+            storage = info.storage if info else "vector"  # type: ignore
+
+        collection = AsyncCollection(
+            name=name,
+            dimension=dimension or adapter_dimension,  # type: ignore
+            client=self,
+            adapter=adapter,
+            storage=storage,
+        )
+
+        return await collection._create_if_not_exists()
+
+    async def list_collections(self) -> List["AsyncCollection"]:
+        """
+        List all vector collections.
+
+        Returns:
+            list[AsyncCollection]: A list of all collections.
+        """
+        from vecs.async_collection import AsyncCollection
+
+        return await AsyncCollection._list_collections(self)
+
+    async def delete_collection(self, name: str) -> None:
+        """
+        Delete a vector collection.
+
+        If no collection with requested name exists, does nothing.
+
+        Args:
+            name (str): The name of the collection.
+
+        Returns:
+            None
+        """
+        from vecs.async_collection import AsyncCollection
+
+        await AsyncCollection(name, -1, self)._drop()
+        return
+
+    async def disconnect(self) -> None:
+        """
+        Disconnect the client from the database.
+
+        Returns:
+            None
+        """
+        await self.engine.dispose()
+        return
+
+    async def __aenter__(self) -> "AsyncClient":
+        """
+        Enable use of the 'async with' statement.
+
+        Returns:
+            AsyncClient: The current instance of the AsyncClient.
+        """
+        if not self.vector_version:
+            await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Disconnect the client on exiting the 'async with' statement context.
+
+        Args:
+            exc_type: The exception type, if any.
+            exc_val: The exception value, if any.
+            exc_tb: The traceback, if any.
+
+        Returns:
+            None
+        """
+        await self.disconnect()
+        return
@@ -0,0 +1,1192 @@
+"""
+Defines the 'AsyncCollection' class
+
+Importing from the `vecs.async_collection` directly is not supported.
+All public classes, enums, and functions are re-exported by the top level `vecs` module.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from flupy import flu
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from vecs import collection as collection_module
+from vecs.adapter import AdapterContext
+from vecs.client import set_config_stmt
+from vecs.codec import COPY_COLUMNS, encode_copy_binary_rows, encode_copy_text_row
+from vecs.collection import (
+    BACKEND_PID_QUERY,
+    DOCUMENT_LOCK_QUERY,
+    INDEX_PROGRESS_QUERY,
+    MAINTENANCE_WORK_MEM_QUERY,
+    REBUILD_DDL_QUERY,
+    BaseCollection,
+    FilteredQueryResult,
+    IndexArgsHNSW,
+    IndexArgsIVFFlat,
+    IndexBuildProgress,
+    IndexMeasure,
+    IndexMethod,
+    Metadata,
+    Numeric,
+    Record,
+    RecordBlock,
+    ReplaceDocumentResult,
+    UpsertMethod,
+    VectorStorage,
+    build_filters,
+    build_id_list_clauses,
+    check_replaced_chunks,
+    diff_document,
+    group_query_results,
+    parameterize_id_lists,
+    radius_result,
+    record_block,
+    rerank_results,
+    warn_truncated_scan,
+)
+from vecs.exc import ArgError, MismatchedDimension
+
+if TYPE_CHECKING:
+    from vecs.async_client import AsyncClient
+
+
+class AsyncCollection(BaseCollection):
+    """
+    The `vecs.AsyncCollection` class is the asyncio counterpart of `vecs.Collection`. Its methods
+    accept the same arguments and apply the same filter and adapter semantics, but must be awaited.
+
+    Example usage:
+
+        async with await vecs.create_async_client(DB_CONNECTION) as vx:
+            docs = await vx.get_or_create_collection(name="docs", dimension=3)
+            await docs.upsert([("id1", [1, 1, 1], {"key": "value"})])
+
+    Public Attributes:
+        name: The name of the vector collection.
+        dimension: The dimension of vectors in the collection.
+    """
+
+    client: AsyncClient
+
+    async def count(self) -> int:
+        """
+        Returns the number of vectors in the collection.
+
+        Returns:
+            int: The number of vectors in the collection.
+        """
+        async with self.client.Session() as sess:
+            stmt = select(func.count()).select_from(self.table)
+            return (await sess.execute(stmt)).scalar() or 0
+
+    async def _create_if_not_exists(self) -> "AsyncCollection":
+        """
+        PRIVATE
+
+        Creates a new collection in the database if it doesn't already exist
+
+        Returns:
+            AsyncCollection: The found or created collection.
+        """
+        info = await self.client._collection_info(self.name)
+        collection_dimension = info.dimension if info else None
+
+        reported_dimensions = set(
+            [x for x in [self.dimension, collection_dimension] if x is not None]
+        )
+        if len(reported_dimensions) > 1:
+            raise MismatchedDimension(
+                "Dimensions reported by adapter, dimension, and existing collection do not match"
+            )
+        self._check_storage(info)
+
+        if not collection_dimension:
+            async with self.client.Session() as sess:
+                async with sess.begin():
+                    connection = await sess.connection()
+                    await connection.run_sync(self.table.create)
+                    for ddl in self._column_index_ddl():
+                        await sess.execute(text(ddl))
+            self.client._invalidate_catalog()
+
+        return self
+
+    async def _drop(self) -> "AsyncCollection":
+        """
+        PRIVATE
+
+        Deletes the collection from the database.
+
+        Returns:
+            AsyncCollection: The deleted collection.
+        """
+        from sqlalchemy.schema import DropTable
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await sess.execute(DropTable(self.table, if_exists=True))
+        self.client._invalidate_catalog()
+
+        return self
+
+    @classmethod
+    async def _list_collections(cls, client: "AsyncClient") -> List["AsyncCollection"]:
+        """
+        PRIVATE
+
+        Retrieves all collections from the database.
+
+        Args:
+            client (AsyncClient): The database client.
+
+        Returns:
+            List[AsyncCollection]: A list of all existing collections.
+        """
+        catalog = await client._load_catalog()
+        return [
+            cls(info.name, info.dimension, client, storage=info.storage)
+            for info in catalog.values()
+        ]
+
+    async def upsert(
+        self,
+        records: Iterable[Tuple[str, Any, Metadata]],
+        skip_adapter: bool = False,
+        method: Union[UpsertMethod, str] = UpsertMethod.insert,
+    ) -> None:
+        """
+        Inserts or updates *vectors* records in the collection.
+
+        See `vecs.Collection.upsert`.
+
+        Args:
+            records (Iterable[Tuple[str, Any, Metadata]]): An iterable of content to upsert.
+            skip_adapter (bool): Should the adapter be skipped while upserting.
+            method (Union[UpsertMethod, str], optional): The strategy used to write records. Defaults to 'insert'.
+
+        Raises:
+            ArgError: If an invalid upsert method is used.
+        """
+        try:
+            umethod = UpsertMethod(method)
+        except ValueError:
+            raise ArgError("Invalid upsert method")
+
+        chunk_size = 500 if umethod == UpsertMethod.insert else 5000
+
+        if skip_adapter:
+            pipeline = flu(records).chunk(chunk_size)
+        else:
+            # Construct a lazy pipeline of steps to transform and chunk user input
+            pipeline = flu(self.adapter(records, AdapterContext("upsert"))).chunk(
+                chunk_size
+            )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                staging_table = None
+                if umethod == UpsertMethod.copy:
+                    staging_table, ddl = self._staging_table()
+                    await sess.execute(text(ddl))
+
+                for chunk in pipeline:
+                    if staging_table is None:
+                        stmt = postgresql.insert(self.table).values(chunk)
+                        await sess.execute(self._on_conflict_update(stmt))
+                        continue
+
+                    if self.client.binary_vectors:
+                        copy_format = "binary"
+                        payload = encode_copy_binary_rows(
+                            chunk,
+                            self.dimension,
+                            self.storage == VectorStorage.halfvec,
+                        )
+                    else:
+                        copy_format = "text"
+                        payload = (
+                            encode_copy_text_row(record, self.dimension).encode("utf-8")
+                            for record in chunk
+                        )
+
+                    connection = await sess.connection()
+                    raw_connection = await connection.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+                    await driver_connection.execute(f'truncate "{staging_table.name}"')
+                    await driver_connection.copy_to_table(
+                        staging_table.name,
+                        source=_aiter(payload),
+                        columns=COPY_COLUMNS,
+                        format=copy_format,
+                    )
+                    await sess.execute(self._merge_staging_stmt(staging_table))
+        return None
+
+    async def fetch(self, ids: Iterable[str]) -> List[Record]:
+        """
+        Fetches vectors from the collection by their identifiers in a single statement.
+
+        See `vecs.Collection.fetch`.
+
+        Args:
+            ids (Iterable[str]): An iterable of vector identifiers.
+
+        Returns:
+            List[Record]: A list of the fetched vectors.
+        """
+        ids = self._id_list(ids)
+        if not ids:
+            return []
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                result = await sess.execute(self._fetch_stmt(), {"allow_id": ids})
+                return result.fetchall()
+
+    def fetch_iter(
+        self,
+        ids: Iterable[str],
+        *,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+        as_blocks: bool = False,
+    ) -> AsyncIterator[Union[Record, str, RecordBlock]]:
+        """
+        Streams records from the collection by their identifiers, in primary key order.
+
+        See `vecs.Collection.fetch_iter` for a description of the arguments.
+
+        Returns:
+            AsyncIterator[Union[Record, str, RecordBlock]]: The fetched records, in the forms yielded
+                by `iter_records`.
+
+        Raises:
+            ArgError: If *ids* is invalid, on the call rather than on the first record.
+        """
+        return self.iter_records(
+            allow={"id": self._id_list(ids)},
+            columns=columns,
+            batch_size=batch_size,
+            as_blocks=as_blocks,
+        )
+
+    async def delete(
+        self,
+        ids: Optional[Iterable[str]] = None,
+        filters: Optional[Metadata] = None,
+        *,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+    ) -> List[str]:
+        """
+        Deletes vectors from the collection by matching filters or ids.
+
+        See `vecs.Collection.delete` for a description of the arguments.
+
+        Returns:
+            List[str]: A list of the identifiers of the deleted vectors.
+        """
+        has_filters = filters is not None or allow is not None or deny is not None
+
+        if ids is None and not has_filters:
+            raise ArgError("Either ids or filters must be provided.")
+
+        if ids is not None and has_filters:
+            raise ArgError("Either ids or filters must be provided, not both.")
+
+        ids = [] if ids is None else self._id_list(ids)
+        filters = filters or {}
+        id_list_shape, id_list_params = parameterize_id_lists(allow, deny)
+        del_ids = []
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                if ids:
+                    result = await sess.execute(
+                        self._delete_ids_stmt(), {"allow_id": ids}
+                    )
+                    del_ids.extend(result.scalars().fetchall())
+
+                if filters or id_list_shape:
+                    clauses = build_id_list_clauses(self.table, id_list_shape)
+                    if filters:
+                        clauses.insert(0, build_filters(self.table.c.metadata, filters))
+                    stmt = (
+                        delete(self.table).where(*clauses).returning(self.table.c.id)  # type: ignore
+                    )
+                    del_ids.extend(
+                        (await sess.execute(stmt, id_list_params)).scalars().fetchall()
+                    )
+
+        return del_ids
+
+    async def replace_document(
+        self,
+        doc_instance_id: int,
+        chunks: Iterable[Tuple[Any, ...]],
+        skip_adapter: bool = False,
+    ) -> ReplaceDocumentResult:
+        """
+        Replaces the stored chunks of a document with *chunks*, writing only what changed.
+
+        See `vecs.Collection.replace_document` for a description of the arguments.
+
+        Returns:
+            ReplaceDocumentResult: The ids of the chunks written, deleted and left unchanged.
+        """
+        records = self._document_chunks(doc_instance_id, chunks, skip_adapter)
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await sess.execute(
+                    DOCUMENT_LOCK_QUERY, {"key": f"vecs.{self.name}:{doc_instance_id}"}
+                )
+                stored = (
+                    await sess.execute(
+                        self._stored_chunks_stmt(), {"doc_instance_id": doc_instance_id}
+                    )
+                ).fetchall()
+                writes, deletes, unchanged = diff_document(records, stored)
+                if deletes:
+                    await sess.execute(self._delete_ids_stmt(), {"allow_id": deletes})
+                for chunk in flu(writes).chunk(500):
+                    written = await sess.execute(self._replace_chunks_stmt(chunk))
+                    check_replaced_chunks(chunk, written.scalars().all())
+
+        return ReplaceDocumentResult(
+            written=[record[0] for record in writes],
+            deleted=deletes,
+            unchanged=unchanged,
+        )
+
+    async def iter_records(
+        self,
+        filters: Optional[Metadata] = None,
+        *,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+        as_blocks: bool = False,
+    ) -> AsyncIterator[Union[Record, str, RecordBlock]]:
+        """
+        Streams every record in the collection, or every record matching *filters*, *allow* and *deny*,
+        in primary key order.
+
+        See `vecs.Collection.iter_records` for a description of the arguments.
+
+        Yields:
+            Union[Record, str, RecordBlock]: Each record, or with *as_blocks*, each batch of records.
+        """
+        stmt, params = self._iter_records_stmt(
+            filters, allow, deny, columns, batch_size
+        )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                result = await sess.stream(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                )
+                async for rows in result.partitions():
+                    if as_blocks:
+                        yield record_block(rows, list(result.keys()))
+                    else:
+                        for row in rows:
+                            yield str(row[0]) if len(row) == 1 else row
+
+    async def query(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        shortlist: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+        rerank: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Union[List[Record], List[str]]:
+        """
+        Executes a similarity search in the collection.
+
+        See `vecs.Collection.query` for a description of the arguments.
+
+        Returns:
+            Union[List[Record], List[str]]: The result of the similarity search.
+        """
+        info = await self.client._collection_info(self.name)
+        stmt, params, imeasure, probes, ef_search, _ = self._query_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            shortlist=shortlist,
+            prefix_dimension=prefix_dimension,
+            rerank=rerank,
+            max_distance=max_distance,
+            min_similarity=min_similarity,
+            info=info,
+        )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await self._set_search_params(sess, probes, ef_search)
+                if len(stmt.selected_columns) == 1:
+                    return [
+                        str(x) for x in (await sess.scalars(stmt, params)).fetchall()
+                    ]
+                rows = (await sess.execute(stmt, params)).fetchall()
+
+        if rerank is not None:
+            return rerank_results(
+                rows,
+                params["query_vec"],
+                imeasure,
+                limit,
+                include_value,
+                include_vector,
+            )
+        return rows or []
+
+    async def query_many(
+        self,
+        data: Iterable[Union[Iterable[Numeric], Any]],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+    ) -> List[Union[List[Tuple[Any, ...]], List[str]]]:
+        """
+        Executes a similarity search for each of a batch of query vectors in a single statement.
+
+        See `vecs.Collection.query_many` for a description of the arguments.
+
+        Returns:
+            List[Union[List[Tuple], List[str]]]: One result list per query vector, in the order of *data*.
+        """
+        info = await self.client._collection_info(self.name)
+        stmt, params, n_queries, imeasure, probes, ef_search = self._query_many_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+
+        if n_queries == 0:
+            return []
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await self._set_search_params(sess, probes, ef_search)
+                rows = (await sess.execute(stmt, params)).fetchall()
+
+        return group_query_results(rows, n_queries)
+
+    async def query_filtered(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        max_rounds: int = 4,
+        max_scan_tuples: int = 20000,
+    ) -> FilteredQueryResult:
+        """
+        Executes a similarity search that widens its candidate pool until it finds *limit* results.
+
+        See `vecs.Collection.query_filtered` for a description of the arguments.
+
+        Returns:
+            FilteredQueryResult: The results, and the number of rounds and the search parameters it took to find them.
+        """
+        if max_rounds < 1:
+            raise ArgError("max_rounds must be >= 1")
+
+        info = await self.client._collection_info(self.name)
+        stmt, params, imeasure, probes, ef_search, app_id = self._query_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+        plan = self._filtered_search_plan(
+            self._index_for(info, imeasure, app_id),
+            probes,
+            ef_search,
+            max_rounds,
+            max_scan_tuples,
+        )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                for rounds, (probes, ef_search, scan_tuples) in enumerate(plan, 1):
+                    await self._set_search_params(sess, probes, ef_search, scan_tuples)
+                    if len(stmt.selected_columns) == 1:
+                        results: Union[List[Record], List[str]] = [
+                            str(x)
+                            for x in (await sess.scalars(stmt, params)).fetchall()
+                        ]
+                    else:
+                        results = (await sess.execute(stmt, params)).fetchall() or []
+                    if len(results) >= limit:
+                        break
+
+        return FilteredQueryResult(results, rounds, probes, ef_search)
+
+    async def query_iter(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        limit: Optional[int] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        batch_size: int = 100,
+        max_scan_tuples: int = 20000,
+    ) -> AsyncIterator[Union[Record, str]]:
+        """
+        Streams the results of a similarity search, nearest first, without the 1000 result cap of `query`.
+
+        See `vecs.Collection.query_iter` for a description of the arguments.
+
+        Yields:
+            Union[Record, str]: The results, in the form returned by `query`.
+        """
+        stmt, params, probes, ef_search, scan_cap = self._query_iter_stmt(
+            data,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            limit=limit,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            batch_size=batch_size,
+            info=await self.client._collection_info(self.name),
+        )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await self._set_search_params(sess, probes, ef_search, max_scan_tuples)
+                result = await sess.stream(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                )
+                n_results = 0
+                async for row in result:
+                    yield str(row[0]) if len(row) == 1 else row
+                    n_results += 1
+                    if n_results == limit:
+                        break
+                else:
+                    warn_truncated_scan(scan_cap, n_results)
+                await result.close()
+
+    async def query_within(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        batch_size: int = 100,
+        max_scan_tuples: int = 20000,
+    ) -> AsyncIterator[Union[Record, str]]:
+        """
+        Streams every record within a distance of the query vector, nearest first.
+
+        See `vecs.Collection.query_within` for a description of the arguments.
+
+        Yields:
+            Union[Record, str]: The records within the radius, in the form returned by `query`.
+        """
+        stmt, params, radius, probes, ef_search, scan_cap = self._query_within_stmt(
+            data,
+            max_distance,
+            min_similarity,
+            filters,
+            measure,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            batch_size=batch_size,
+            info=await self.client._collection_info(self.name),
+        )
+
+        async with self.client.Session() as sess:
+            async with sess.begin():
+                await self._set_search_params(sess, probes, ef_search, max_scan_tuples)
+                result = await sess.stream(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                )
+                n_rows = 0
+                async for row in result:
+                    if row[1] > radius:
+                        # closing the cursor ends the index scan
+                        break
+                    yield radius_result(row, include_value)
+                    n_rows += 1
+                else:
+                    warn_truncated_scan(scan_cap, n_rows)
+                await result.close()
+
+    async def _set_search_params(
+        self,
+        sess,
+        probes: int,
+        ef_search: int,
+        max_scan_tuples: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Applies the index search parameters to the session's connection.
+
+        Args:
+            sess (AsyncSession): A session with an open transaction.
+            probes (int): Number of ivfflat index lists to query.
+            ef_search (int): Size of the dynamic candidate list for HNSW index search.
+            max_scan_tuples (Optional[int]): Enables iterative HNSW index scans, see `_search_settings`.
+        """
+        await self.client._apply_settings(
+            sess, self._search_settings(probes, ef_search, max_scan_tuples)
+        )
+
+    async def index(self) -> Optional[str]:
+        """
+        PRIVATE
+
+        Note:
+            This method is private and expected to undergo refactoring.
+            Do not rely on it's output.
+
+        Retrieves the SQL name of the collection's vector index, if it exists.
+        Binary quantized and prefix indexes, which only shortlist candidates, are skipped.
+        When a collection has several vector indexes, the first by name is returned.
+
+        Returns:
+            Optional[str]: The name of the index, or None if no index exists.
+        """
+        return self._index_name(await self.client._collection_info(self.name))
+
+    async def index_for_measure(
+        self,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        app_id: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Retrieves the SQL name of the vector index that serves queries for a distance measure.
+
+        See `vecs.Collection.index_for_measure`.
+
+        Args:
+            measure (IndexMeasure | str, optional): The measure to find an index for. Defaults to 'cosine_distance'.
+            app_id (Optional[int], optional): The tenant queries are restricted to. Defaults to None.
+
+        Returns:
+            Optional[str]: The name of the index, or None if no index covers the measure.
+        """
+        index = self._index_for(
+            await self.client._collection_info(self.name), measure, app_id  # type: ignore
+        )
+        return None if index is None else index.name
+
+    async def is_indexed_for_measure(self, measure: IndexMeasure) -> bool:
+        """
+        Checks if the collection is indexed for a specific measure.
+
+        Args:
+            measure (IndexMeasure): The measure to check for.
+
+        Returns:
+            bool: True if the collection is indexed for the measure, False otherwise.
+        """
+        return self._indexed_for(await self.client._collection_info(self.name), measure)
+
+    async def create_index(
+        self,
+        measure: IndexMeasure = IndexMeasure.cosine_distance,
+        method: IndexMethod = IndexMethod.auto,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]] = None,
+        replace=True,
+        *,
+        concurrently: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+        max_parallel_maintenance_workers: Optional[int] = None,
+        progress: Optional[Callable[[IndexBuildProgress], None]] = None,
+        app_id: Optional[int] = None,
+        half_precision: bool = False,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        Creates an index for the collection.
+
+        See `vecs.Collection.create_index`.
+
+        Args:
+            measure (IndexMeasure, optional): The measure to index for. Defaults to 'cosine_distance'.
+            method (IndexMethod, optional): The indexing method to use. Defaults to 'auto'.
+            index_arguments: (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments
+            replace (bool, optional): Whether to replace the existing index for *measure*. Defaults to True.
+            concurrently (bool, optional): Whether to build the index without blocking writes. Defaults to False.
+            maintenance_work_mem (str, optional): Memory available to the build, e.g. '2GB'.
+            max_parallel_maintenance_workers (int, optional): Parallel workers available to the build.
+            progress (Callable[[IndexBuildProgress], None], optional): Called periodically, from the
+                event loop, with the progress of the build.
+            app_id (int, optional): Restricts the index to the records of a single tenant. Defaults to None.
+            half_precision (bool, optional): Whether to index a `vector` collection's vectors cast to `halfvec`,
+                halving the size of the index. The table keeps full precision vectors, so `query(..., rerank=k)`
+                can restore their exact order. Indexes on `halfvec` collections are always half precision.
+                Defaults to False.
+            binary_quantized (bool, optional): Whether to index the vectors binary quantized, for
+                `query(..., shortlist=n)`. The index serves every measure, and replaces only other binary
+                quantized indexes. Defaults to False.
+            prefix_dimension (int, optional): Index only the first *prefix_dimension* dimensions of the
+                vectors, for `query(..., shortlist=n, prefix_dimension=...)`. A prefix index coexists with the
+                index for *measure*, and replaces only the measure's other prefix index. Defaults to None.
+
+        Raises:
+            ArgError: If an invalid index method is used, or if *replace* is False and an index for *measure* already exists.
+        """
+        method, ops = self._resolve_index_method(
+            measure,
+            method,
+            index_arguments,
+            half_precision,
+            binary_quantized,
+            prefix_dimension,
+        )
+        build_settings = self._build_settings(
+            maintenance_work_mem, max_parallel_maintenance_workers
+        )
+
+        # Indexes may have been created or dropped by other clients
+        self.client._invalidate_catalog()
+        replaces = self._replaced_indexes(
+            await self.client._collection_info(self.name), ops, app_id, prefix_dimension
+        )
+
+        if replaces and not replace:
+            raise ArgError(f"replace is set to False but an index exists for {measure}")
+
+        try:
+            if concurrently:
+                await self._create_index_concurrently(
+                    method,
+                    ops,
+                    index_arguments,
+                    replaces,
+                    build_settings,
+                    progress,
+                    app_id,
+                    prefix_dimension,
+                )
+                return None
+
+            async with self.client.Session() as sess:
+                async with sess.begin():
+                    if build_settings:
+                        await sess.execute(
+                            *set_config_stmt(build_settings, is_local=True)
+                        )
+                    pid = (await sess.execute(BACKEND_PID_QUERY)).scalar()
+
+                    async with self._report_index_progress(pid, progress):
+                        for index_name in replaces:
+                            await sess.execute(text(f'drop index vecs."{index_name}";'))
+
+                        if method == IndexMethod.ivfflat:
+                            await self._create_ivfflat_index(
+                                sess,
+                                ops,
+                                index_arguments,  # type: ignore
+                                app_id,
+                                prefix_dimension,
+                            )
+                        else:
+                            await sess.execute(
+                                text(
+                                    self._index_ddl(
+                                        method,
+                                        ops,
+                                        index_arguments,
+                                        app_id=app_id,
+                                        prefix_dimension=prefix_dimension,
+                                    )
+                                )
+                            )
+        finally:
+            self.client._invalidate_catalog()
+
+        return None
+
+    async def create_tenant_indexes(
+        self,
+        min_records: int,
+        measure: IndexMeasure = IndexMeasure.cosine_distance,
+        method: IndexMethod = IndexMethod.auto,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]] = None,
+        *,
+        concurrently: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+        max_parallel_maintenance_workers: Optional[int] = None,
+        half_precision: bool = False,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Creates a partial index for each tenant with at least *min_records* records that does not have one.
+
+        See `vecs.Collection.create_tenant_indexes`.
+
+        Returns:
+            List[int]: The `app_id` of each tenant an index was created for.
+
+        Raises:
+            ArgError: If an invalid index method is used.
+        """
+        method, ops = self._resolve_index_method(
+            measure,
+            method,
+            index_arguments,
+            half_precision,
+            binary_quantized,
+            prefix_dimension,
+        )
+
+        async with self.client.Session() as sess:
+            app_ids = (
+                (await sess.execute(self._large_tenants_stmt(min_records)))
+                .scalars()
+                .all()
+            )
+
+        self.client._invalidate_catalog()
+        info = await self.client._collection_info(self.name)
+
+        created = []
+        for app_id in app_ids:
+            if self._replaced_indexes(info, ops, app_id, prefix_dimension):
+                continue
+            await self.create_index(
+                measure,
+                method,
+                index_arguments,
+                concurrently=concurrently,
+                maintenance_work_mem=maintenance_work_mem,
+                max_parallel_maintenance_workers=max_parallel_maintenance_workers,
+                app_id=app_id,
+                half_precision=half_precision,
+                binary_quantized=binary_quantized,
+                prefix_dimension=prefix_dimension,
+            )
+            created.append(app_id)
+        return created
+
+    async def _create_index_concurrently(
+        self,
+        method: IndexMethod,
+        ops: str,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]],
+        replaces: List[str],
+        build_settings: Dict[str, str],
+        progress: Optional[Callable[[IndexBuildProgress], None]],
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Builds a vector index with `create index concurrently`, then drops the indexes it replaces.
+        See `vecs.Collection._create_index_concurrently`.
+        """
+        n_records = None
+        if method == IndexMethod.ivfflat and not index_arguments:
+            async with self.client.Session() as sess:
+                n_records = (await sess.execute(self._count_stmt(app_id))).scalar()
+
+        index_name = self._new_index_name(
+            method, ops, index_arguments, n_records, app_id, prefix_dimension
+        )
+
+        # concurrent builds and drops can not run inside a transaction block
+        async with self.client.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            restore_settings = {}
+            if build_settings:
+                for name in build_settings:
+                    restore_settings[name] = (
+                        await conn.execute(
+                            text("select current_setting(:name)"), {"name": name}
+                        )
+                    ).scalar()
+                await conn.execute(*set_config_stmt(build_settings, is_local=False))
+
+            try:
+                pid = (await conn.execute(BACKEND_PID_QUERY)).scalar()
+                async with self._report_index_progress(pid, progress):
+                    try:
+                        await conn.execute(
+                            text(
+                                self._index_ddl(
+                                    method,
+                                    ops,
+                                    index_arguments,
+                                    n_records,
+                                    index_name=index_name,
+                                    concurrently=True,
+                                    app_id=app_id,
+                                    prefix_dimension=prefix_dimension,
+                                )
+                            )
+                        )
+                    except Exception:
+                        # a failed concurrent build leaves an invalid index behind
+                        await conn.execute(
+                            text(
+                                f'drop index concurrently if exists vecs."{index_name}"'
+                            )
+                        )
+                        raise
+
+                for replaced in replaces:
+                    await conn.execute(
+                        text(f'drop index concurrently if exists vecs."{replaced}"')
+                    )
+            finally:
+                if restore_settings:
+                    await conn.execute(
+                        *set_config_stmt(restore_settings, is_local=False)
+                    )
+
+    @asynccontextmanager
+    async def _report_index_progress(
+        self,
+        pid: int,
+        progress: Optional[Callable[[IndexBuildProgress], None]],
+    ) -> AsyncIterator[None]:
+        """
+        PRIVATE
+
+        Polls the progress of the index build running in backend *pid* from a background
+        task and passes it to *progress* until the context exits.
+        """
+        if progress is None:
+            yield
+            return
+
+        async def poll() -> None:
+            async with self.client.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                while True:
+                    await asyncio.sleep(collection_module.INDEX_PROGRESS_INTERVAL)
+                    row = (
+                        await conn.execute(INDEX_PROGRESS_QUERY, {"pid": pid})
+                    ).fetchone()
+                    if row is not None:
+                        progress(IndexBuildProgress(*row))
+
+        task = asyncio.ensure_future(poll())
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _create_ivfflat_index(
+        self,
+        sess,
+        ops: str,
+        index_arguments: Optional[IndexArgsIVFFlat],
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Creates an ivfflat index, training its centroids on a bounded random sample
+        of the collection's records. See `vecs.Collection.create_index`.
+
+        Args:
+            sess (AsyncSession): A session with an open transaction.
+            ops (str): The pgvector operator class to index.
+            index_arguments (IndexArgsIVFFlat, optional): User supplied index arguments.
+            app_id (int, optional): Restricts the index to the records of a single tenant.
+            prefix_dimension (int, optional): Indexes only this many leading dimensions of the vectors.
+        """
+        n_records = (await sess.execute(self._count_stmt(app_id))).scalar() or 0
+        n_lists = self._ivfflat_n_lists(index_arguments, n_records)
+        sample_size = self._ivfflat_sample_size(
+            n_lists,
+            (await sess.execute(MAINTENANCE_WORK_MEM_QUERY)).scalar(),
+            index_arguments,
+        )
+
+        if not self._needs_sampled_build(n_records, n_lists, sample_size, app_id):
+            await sess.execute(
+                text(
+                    self._index_ddl(
+                        IndexMethod.ivfflat,
+                        ops,
+                        index_arguments,
+                        n_records,
+                        app_id=app_id,
+                        prefix_dimension=prefix_dimension,
+                    )
+                )
+            )
+            return
+
+        # conflicts with itself, so that concurrent builds queue here rather than deadlock
+        # when upgrading to the lock taken by `drop table`
+        await sess.execute(
+            text(f'lock table vecs."{self.table.name}" in share row exclusive mode')
+        )
+        rebuild_ddl = [
+            ddl
+            for _, ddl in await sess.execute(
+                REBUILD_DDL_QUERY, {"table_name": f'vecs."{self.table.name}"'}
+            )
+        ]
+
+        shadow_name = "_vecs_build_" + str(uuid.uuid4()).replace("-", "_")[0:7]
+        index_ddl = self._index_ddl(
+            IndexMethod.ivfflat,
+            ops,
+            index_arguments,
+            n_records,
+            shadow_name,
+            prefix_dimension=prefix_dimension,
+        )
+        # oversample so that the sample is rarely short of sample_size
+        sample_fraction = min(1.0, 2 * sample_size / n_records)
+        for ddl in self._sampled_build_ddl(
+            shadow_name, sample_fraction, sample_size, index_ddl, rebuild_ddl
+        ):
+            await sess.execute(text(ddl))
+
+
+async def _aiter(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    PRIVATE
+
+    Adapts an iterable of encoded `COPY` input to the async iterable asyncpg expects.
+    """
+    for chunk in chunks:
+        yield chunk
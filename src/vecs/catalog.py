@@ -0,0 +1,197 @@
+"""
+Defines the client side cache of the collections and vector indexes in the `vecs` schema
+
+Importing from the `vecs.catalog` directly is not supported.
+Everything in this module is private to `vecs`.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+# Matches the predicate of a per tenant partial index as rendered by `pg_get_expr`,
+# e.g. `(app_id = 5)` or `(app_id = '-5'::integer)`
+APP_ID_PREDICATE = re.compile(r"\(app_id = '?(-?\d+)'?(?:::(?:integer|bigint))?\)")
+
+# Matches the indexed expression of a prefix index as rendered by `pg_get_indexdef`,
+# e.g. `(subvector(vec, 1, 256)::vector(256))`
+PREFIX_EXPRESSION = re.compile(r"subvector\(vec, 1, (\d+)\)")
+
+
+@dataclass(frozen=True)
+class IndexInfo:
+    """
+    PRIVATE
+
+    The definition of a vector index.
+
+    Attributes:
+        name (str): The name of the index.
+        method (str): The index access method, e.g. 'ivfflat' or 'hnsw'.
+        ops (str): The pgvector operator class indexed, e.g. 'vector_cosine_ops'.
+        options (Dict[str, str]): The index build parameters, e.g. `{"lists": "100"}`.
+        predicate (Optional[str]): The `where` clause of a partial index, or None if the index
+            covers the whole table.
+        expression (str): The indexed column or expression, e.g. `vec`.
+    """
+
+    name: str
+    method: str
+    ops: str
+    options: Dict[str, str] = field(default_factory=dict)
+    predicate: Optional[str] = None
+    expression: str = "vec"
+
+    @property
+    def app_id(self) -> Optional[int]:
+        """
+        The tenant covered by a per tenant partial index.
+
+        Returns:
+            Optional[int]: The `app_id` the index is restricted to, or None if the index is
+                not restricted to a single tenant.
+        """
+        match = APP_ID_PREDICATE.fullmatch(self.predicate or "")
+        return None if match is None else int(match.group(1))
+
+    @property
+    def prefix_dimension(self) -> Optional[int]:
+        """
+        The number of leading dimensions indexed by a prefix index.
+
+        Returns:
+            Optional[int]: The length of the indexed prefix of `vec`, or None if the index
+                is not a prefix index.
+        """
+        match = PREFIX_EXPRESSION.search(self.expression)
+        return None if match is None else int(match.group(1))
+
+
+@dataclass(frozen=True)
+class CollectionInfo:
+    """
+    PRIVATE
+
+    The definition of a collection's table.
+
+    Attributes:
+        name (str): The name of the collection.
+        dimension (int): The dimension of the collection's vectors.
+        indexes (Tuple[IndexInfo, ...]): The vector indexes on the collection's table, ordered by name.
+        storage (str): The type of the `vec` column, 'vector' or 'halfvec'.
+    """
+
+    name: str
+    dimension: int
+    indexes: Tuple[IndexInfo, ...] = ()
+    storage: str = "vector"
+
+
+# Loads every collection and its valid vector indexes in a single round trip
+CATALOG_QUERY = text(
+    """
+    select
+        pc.relname as table_name,
+        pa.atttypmod as embedding_dim,
+        pt.typname as storage,
+        vi.index_name,
+        vi.method,
+        vi.ops,
+        vi.options,
+        vi.predicate,
+        vi.expression
+    from
+        pg_class pc
+        join pg_attribute pa
+            on pc.oid = pa.attrelid
+        join pg_type pt
+            on pt.oid = pa.atttypid
+        left join lateral (
+            select
+                ix.relname as index_name,
+                am.amname as method,
+                opc.opcname as ops,
+                ix.reloptions as options,
+                pg_get_expr(pi.indpred, pi.indrelid) as predicate,
+                pg_get_indexdef(pi.indexrelid, 1, true) as expression
+            from
+                pg_index pi
+                join pg_class ix
+                    on ix.oid = pi.indexrelid
+                join pg_am am
+                    on am.oid = ix.relam
+                join pg_opclass opc
+                    on opc.oid = pi.indclass[0]
+            where
+                pi.indrelid = pc.oid
+                -- skips concurrent builds that are in progress or have failed
+                and pi.indisvalid
+                and am.amname in ('ivfflat', 'hnsw')
+        ) vi
+            on true
+    where
+        pc.relnamespace = 'vecs'::regnamespace
+        and pc.relkind = 'r'
+        and pa.attname = 'vec'
+        and not pc.relname ^@ '_'
+    order by
+        pc.relname,
+        vi.index_name
+    """
+)
+
+
+def parse_catalog(rows: Iterable[Any]) -> Dict[str, CollectionInfo]:
+    """
+    PRIVATE
+
+    Builds the catalog from the rows returned by `CATALOG_QUERY`.
+
+    Args:
+        rows (Iterable[Row]): One row per collection and vector index. Collections without
+            a vector index have a single row with NULL index columns.
+
+    Returns:
+        Dict[str, CollectionInfo]: The collections keyed by name.
+    """
+    dimensions: Dict[str, int] = {}
+    storages: Dict[str, str] = {}
+    indexes: Dict[str, List[IndexInfo]] = {}
+    for (
+        table_name,
+        dimension,
+        storage,
+        index_name,
+        method,
+        ops,
+        options,
+        predicate,
+        expression,
+    ) in rows:
+        dimensions[table_name] = dimension
+        storages[table_name] = storage
+        table_indexes = indexes.setdefault(table_name, [])
+        if index_name is not None:
+            table_indexes.append(
+                IndexInfo(
+                    name=index_name,
+                    method=method,
+                    ops=ops,
+                    options=dict(x.split("=", 1) for x in options or []),
+                    predicate=predicate,
+                    expression=expression,
+                )
+            )
+
+    return {
+        name: CollectionInfo(
+            name=name,
+            dimension=dimension,
+            indexes=tuple(indexes[name]),
+            storage=storages[name],
+        )
+        for name, dimension in dimensions.items()
+    }
@@ -7,17 +7,21 @@ All public classes, enums, and functions are re-exported by the top level `vecs`
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from deprecated import deprecated
-from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy import MetaData, create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql.elements import TextClause
 
 from vecs.adapter import Adapter
+from vecs.catalog import CATALOG_QUERY, CollectionInfo, parse_catalog
 from vecs.exc import CollectionNotFound
 
 if TYPE_CHECKING:
-    from vecs.collection import Collection
+    from vecs.collection import Collection, VectorStorage
 
 
 class Client:
@@ -47,19 +51,38 @@ class Client:
         vx.disconnect()
     """
 
-    def __init__(self, connection_string: str):
+    def __init__(
+        self,
+        connection_string: str,
+        *,
+        binary_vectors: bool = False,
+        session_settings: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize a Client instance.
 
         Args:
             connection_string (str): A string representing the database connection information.
+            binary_vectors (bool, optional): Whether to move vectors in pgvector's binary format rather than
+                its text format. Applies to `COPY` based upserts and to vectors returned by `Collection.fetch`
+                and `Collection.query`. Defaults to False.
+            session_settings (Dict[str, Any], optional): PostgreSQL settings applied to connections before
+                they run similarity searches, e.g. `{"jit": "off", "work_mem": "64MB"}`. Like the index search
+                parameters, they are set once per pooled connection and only re-issued when they change.
+                Defaults to None.
 
         Returns:
             None
         """
+        self.binary_vectors = binary_vectors
+        self.session_settings = {
+            str(k): str(v) for k, v in (session_settings or {}).items()
+        }
         self.engine = create_engine(connection_string, pool_size=0, pool_pre_ping=True)
+        track_settings(self.engine)
         self.meta = MetaData(schema="vecs")
         self.Session = sessionmaker(self.engine)
+        self._catalog: Optional[Dict[str, CollectionInfo]] = None
 
         with self.Session() as sess:
             with sess.begin():
@@ -72,13 +95,91 @@ class Client:
                 ).scalar_one()
 
     def _supports_hnsw(self):
-        return (
-            not self.vector_version.startswith("0.4")
-            and not self.vector_version.startswith("0.3")
-            and not self.vector_version.startswith("0.2")
-            and not self.vector_version.startswith("0.1")
-            and not self.vector_version.startswith("0.0")
+        return version_supports_hnsw(self.vector_version)
+
+    def _supports_iterative_scan(self):
+        return version_supports_iterative_scan(self.vector_version)
+
+    def _supports_halfvec(self):
+        return version_supports_halfvec(self.vector_version)
+
+    def _supports_binary_quantize(self):
+        # binary_quantize and the bit operator classes were released alongside halfvec
+        return version_supports_halfvec(self.vector_version)
+
+    def _supports_subvector(self):
+        # subvector was released alongside halfvec
+        return version_supports_halfvec(self.vector_version)
+
+    def _apply_settings(self, sess, settings: Dict[str, str]) -> None:
+        """
+        PRIVATE
+
+        Applies *settings* and the client's `session_settings` to the session's connection,
+        skipping any the connection already has.
+
+        Args:
+            sess (Session): The session to apply the settings to.
+            settings (Dict[str, str]): Setting names and values.
+        """
+        stmt = settings_stmt(
+            sess.connection().info, {**self.session_settings, **settings}
         )
+        if stmt is not None:
+            sess.execute(*stmt)
+
+    def refresh_catalog(self) -> None:
+        """
+        Reloads the client's cache of collections and their indexes from the database.
+
+        The cache is kept up to date with changes made through this client. Call this
+        method to pick up indexes created or dropped by other clients. Collections
+        created by other clients are found without a refresh.
+
+        Returns:
+            None
+        """
+        self._load_catalog()
+
+    def _load_catalog(self) -> Dict[str, CollectionInfo]:
+        """
+        PRIVATE
+
+        Loads the catalog of collections and their vector indexes in a single query.
+
+        Returns:
+            Dict[str, CollectionInfo]: The collections keyed by name.
+        """
+        with self.Session() as sess:
+            catalog = parse_catalog(sess.execute(CATALOG_QUERY))
+        self._catalog = catalog
+        return catalog
+
+    def _invalidate_catalog(self) -> None:
+        """
+        PRIVATE
+
+        Discards the catalog so that it is reloaded when next used. Called after DDL.
+        """
+        self._catalog = None
+
+    def _collection_info(self, name: str) -> Optional[CollectionInfo]:
+        """
+        PRIVATE
+
+        Looks up a collection in the catalog. A name missing from a previously loaded
+        catalog triggers a reload, in case it was created by another client.
+
+        Args:
+            name (str): The name of the collection.
+
+        Returns:
+            Optional[CollectionInfo]: The collection, or None if it does not exist.
+        """
+        catalog = self._catalog
+        if catalog is None or name not in catalog:
+            catalog = self._load_catalog()
+        return catalog.get(name)
 
     def get_or_create_collection(
         self,
@@ -86,6 +187,7 @@ class Client:
         *,
         dimension: Optional[int] = None,
         adapter: Optional[Adapter] = None,
+        storage: Optional[VectorStorage] = None,
     ) -> Collection:
         """
         Get a vector collection by name, or create it if no collection with
@@ -97,22 +199,30 @@ class Client:
         Keyword Args:
             dimension (int): The dimensionality of the vectors in the collection.
             pipeline (int): The dimensionality of the vectors in the collection.
+            storage (VectorStorage): The precision vectors are stored at. Defaults to the existing
+                collection's storage, or 'vector' for a new collection.
 
         Returns:
             Collection: The created collection.
 
         Raises:
             CollectionAlreadyExists: If a collection with the same name already exists
+            ArgError: If *storage* does not match an existing collection's storage.
         """
         from vecs.collection import Collection
 
         adapter_dimension = adapter.exported_dimension if adapter else None
 
+        if storage is None:
+            info = self._collection_info(name)
+            storage = info.storage if info else "vector"  # type: ignore
+
         collection = Collection(
             name=name,
             dimension=dimension or adapter_dimension,  # type: ignore
             client=self,
             adapter=adapter,
+            storage=storage,
         )
 
         return collection._create_if_not_exists()
@@ -152,36 +262,16 @@ class Client:
         """
         from vecs.collection import Collection
 
-        query = text(
-            f"""
-        select
-            relname as table_name,
-            atttypmod as embedding_dim
-        from
-            pg_class pc
-            join pg_attribute pa
-                on pc.oid = pa.attrelid
-        where
-            pc.relnamespace = 'vecs'::regnamespace
-            and pc.relkind = 'r'
-            and pa.attname = 'vec'
-            and not pc.relname ^@ '_'
-            and pc.relname = :name
-        """
-        ).bindparams(name=name)
-        with self.Session() as sess:
-            query_result = sess.execute(query).fetchone()
-
-            if query_result is None:
-                raise CollectionNotFound(
-                    "No collection found with requested name")
+        info = self._collection_info(name)
+        if info is None:
+            raise CollectionNotFound("No collection found with requested name")
 
-            name, dimension = query_result
-            return Collection(
-                name,
-                dimension,
-                self,
-            )
+        return Collection(
+            info.name,
+            info.dimension,
+            self,
+            storage=info.storage,  # type: ignore
+        )
 
     def list_collections(self) -> List["Collection"]:
         """
@@ -245,3 +335,168 @@ class Client:
         """
         self.disconnect()
         return
+
+
+@lru_cache(maxsize=None)
+def version_supports_hnsw(vector_version: str) -> bool:
+    """
+    PRIVATE
+
+    Checks whether a pgvector version supports HNSW indexes.
+
+    Args:
+        vector_version (str): The installed pgvector version.
+
+    Returns:
+        bool: True for pgvector 0.5.0 and later.
+    """
+    return (
+        not vector_version.startswith("0.4")
+        and not vector_version.startswith("0.3")
+        and not vector_version.startswith("0.2")
+        and not vector_version.startswith("0.1")
+        and not vector_version.startswith("0.0")
+    )
+
+
+@lru_cache(maxsize=None)
+def version_supports_iterative_scan(vector_version: str) -> bool:
+    """
+    PRIVATE
+
+    Checks whether a pgvector version supports iterative index scans.
+
+    Args:
+        vector_version (str): The installed pgvector version.
+
+    Returns:
+        bool: True for pgvector 0.8.0 and later.
+    """
+    return version_at_least(vector_version, (0, 8))
+
+
+@lru_cache(maxsize=None)
+def version_supports_halfvec(vector_version: str) -> bool:
+    """
+    PRIVATE
+
+    Checks whether a pgvector version supports the `halfvec` type.
+
+    Args:
+        vector_version (str): The installed pgvector version.
+
+    Returns:
+        bool: True for pgvector 0.7.0 and later.
+    """
+    return version_at_least(vector_version, (0, 7))
+
+
+def version_at_least(vector_version: str, minimum: Tuple[int, int]) -> bool:
+    """
+    PRIVATE
+
+    Compares the major and minor components of a pgvector version with *minimum*.
+
+    Args:
+        vector_version (str): The installed pgvector version.
+        minimum (Tuple[int, int]): The oldest major and minor version that passes.
+
+    Returns:
+        bool: True if the version is *minimum* or later. False if it can not be parsed.
+    """
+    try:
+        major, minor = (int(x) for x in vector_version.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= minimum
+
+
+# Keys of the settings tracked in each pooled connection's `info` dictionary
+_APPLIED_SETTINGS = "vecs_applied_settings"
+_PENDING_SETTINGS = "vecs_pending_settings"
+
+
+def track_settings(engine: Engine) -> None:
+    """
+    PRIVATE
+
+    Registers the event listeners that keep track of the settings applied to an engine's connections.
+
+    Settings are applied at session level, so they outlive the transaction that applies them
+    once it commits, and are undone if it rolls back. They are held as pending until the
+    transaction ends. The `info` dictionary is discarded with the connection, so a
+    replacement connection starts with nothing applied.
+
+    Args:
+        engine (Engine): The engine to track. For an async engine, its `sync_engine`.
+    """
+
+    @event.listens_for(engine, "commit")
+    def on_commit(conn) -> None:
+        pending = conn.info.pop(_PENDING_SETTINGS, None)
+        if pending:
+            conn.info.setdefault(_APPLIED_SETTINGS, {}).update(pending)
+
+    @event.listens_for(engine, "rollback")
+    def on_rollback(conn) -> None:
+        conn.info.pop(_PENDING_SETTINGS, None)
+
+    @event.listens_for(engine.pool, "reset")
+    def on_reset(dbapi_connection, connection_record, reset_state) -> None:
+        connection_record.info.pop(_PENDING_SETTINGS, None)
+
+
+def settings_stmt(
+    info: Dict[str, Any], settings: Dict[str, str]
+) -> Optional[Tuple[TextClause, Dict[str, str]]]:
+    """
+    PRIVATE
+
+    Builds the statement that brings a connection's settings up to date.
+
+    Args:
+        info (Dict[str, Any]): The `info` dictionary of the connection.
+        settings (Dict[str, str]): Setting names and their desired values.
+
+    Returns:
+        Optional[Tuple[TextClause, Dict[str, str]]]: A single `select set_config(...)` statement
+            covering every setting whose value differs from the one applied to the connection,
+            and its parameters. None when the connection is up to date.
+    """
+    applied = {
+        **info.get(_APPLIED_SETTINGS, {}),
+        **info.get(_PENDING_SETTINGS, {}),
+    }
+    changed = {k: v for k, v in settings.items() if applied.get(k) != v}
+    if not changed:
+        return None
+
+    info.setdefault(_PENDING_SETTINGS, {}).update(changed)
+
+    return set_config_stmt(changed, is_local=False)
+
+
+def set_config_stmt(
+    settings: Dict[str, str], is_local: bool
+) -> Tuple[TextClause, Dict[str, str]]:
+    """
+    PRIVATE
+
+    Builds a single statement that applies several settings.
+
+    Args:
+        settings (Dict[str, str]): Setting names and values.
+        is_local (bool): Whether the settings only last until the end of the current transaction.
+
+    Returns:
+        Tuple[TextClause, Dict[str, str]]: A `select set_config(...)` statement and its parameters.
+    """
+    params: Dict[str, str] = {}
+    calls = []
+    for ix, (name, value) in enumerate(sorted(settings.items())):
+        params[f"name_{ix}"] = name
+        params[f"value_{ix}"] = value
+        calls.append(
+            f"set_config(:name_{ix}, :value_{ix}, {'true' if is_local else 'false'})"
+        )
+    return text("select " + ", ".join(calls)), params
@@ -0,0 +1,364 @@
+"""
+Defines encoders and decoders used to move records between Python and PostgreSQL
+
+Importing from the `vecs.codec` directly is not supported.
+Everything in this module is private to `vecs`.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from pgvector.utils import from_db_binary, to_db
+from sqlalchemy.types import UserDefinedType
+
+from vecs.exc import ArgError
+
+# Column order of the rows produced by the encoders in this module. Matches the
+# order of the fields in a record after it has passed through an adapter
+COPY_COLUMNS = [
+    "id",
+    "vec",
+    "metadata",
+    "text",
+    "doc_instance_id",
+    "order",
+    "memento_membership",
+    "app_id",
+]
+
+_COPY_TEXT_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "\t": "\\t",
+        "\n": "\\n",
+        "\r": "\\r",
+    }
+)
+
+
+def pad_record(record: Sequence[Any]) -> List[Any]:
+    """
+    PRIVATE
+
+    Pads a record with trailing None values so that it has one field per
+    column in `COPY_COLUMNS`.
+
+    Args:
+        record (Sequence[Any]): A record with at most one field per column.
+
+    Returns:
+        List[Any]: The padded record.
+
+    Raises:
+        ArgError: If the record has more fields than there are columns.
+    """
+    n_missing = len(COPY_COLUMNS) - len(record)
+    if n_missing < 0:
+        raise ArgError(f"records may have at most {len(COPY_COLUMNS)} fields")
+    return list(record) + [None] * n_missing
+
+
+def copy_text_field(value: Optional[str]) -> str:
+    """
+    PRIVATE
+
+    Escapes a single value for use in a `COPY ... (format text)` row.
+
+    Args:
+        value (Optional[str]): The value to escape. None is encoded as NULL.
+
+    Returns:
+        str: The escaped value.
+    """
+    if value is None:
+        return "\\N"
+    return value.translate(_COPY_TEXT_ESCAPES)
+
+
+def encode_copy_text_row(record: Sequence[Any], dimension: int) -> str:
+    """
+    PRIVATE
+
+    Encodes a record as one line of `COPY ... (format text)` input.
+
+    Args:
+        record (Sequence[Any]): A record with fields ordered like `COPY_COLUMNS`.
+        dimension (int): The dimension of the collection's vectors.
+
+    Returns:
+        str: The encoded line, including the trailing newline.
+    """
+    (
+        id,
+        vec,
+        metadata,
+        text,
+        doc_instance_id,
+        order,
+        memento_membership,
+        app_id,
+    ) = pad_record(record)
+
+    fields = [
+        copy_text_field(str(id)),
+        copy_text_field(to_db(vec, dimension)),
+        copy_text_field(json.dumps(metadata or {})),
+        copy_text_field(text),
+        copy_text_field(None if doc_instance_id is None else str(int(doc_instance_id))),
+        copy_text_field(None if order is None else str(int(order))),
+        copy_text_field(
+            None if memento_membership is None else str(int(memento_membership))
+        ),
+        copy_text_field(None if app_id is None else str(int(app_id))),
+    ]
+    return "\t".join(fields) + "\n"
+
+
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack(">h", -1)
+
+_COPY_BINARY_NULL = struct.pack(">i", -1)
+_COPY_BINARY_TUPLE_HEADER = struct.pack(">h", len(COPY_COLUMNS))
+
+
+def copy_binary_field(value: Optional[bytes]) -> bytes:
+    """
+    PRIVATE
+
+    Frames a single value for use in a `COPY ... (format binary)` tuple.
+
+    Args:
+        value (Optional[bytes]): The value in the column type's binary send format. None is encoded as NULL.
+
+    Returns:
+        bytes: The length prefixed value.
+    """
+    if value is None:
+        return _COPY_BINARY_NULL
+    return struct.pack(">i", len(value)) + value
+
+
+def _binary_bigint(value: Any) -> Optional[bytes]:
+    return None if value is None else struct.pack(">q", int(value))
+
+
+def _binary_jsonb(value: Any) -> Optional[bytes]:
+    # jsonb's binary format is a version byte followed by the json text
+    return None if value is None else b"\x01" + json.dumps(value).encode("utf-8")
+
+
+def _binary_text(value: Any) -> Optional[bytes]:
+    return None if value is None else str(value).encode("utf-8")
+
+
+def _binary_vector(value: Any, dimension: int, half: bool = False) -> Optional[bytes]:
+    # pgvector's binary format is the dimension and an unused int16 followed by big-endian
+    # float4s, or float2s for halfvec
+    if value is None:
+        return None
+    vec = np.asarray(value, dtype=">f2" if half else ">f4")
+    if vec.ndim != 1 or vec.shape[0] != dimension:
+        raise ArgError(f"expected a vector with {dimension} dimensions")
+    return struct.pack(">HH", dimension, 0) + vec.tobytes()
+
+
+def encode_copy_binary_rows(
+    records: Iterable[Sequence[Any]], dimension: int, half: bool = False
+) -> Iterator[bytes]:
+    """
+    PRIVATE
+
+    Encodes records as `COPY ... (format binary)` input.
+
+    Args:
+        records (Iterable[Sequence[Any]]): Records with fields ordered like `COPY_COLUMNS`.
+        dimension (int): The dimension of the collection's vectors.
+        half (bool): Whether to encode vectors for a `halfvec` column.
+
+    Yields:
+        bytes: The header, one encoded tuple per record, then the trailer.
+    """
+    yield COPY_BINARY_HEADER
+    for record in records:
+        (
+            id,
+            vec,
+            metadata,
+            text,
+            doc_instance_id,
+            order,
+            memento_membership,
+            app_id,
+        ) = pad_record(record)
+        yield b"".join(
+            [
+                _COPY_BINARY_TUPLE_HEADER,
+                copy_binary_field(_binary_text(id)),
+                copy_binary_field(_binary_vector(vec, dimension, half)),
+                copy_binary_field(_binary_jsonb(metadata or {})),
+                copy_binary_field(_binary_text(text)),
+                copy_binary_field(_binary_bigint(doc_instance_id)),
+                copy_binary_field(_binary_bigint(order)),
+                copy_binary_field(_binary_bigint(memento_membership)),
+                copy_binary_field(_binary_bigint(app_id)),
+            ]
+        )
+    yield COPY_BINARY_TRAILER
+
+
+def encode_copy_binary_columns(
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    metadata: Optional[Sequence[Any]] = None,
+    text: Optional[Sequence[Optional[str]]] = None,
+    doc_instance_id: Optional[Sequence[Optional[int]]] = None,
+    order: Optional[Sequence[Optional[int]]] = None,
+    memento_membership: Optional[Sequence[Optional[int]]] = None,
+    app_id: Optional[Sequence[Optional[int]]] = None,
+    half: bool = False,
+) -> Iterator[bytes]:
+    """
+    PRIVATE
+
+    Encodes parallel columns of records as `COPY ... (format binary)` input with
+    fields ordered like `COPY_COLUMNS`. Vectors are converted to big-endian float4
+    as one block, so no Python object is created per vector element.
+
+    Args:
+        ids (Sequence[str]): The record identifiers.
+        vectors (np.ndarray): A 2 dimensional array with one row per record.
+        metadata (Optional[Sequence[Any]]): Metadata per record. Defaults to `{}` for every record.
+        text (Optional[Sequence[Optional[str]]]): Text per record.
+        doc_instance_id (Optional[Sequence[Optional[int]]]): Document instance id per record.
+        order (Optional[Sequence[Optional[int]]]): Order per record.
+        memento_membership (Optional[Sequence[Optional[int]]]): Memento membership per record.
+        app_id (Optional[Sequence[Optional[int]]]): App id per record.
+        half (bool): Whether to encode vectors for a `halfvec` column.
+
+    Yields:
+        bytes: The header, one encoded tuple per record, then the trailer.
+    """
+    n_records, dimension = vectors.shape
+    block = np.ascontiguousarray(vectors, dtype=">f2" if half else ">f4")
+    vec_header = struct.pack(">HH", dimension, 0)
+    vec_field_header = struct.pack(">i", len(vec_header) + block.itemsize * dimension)
+
+    yield COPY_BINARY_HEADER
+    for ix in range(n_records):
+        yield b"".join(
+            [
+                _COPY_BINARY_TUPLE_HEADER,
+                copy_binary_field(_binary_text(ids[ix])),
+                vec_field_header,
+                vec_header,
+                block[ix].tobytes(),
+                copy_binary_field(
+                    _binary_jsonb((None if metadata is None else metadata[ix]) or {})
+                ),
+                copy_binary_field(_binary_text(None if text is None else text[ix])),
+                copy_binary_field(
+                    _binary_bigint(
+                        None if doc_instance_id is None else doc_instance_id[ix]
+                    )
+                ),
+                copy_binary_field(_binary_bigint(None if order is None else order[ix])),
+                copy_binary_field(
+                    _binary_bigint(
+                        None if memento_membership is None else memento_membership[ix]
+                    )
+                ),
+                copy_binary_field(
+                    _binary_bigint(None if app_id is None else app_id[ix])
+                ),
+            ]
+        )
+    yield COPY_BINARY_TRAILER
+
+
+class HalfVector(Vector):
+    """
+    PRIVATE
+
+    The SQLAlchemy type of pgvector's `halfvec` columns, which store vectors with 2 byte floats.
+    Values are bound and read in the same text format as `Vector`, and support the same
+    distance operators.
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        if self.dim is None:
+            return "HALFVEC"
+        return "HALFVEC(%d)" % self.dim
+
+
+class BinaryVector(UserDefinedType):
+    """
+    PRIVATE
+
+    A result-only SQLAlchemy type for the output of `vector_send(...)`. Values
+    arrive as bytes and are decoded directly into float32 numpy arrays.
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "BYTEA"
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            return from_db_binary(value)
+
+        return process
+
+
+class CopyReader:
+    """
+    PRIVATE
+
+    A minimal file-like object that lazily concatenates encoded chunks so they
+    can be streamed to `COPY ... FROM STDIN` without materializing the whole
+    payload in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Initializes the reader.
+
+        Args:
+            chunks (Iterable[bytes]): The encoded chunks to stream, in order.
+        """
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._buffer = b""
+        # Drivers wrap exceptions raised during `read`, so the original is kept for re-raising
+        self.error: Optional[Exception] = None
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads up to *size* bytes, or everything that remains when *size* is negative.
+
+        Args:
+            size (int): The maximum number of bytes to return.
+
+        Returns:
+            bytes: The next encoded bytes. An empty bytes object signals the end of the stream.
+        """
+        while size < 0 or len(self._buffer) < size:
+            try:
+                chunk = next(self._chunks, None)
+            except Exception as e:
+                self.error = e
+                raise
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            out, self._buffer = self._buffer, b""
+        else:
+            out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
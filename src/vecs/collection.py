@@ -6,43 +6,84 @@ All public classes, enums, and functions are re-exported by the top level `vecs`
 """
 from __future__ import annotations
 
+import hashlib
 import math
+import queue
+import threading
 import uuid
 import warnings
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 from flupy import flu
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     BIGINT,
     Column,
+    Float,
     MetaData,
     String,
     Table,
     Text,
+    all_,
     and_,
+    any_,
+    bindparam,
     cast,
+    column,
     delete,
     func,
+    literal_column,
     or_,
     select,
+    table,
     text,
+    true,
+    type_coerce,
 )
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
 
 from vecs.adapter import Adapter, AdapterContext, NoOp
+from vecs.catalog import CollectionInfo, IndexInfo
+from vecs.client import set_config_stmt
+from vecs.codec import (
+    COPY_COLUMNS,
+    BinaryVector,
+    CopyReader,
+    HalfVector,
+    encode_copy_binary_columns,
+    encode_copy_binary_rows,
+    encode_copy_text_row,
+    pad_record,
+)
 from vecs.exc import (
     ArgError,
     CollectionAlreadyExists,
-    CollectionNotFound,
     FilterError,
     MismatchedDimension,
     Unreachable,
+    UpsertError,
 )
 
 if TYPE_CHECKING:
+    from vecs.async_client import AsyncClient
     from vecs.client import Client
 
 
@@ -85,6 +126,34 @@ class IndexMeasure(str, Enum):
     max_inner_product = "max_inner_product"
 
 
+class UpsertMethod(str, Enum):
+    """
+    An enum representing the strategies available for writing records.
+
+    Attributes:
+        insert (str): Render each chunk of records as a multi-row `insert ... on conflict` statement.
+        copy (str): Stream each chunk of records into a temporary staging table with `COPY`
+            and merge it into the collection with a single `insert ... select ... on conflict`.
+    """
+
+    insert = "insert"
+    copy = "copy"
+
+
+class VectorStorage(str, Enum):
+    """
+    An enum representing the precisions a collection can store its vectors at.
+
+    Attributes:
+        vector (str): pgvector's `vector` type, with 4 byte floats.
+        halfvec (str): pgvector's `halfvec` type, with 2 byte floats. Halves the size of the
+            collection's table and vector indexes. Requires pgvector 0.7.0 or later.
+    """
+
+    vector = "vector"
+    halfvec = "halfvec"
+
+
 @dataclass
 class IndexArgsIVFFlat:
     """
@@ -93,9 +162,12 @@ class IndexArgsIVFFlat:
 
     Attributes:
         nlist (int): The number of IVF centroids that the index should use
+        sample_size (int): The number of randomly sampled records the centroids are trained on
+            (default: the number pgvector samples, reduced to fit `maintenance_work_mem`)
     """
 
     n_lists: int
+    sample_size: Optional[int] = None
 
 
 @dataclass
@@ -119,6 +191,81 @@ class IndexArgsHNSW:
     ef_construction: Optional[int] = 64
 
 
+@dataclass
+class IndexBuildProgress:
+    """
+    A snapshot of the progress of an index build, as reported by PostgreSQL's
+    `pg_stat_progress_create_index` view.
+
+    Ref: https://www.postgresql.org/docs/current/progress-reporting.html#CREATE-INDEX-PROGRESS-REPORTING
+
+    Attributes:
+        phase (str): The current phase of the build, e.g. 'building index: loading tuples'.
+        blocks_done (int): The number of blocks processed in the current phase.
+        blocks_total (int): The total number of blocks to process in the current phase.
+        tuples_done (int): The number of records processed in the current phase.
+        tuples_total (int): The total number of records to process in the current phase.
+    """
+
+    phase: str
+    blocks_done: int
+    blocks_total: int
+    tuples_done: int
+    tuples_total: int
+
+
+@dataclass
+class FilteredQueryResult:
+    """
+    The result of `Collection.query_filtered`.
+
+    Attributes:
+        results (Union[List[Record], List[str]]): The result of the similarity search, in the form
+            returned by `Collection.query` for the same arguments.
+        rounds (int): The number of searches it took to find *limit* results, or to exhaust the budget.
+        probes (int): The ivfflat probes used by the final search.
+        ef_search (int): The hnsw ef_search used by the final search.
+    """
+
+    results: Union[List[Record], List[str]]
+    rounds: int
+    probes: int
+    ef_search: int
+
+
+@dataclass
+class RecordBlock:
+    """
+    A batch of records streamed by `Collection.iter_records(..., as_blocks=True)`.
+
+    Attributes:
+        ids (List[str]): The identifiers of the records, in primary key order.
+        vectors (Optional[np.ndarray]): A float32 array with one row per record, or None if `vec`
+            was not among the requested columns.
+        columns (Dict[str, List[Any]]): The values of the other requested columns, by column name.
+    """
+
+    ids: List[str]
+    vectors: Optional[np.ndarray]
+    columns: Dict[str, List[Any]]
+
+
+@dataclass
+class ReplaceDocumentResult:
+    """
+    The result of `Collection.replace_document`.
+
+    Attributes:
+        written (List[str]): The identifiers of the chunks inserted or rewritten.
+        deleted (List[str]): The identifiers of the stored chunks deleted.
+        unchanged (List[str]): The identifiers of the chunks left as stored.
+    """
+
+    written: List[str]
+    deleted: List[str]
+    unchanged: List[str]
+
+
 INDEX_MEASURE_TO_OPS = {
     # Maps the IndexMeasure enum options to the SQL ops string required by
     # the pgvector `create index` statement
@@ -127,57 +274,248 @@ INDEX_MEASURE_TO_OPS = {
     IndexMeasure.max_inner_product: "vector_ip_ops",
 }
 
-INDEX_MEASURE_TO_SQLA_ACC = {
-    IndexMeasure.cosine_distance: lambda x: x.cosine_distance,
-    IndexMeasure.l2_distance: lambda x: x.l2_distance,
-    IndexMeasure.max_inner_product: lambda x: x.max_inner_product,
+# The operator classes that index vectors at half precision, either in a halfvec
+# column or cast from a vector column
+INDEX_MEASURE_TO_HALFVEC_OPS = {
+    IndexMeasure.cosine_distance: "halfvec_cosine_ops",
+    IndexMeasure.l2_distance: "halfvec_l2_ops",
+    IndexMeasure.max_inner_product: "halfvec_ip_ops",
 }
 
+# The operator class of binary quantized indexes, which shortlist candidates by the Hamming
+# distance between the signs of their vectors' elements rather than serving a measure
+BINARY_QUANTIZED_OPS = "bit_hamming_ops"
+
+OPS_TO_INDEX_MEASURE = {
+    ops: measure
+    for mapping in (INDEX_MEASURE_TO_OPS, INDEX_MEASURE_TO_HALFVEC_OPS)
+    for measure, ops in mapping.items()
+}
 
-class Collection:
+# Reads the statements that recreate a table's constraints and indexes, including
+# any other vector indexes that coexist with the one being built, and the triggers,
+# ownership, privileges, row level security policies and comment that `create table
+# ... (like ...)` does not copy
+REBUILD_DDL_QUERY = text(
     """
-    The `vecs.Collection` class represents a collection of vectors within a PostgreSQL database with pgvector support.
-    It provides methods to manage (create, delete, fetch, upsert), index, and perform similarity searches on these vector collections.
+    select
+        0 as step,
+        format(
+            'alter table %s add constraint %I %s',
+            con.conrelid::regclass,
+            con.conname,
+            pg_get_constraintdef(con.oid)
+        )
+    from
+        pg_constraint con
+    where
+        con.conrelid = cast(:table_name as regclass)
+        and con.contype in ('p', 'u', 'x')
+    union all
+    select
+        1 as step,
+        pg_get_indexdef(pi.indexrelid)
+    from
+        pg_index pi
+    where
+        pi.indrelid = cast(:table_name as regclass)
+        and not exists (
+            select 1 from pg_constraint con
+            where con.conrelid = pi.indrelid and con.conindid = pi.indexrelid
+        )
+    union all
+    select
+        2 as step,
+        pg_get_triggerdef(tg.oid)
+    from
+        pg_trigger tg
+    where
+        tg.tgrelid = cast(:table_name as regclass)
+        and not tg.tgisinternal
+    union all
+    select
+        3 as step,
+        format('alter table %s owner to %I', c.oid::regclass, pg_get_userbyid(c.relowner))
+    from
+        pg_class c
+    where
+        c.oid = cast(:table_name as regclass)
+    union all
+    select
+        4 as step,
+        format(
+            'grant %s on table %s to %s %s',
+            acl.privilege_type,
+            c.oid::regclass,
+            case when acl.grantee = 0 then 'public' else quote_ident(pg_get_userbyid(acl.grantee)) end,
+            case when acl.is_grantable then 'with grant option' end
+        )
+    from
+        pg_class c,
+        aclexplode(c.relacl) acl
+    where
+        c.oid = cast(:table_name as regclass)
+    union all
+    select
+        4 as step,
+        format(
+            'grant %s (%I) on table %s to %s %s',
+            acl.privilege_type,
+            a.attname,
+            a.attrelid::regclass,
+            case when acl.grantee = 0 then 'public' else quote_ident(pg_get_userbyid(acl.grantee)) end,
+            case when acl.is_grantable then 'with grant option' end
+        )
+    from
+        pg_attribute a,
+        aclexplode(a.attacl) acl
+    where
+        a.attrelid = cast(:table_name as regclass)
+        and not a.attisdropped
+    union all
+    select
+        5 as step,
+        format('alter table %s enable row level security', c.oid::regclass)
+    from
+        pg_class c
+    where
+        c.oid = cast(:table_name as regclass)
+        and c.relrowsecurity
+    union all
+    select
+        5 as step,
+        format('alter table %s force row level security', c.oid::regclass)
+    from
+        pg_class c
+    where
+        c.oid = cast(:table_name as regclass)
+        and c.relforcerowsecurity
+    union all
+    select
+        6 as step,
+        format(
+            'create policy %I on %s as %s for %s to %s %s %s',
+            pol.polname,
+            pol.polrelid::regclass,
+            case when pol.polpermissive then 'permissive' else 'restrictive' end,
+            case pol.polcmd
+                when 'r' then 'select'
+                when 'a' then 'insert'
+                when 'w' then 'update'
+                when 'd' then 'delete'
+                else 'all'
+            end,
+            (
+                select string_agg(
+                    case when r = 0 then 'public' else quote_ident(pg_get_userbyid(r)) end,
+                    ', '
+                )
+                from unnest(pol.polroles) r
+            ),
+            'using (' || pg_get_expr(pol.polqual, pol.polrelid) || ')',
+            'with check (' || pg_get_expr(pol.polwithcheck, pol.polrelid) || ')'
+        )
+    from
+        pg_policy pol
+    where
+        pol.polrelid = cast(:table_name as regclass)
+    union all
+    select
+        7 as step,
+        format('comment on table %s is %L', c.oid::regclass, obj_description(c.oid, 'pg_class'))
+    from
+        pg_class c
+    where
+        c.oid = cast(:table_name as regclass)
+        and obj_description(c.oid, 'pg_class') is not null
+    order by
+        step
+    """
+)
 
-    The collections are stored in separate tables in the database, with each vector associated with an identifier and optional metadata.
+INDEX_PROGRESS_QUERY = text(
+    """
+    select
+        phase,
+        blocks_done,
+        blocks_total,
+        tuples_done,
+        tuples_total
+    from
+        pg_stat_progress_create_index
+    where
+        pid = :pid
+    """
+)
 
-    Example usage:
+BACKEND_PID_QUERY = text("select pg_backend_pid()")
 
-        with vecs.create_client(DB_CONNECTION) as vx:
-            collection = vx.create_collection(name="docs", dimension=3)
-            collection.upsert([("id1", [1, 1, 1], {"key": "value"})])
-            # Further operations on 'collection'
+# Serializes replacements of the same document, including the chunks they insert
+DOCUMENT_LOCK_QUERY = text("select pg_advisory_xact_lock(hashtextextended(:key, 0))")
 
-    Public Attributes:
-        name: The name of the vector collection.
-        dimension: The dimension of vectors in the collection.
+# Seconds between polls of an index build's progress
+INDEX_PROGRESS_INTERVAL = 1.0
 
-    Note: Some methods of this class can raise exceptions from the `vecs.exc` module if errors occur.
+# Factor by which filtered searches grow ef_search or probes between rounds
+FILTERED_SEARCH_GROWTH = 4
+
+# The largest hnsw.ef_search pgvector accepts
+HNSW_MAX_EF_SEARCH = 1000
+
+MAINTENANCE_WORK_MEM_QUERY = text(
+    "select pg_size_bytes(current_setting('maintenance_work_mem'))"
+)
+
+# Maximum number of statement shapes cached per collection
+STMT_CACHE_SIZE = 128
+
+INDEX_MEASURE_TO_SQLA_ACC = {
+    IndexMeasure.cosine_distance: lambda x: x.cosine_distance,
+    IndexMeasure.l2_distance: lambda x: x.l2_distance,
+    IndexMeasure.max_inner_product: lambda x: x.max_inner_product,
+}
+
+
+class BaseCollection:
+    """
+    PRIVATE
+
+    State, validation and statement construction shared by `vecs.Collection` and
+    `vecs.AsyncCollection`. Subclasses are responsible for executing statements.
     """
 
     def __init__(
         self,
         name: str,
         dimension: int,
-        client: Client,
+        client: Union[Client, AsyncClient],
         adapter: Optional[Adapter] = None,
+        storage: Union[VectorStorage, str] = VectorStorage.vector,
     ):
         """
-        Initializes a new instance of the `Collection` class.
+        Initializes a new instance of the collection class.
 
-        During expected use, developers initialize instances of `Collection` using the
-        `vecs.Client` with `vecs.Client.create_collection(...)` rather than directly.
+        During expected use, developers initialize collections using the
+        `vecs.Client` with `vecs.Client.get_or_create_collection(...)` rather than directly.
 
         Args:
             name (str): The name of the collection.
             dimension (int): The dimension of the vectors in the collection.
-            client (Client): The client to use for interacting with the database.
+            client (Client | AsyncClient): The client to use for interacting with the database.
+            adapter (Adapter, optional): The adapter to transform records and queries with.
+            storage (VectorStorage, optional): The precision vectors are stored at. Defaults to 'vector'.
         """
+        try:
+            self.storage = VectorStorage(storage)
+        except ValueError:
+            raise ArgError("Invalid vector storage")
+
         self.client = client
         self.name = name
         self.dimension = dimension
-        self.table = build_table(name, client.meta, dimension)
-        self._index: Optional[str] = None
+        self.table = build_table(name, client.meta, dimension, self.storage)
+        self._stmt_cache: Dict[Tuple[Any, ...], Select] = {}
+        self._stmt_cache_lock = threading.Lock()
         self.adapter = adapter or Adapter(steps=[NoOp(dimension=dimension)])
 
         reported_dimensions = set(
@@ -199,345 +537,543 @@ class Collection:
 
     def __repr__(self):
         """
-        Returns a string representation of the `Collection` instance.
+        Returns a string representation of the collection instance.
 
         Returns:
-            str: A string representation of the `Collection` instance.
+            str: A string representation of the collection instance.
         """
-        return f'vecs.Collection(name="{self.name}", dimension={self.dimension})'
+        return f'vecs.{self.__class__.__name__}(name="{self.name}", dimension={self.dimension})'
 
-    def __len__(self) -> int:
+    def _check_storage(self, info: Optional[CollectionInfo]) -> None:
         """
-        Returns the number of vectors in the collection.
+        PRIVATE
 
-        Returns:
-            int: The number of vectors in the collection.
+        Validates the collection's storage against its catalog entry before it is used or created.
+
+        Args:
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist yet.
+
+        Raises:
+            ArgError: If an existing collection stores its vectors at a different precision, or if a
+                new `halfvec` collection is requested from a pgvector installation without `halfvec`.
         """
-        with self.client.Session() as sess:
-            with sess.begin():
-                stmt = select(func.count()).select_from(self.table)
-                return sess.execute(stmt).scalar() or 0
+        if info is not None:
+            if info.storage != self.storage:
+                raise ArgError(
+                    f"Collection {self.name} stores {info.storage} vectors, not {self.storage.value}"
+                )
+        elif (
+            self.storage == VectorStorage.halfvec
+            and not self.client._supports_halfvec()
+        ):
+            raise ArgError(
+                "halfvec Unavailable. Upgrade your pgvector installation to >= 0.7.0 to enable halfvec storage"
+            )
 
-    def _create_if_not_exists(self):
+    @staticmethod
+    def _index_name(info: Optional[CollectionInfo]) -> Optional[str]:
         """
         PRIVATE
 
-        Creates a new collection in the database if it doesn't already exist
+        The name of the collection's vector index in a catalog entry.
+
+        Args:
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist.
 
         Returns:
-            Collection: The found or created collection.
+            Optional[str]: The name of the first index of the whole vectors that serves a measure,
+                preferring one covering the whole table. None if the collection has no such index.
         """
-        query = text(
-            f"""
-        select
-            relname as table_name,
-            atttypmod as embedding_dim
-        from
-            pg_class pc
-            join pg_attribute pa
-                on pc.oid = pa.attrelid
-        where
-            pc.relnamespace = 'vecs'::regnamespace
-            and pc.relkind = 'r'
-            and pa.attname = 'vec'
-            and not pc.relname ^@ '_'
-            and pc.relname = :name
-        """
-        ).bindparams(name=self.name)
-        with self.client.Session() as sess:
-            query_result = sess.execute(query).fetchone()
-
-            if query_result:
-                _, collection_dimension = query_result
-            else:
-                collection_dimension = None
-
-        reported_dimensions = set(
-            [x for x in [self.dimension, collection_dimension] if x is not None]
+        if info is None:
+            return None
+        indexes = [
+            ix
+            for ix in info.indexes
+            if ix.ops in OPS_TO_INDEX_MEASURE and ix.prefix_dimension is None
+        ]
+        return next(
+            (ix.name for ix in indexes if ix.predicate is None),
+            indexes[0].name if indexes else None,
         )
-        if len(reported_dimensions) > 1:
-            raise MismatchedDimension(
-                "Dimensions reported by adapter, dimension, and existing collection do not match"
-            )
-
-        if not collection_dimension:
-            self.table.create(self.client.engine)
 
-            with self.client.Session() as sess:
-                sess.execute(
-                    text(
-                        f"""
-                        create index "{self.name}_doc_instance_id_idx"
-                          on vecs."{self.name}"
-                          using btree ( doc_instance_id )
-                        """
-                    )
-                )
-                sess.commit()
+    @staticmethod
+    def _index_for(
+        info: Optional[CollectionInfo],
+        measure: IndexMeasure,
+        app_id: Optional[int] = None,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> Optional[IndexInfo]:
+        """
+        PRIVATE
 
-            with self.client.Session() as sess:
-                sess.execute(
-                    text(
-                        f"""
-                        create index "{self.name}_memento_membership_idx"
-                          on vecs."{self.name}"
-                          using btree ( memento_membership )
-                        """
-                    )
-                )
-                sess.commit()
+        Finds the vector index in a catalog entry that serves queries for a distance measure.
 
-            with self.client.Session() as sess:
-                sess.execute(
-                    text(
-                        f"""
-                        create index "{self.name}_app_id_idx"
-                          on vecs."{self.name}"
-                          using btree ( app_id )
-                        """
-                    )
-                )
-                sess.commit()
+        Args:
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist.
+            measure (IndexMeasure): The measure to find an index for.
+            app_id (Optional[int]): The tenant the queries are restricted to, if any.
+            binary_quantized (bool): Whether to find the binary quantized index that shortlists
+                candidates instead, which serves every measure.
+            prefix_dimension (Optional[int]): The length of the vector prefix the index must cover,
+                or None for an index of the whole vectors.
 
-        return self
+        Returns:
+            Optional[IndexInfo]: The partial index for *app_id* with the operator class for *measure*,
+                falling back to the first such index covering the whole table. None if there is neither.
+        """
+        if info is None:
+            return None
+        indexes = [
+            ix
+            for ix in info.indexes
+            if (
+                ix.ops == BINARY_QUANTIZED_OPS
+                if binary_quantized
+                else OPS_TO_INDEX_MEASURE.get(ix.ops) == measure
+            )
+            and ix.prefix_dimension == prefix_dimension
+        ]
+        if app_id is not None:
+            tenant_index = next((ix for ix in indexes if ix.app_id == app_id), None)
+            if tenant_index is not None:
+                return tenant_index
+        return next((ix for ix in indexes if ix.predicate is None), None)
 
-    def _create(self):
+    @classmethod
+    def _indexed_for(
+        cls,
+        info: Optional[CollectionInfo],
+        measure: IndexMeasure,
+        app_id: Optional[int] = None,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> bool:
         """
         PRIVATE
 
-        Creates a new collection in the database. Raises a `vecs.exc.CollectionAlreadyExists`
-        exception if a collection with the specified name already exists.
+        Checks whether a catalog entry has a vector index for a distance measure.
+
+        Args:
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist.
+            measure (IndexMeasure): The measure to check for.
+            app_id (Optional[int]): The tenant the queries are restricted to, if any.
+            binary_quantized (bool): Whether to check for a binary quantized index instead.
+            prefix_dimension (Optional[int]): The length of the vector prefix the index must cover, if any.
 
         Returns:
-            Collection: The newly created collection.
+            bool: True if one of the collection's vector indexes serves queries for *measure*.
         """
-
-        collection_exists = self.__class__._does_collection_exist(
-            self.client, self.name
+        return (
+            cls._index_for(info, measure, app_id, binary_quantized, prefix_dimension)
+            is not None
         )
-        if collection_exists:
-            raise CollectionAlreadyExists(
-                "Collection with requested name already exists"
-            )
-        self.table.create(self.client.engine)
 
-        with self.client.Session() as sess:
-            sess.execute(
-                text(
-                    f"""
-                    create index "{self.name}_doc_instance_id_idx"
-                      on vecs."{self.name}"
-                      using btree ( doc_instance_id )
-                    """
-                )
-            )
-            sess.commit()
+    @staticmethod
+    def _replaced_indexes(
+        info: Optional[CollectionInfo],
+        ops: str,
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> List[str]:
+        """
+        PRIVATE
 
-        with self.client.Session() as sess:
-            sess.execute(
-                text(
-                    f"""
-                    create index "{self.name}_memento_membership_idx"
-                      on vecs."{self.name}"
-                      using btree ( memento_membership )
-                    """
-                )
-            )
-            sess.commit()
+        Names the vector indexes that a new index with operator class *ops* replaces.
 
-        with self.client.Session() as sess:
-            sess.execute(
-                text(
-                    f"""
-                    create index "{self.name}_app_id_idx"
-                        on vecs."{self.name}"
-                        using btree ( app_id )
-                    """
-                )
+        Args:
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist.
+            ops (str): The pgvector operator class of the new index.
+            app_id (Optional[int]): The tenant the new index is restricted to, or None if it covers the whole table.
+            prefix_dimension (Optional[int]): The length of the vector prefix the new index covers, if any.
+
+        Returns:
+            List[str]: The names of the indexes for the same measure, at either precision, and with the same coverage.
+                A prefix index replaces only prefix indexes, whatever their length.
+        """
+        if info is None:
+            return []
+        measure = OPS_TO_INDEX_MEASURE.get(ops)
+        return [
+            ix.name
+            for ix in info.indexes
+            if (
+                ix.ops == ops
+                if ops == BINARY_QUANTIZED_OPS
+                else OPS_TO_INDEX_MEASURE.get(ix.ops) == measure
             )
-            sess.commit()
-        return self
+            and (ix.predicate is None if app_id is None else ix.app_id == app_id)
+            and (ix.prefix_dimension is None) == (prefix_dimension is None)
+        ]
 
-    def _drop(self):
+    @staticmethod
+    def _id_list(ids: Iterable[str]) -> List[str]:
         """
         PRIVATE
 
-        Deletes the collection from the database. Raises a `vecs.exc.CollectionNotFound`
-        exception if no collection with the specified name exists.
+        Validates the identifiers passed to `fetch` or `delete`.
 
-        Returns:
-            Collection: The deleted collection.
-        """
-        from sqlalchemy.schema import DropTable
+        Args:
+            ids (Iterable[str]): The record identifiers.
 
-        with self.client.Session() as sess:
-            sess.execute(DropTable(self.table, if_exists=True))
-            sess.commit()
+        Returns:
+            List[str]: The identifiers, bound as the single array parameter `allow_id`
+                of `_fetch_stmt` and `_delete_ids_stmt`.
 
-        return self
+        Raises:
+            ArgError: If *ids* is a string, or contains anything but strings.
+        """
+        if isinstance(ids, str):
+            raise ArgError("ids must be a list of strings")
+        ids = list(ids)
+        if not all(isinstance(x, str) for x in ids):
+            raise ArgError("ids must be a list of strings")
+        return ids
 
-    def upsert(
-        self, records: Iterable[Tuple[str, Any, Metadata]], skip_adapter: bool = False
-    ) -> None:
+    def _fetch_stmt(self) -> Select:
         """
-        Inserts or updates *vectors* records in the collection.
+        PRIVATE
 
-        Args:
-            records (Iterable[Tuple[str, Any, Metadata]]): An iterable of content to upsert.
-                Each record is a tuple where:
-                  - the first element is a unique string identifier
-                  - the second element is an iterable of numeric values or relevant input type for the
-                    adapter assigned to the collection
-                  - the third element is metadata associated with the vector
+        The statement that fetches records by identifier.
 
-            skip_adapter (bool): Should the adapter be skipped while upserting. i.e. if vectors are being
-                provided, rather than a media type that needs to be transformed
+        The identifiers are bound as one array parameter, see `_id_list`, so any number
+        of records is fetched by a single statement.
+
+        Returns:
+            Select: The statement.
         """
+        return self._cached_stmt(
+            ("fetch",),
+            lambda: select(*self._record_columns()).where(
+                *build_id_list_clauses(self.table, (("allow", "id"),))
+            ),
+        )
 
-        chunk_size = 500
+    def _delete_ids_stmt(self) -> Any:
+        """
+        PRIVATE
 
-        if skip_adapter:
-            pipeline = flu(records).chunk(chunk_size)
-        else:
-            # Construct a lazy pipeline of steps to transform and chunk user input
-            pipeline = flu(self.adapter(records, AdapterContext("upsert"))).chunk(
-                chunk_size
-            )
+        The statement that deletes records by identifier, see `_fetch_stmt`.
 
-        with self.client.Session() as sess:
-            with sess.begin():
-                for chunk in pipeline:
-                    stmt = postgresql.insert(self.table).values(chunk)
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=[self.table.c.id],
-                        set_=dict(
-                            vec=stmt.excluded.vec, metadata=stmt.excluded.metadata
-                        ),
-                    )
-                    sess.execute(stmt)
-        return None
+        Returns:
+            Delete: The statement, returning the identifiers of the deleted records.
+        """
+        return self._cached_stmt(
+            ("delete_ids",),
+            lambda: delete(self.table)
+            .where(*build_id_list_clauses(self.table, (("allow", "id"),)))
+            .returning(self.table.c.id),
+        )
 
-    def fetch(self, ids: Iterable[str]) -> List[Record]:
+    def _stored_chunks_stmt(self) -> Select:
         """
-        Fetches vectors from the collection by their identifiers.
+        PRIVATE
 
-        Args:
-            ids (Iterable[str]): An iterable of vector identifiers.
+        The statement that reads and locks the chunks of a document for `Collection.replace_document`.
 
         Returns:
-            List[Record]: A list of the fetched vectors.
+            Select: The statement, selecting the columns compared by `diff_document` with the
+                md5 hash of `text` in place of the text itself.
         """
-        if isinstance(ids, str):
-            raise ArgError("ids must be a list of strings")
-
-        chunk_size = 12
+        return self._cached_stmt(
+            ("stored_chunks",),
+            lambda: select(
+                self.table.c.id,
+                self.table.c.order,
+                func.md5(self.table.c.text).label("text_md5"),
+                self.table.c.metadata,
+                self.table.c.memento_membership,
+                self.table.c.app_id,
+            )
+            .where(
+                self.table.c.doc_instance_id
+                == bindparam("doc_instance_id", type_=BIGINT)
+            )
+            .with_for_update(),
+        )
+
+    def _replace_chunks_stmt(self, chunk: List[Any]) -> postgresql.Insert:
+        """
+        PRIVATE
+
+        Builds the statement that writes new and changed chunks of a document.
+
+        Unlike `_on_conflict_update`, a conflicting record has every column overwritten,
+        so no stale `text` or `order` survives a replacement. A conflicting record that belongs
+        to another document is left untouched, see `check_replaced_chunks`.
+
+        Args:
+            chunk (List[Any]): The records to write, with one field per column.
+
+        Returns:
+            postgresql.Insert: The statement, returning the ids written.
+        """
+        stmt = postgresql.insert(self.table).values(chunk)
+        return stmt.on_conflict_do_update(
+            index_elements=[self.table.c.id],
+            set_={
+                col.name: stmt.excluded[col.name]
+                for col in self.table.c
+                if col.name != "id"
+            },
+            where=self.table.c.doc_instance_id == stmt.excluded.doc_instance_id,
+        ).returning(self.table.c.id)
+
+    def _document_chunks(
+        self, doc_instance_id: int, chunks: Iterable[Any], skip_adapter: bool
+    ) -> List[List[Any]]:
+        """
+        PRIVATE
+
+        Validates the arguments of `Collection.replace_document` and adapts its chunks.
+
+        Returns:
+            List[List[Any]]: The chunks, with one field per column and *doc_instance_id* filled in.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        if not isinstance(doc_instance_id, int) or isinstance(doc_instance_id, bool):
+            raise ArgError("doc_instance_id must be an integer")
+
+        if not skip_adapter:
+            chunks = self.adapter(chunks, AdapterContext("upsert"))
+
         records = []
-        with self.client.Session() as sess:
-            with sess.begin():
-                for id_chunk in flu(ids).chunk(chunk_size):
-                    stmt = select(self.table).where(self.table.c.id.in_(id_chunk))
-                    chunk_records = sess.execute(stmt)
-                    records.extend(chunk_records)
+        for chunk in chunks:
+            record = pad_record(chunk)
+            if record[4] is None:
+                record[4] = doc_instance_id
+            elif record[4] != doc_instance_id:
+                raise ArgError("chunks must belong to the document being replaced")
+            if record[5] is None:
+                raise ArgError("chunks must have an order")
+            records.append(record)
         return records
 
-    def delete(
-        self, ids: Optional[Iterable[str]] = None, filters: Optional[Metadata] = None
-    ) -> List[str]:
+    def _on_conflict_update(self, stmt: postgresql.Insert) -> postgresql.Insert:
         """
-        Deletes vectors from the collection by matching filters or ids.
+        PRIVATE
+
+        Applies the collection's upsert conflict resolution to an insert statement.
 
         Args:
-            ids (Iterable[str], optional): An iterable of vector identifiers.
-            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            stmt (postgresql.Insert): The insert statement.
 
         Returns:
-            List[str]: A list of the identifiers of the deleted vectors.
+            postgresql.Insert: The statement, updating `vec` and `metadata` when the id already exists.
         """
-        if ids is None and filters is None:
-            raise ArgError("Either ids or filters must be provided.")
+        return stmt.on_conflict_do_update(
+            index_elements=[self.table.c.id],
+            set_=dict(vec=stmt.excluded.vec, metadata=stmt.excluded.metadata),
+        )
 
-        if ids is not None and filters is not None:
-            raise ArgError("Either ids or filters must be provided, not both.")
+    def _staging_table(self):
+        """
+        PRIVATE
 
-        if isinstance(ids, str):
-            raise ArgError("ids must be a list of strings")
+        Names a temporary table with the same columns as the collection that is
+        dropped when the transaction that creates it commits.
 
-        ids = ids or []
-        filters = filters or {}
-        del_ids = []
+        Returns:
+            Tuple[TableClause, str]: A lightweight table clause referencing the staging table,
+                and the DDL that creates it.
+        """
+        staging_name = "_vecs_stage_" + str(uuid.uuid4()).replace("-", "_")[0:7]
+        ddl = f"""
+            create temporary table "{staging_name}"
+              (like vecs."{self.table.name}" including defaults)
+              on commit drop
+            """
+        return table(staging_name, *[column(name) for name in COPY_COLUMNS]), ddl
 
-        with self.client.Session() as sess:
-            with sess.begin():
-                if ids:
-                    for id_chunk in flu(ids).chunk(12):
-                        stmt = (
-                            delete(self.table)
-                            .where(self.table.c.id.in_(id_chunk))
-                            .returning(self.table.c.id)
-                        )
-                        del_ids.extend(sess.execute(stmt).scalars() or [])
+    def _merge_staging_stmt(self, staging_table) -> postgresql.Insert:
+        """
+        PRIVATE
 
-                if filters:
-                    meta_filter = build_filters(self.table.c.metadata, filters)
-                    stmt = (
-                        delete(self.table).where(meta_filter).returning(self.table.c.id)  # type: ignore
-                    )
-                    result = sess.execute(stmt).scalars()
-                    del_ids.extend(result.fetchall())
+        Builds the statement that merges the contents of a staging table into the collection.
 
-        return del_ids
+        Args:
+            staging_table (TableClause): The table returned by `_staging_table`.
 
-    def __getitem__(self, items):
+        Returns:
+            postgresql.Insert: An `insert ... select ... on conflict` statement.
         """
-        Fetches a vector from the collection by its identifier.
+        stmt = postgresql.insert(self.table).from_select(
+            COPY_COLUMNS, select(*[staging_table.c[name] for name in COPY_COLUMNS])
+        )
+        return self._on_conflict_update(stmt)
+
+    def _column_index_ddl(self) -> List[str]:
+        """
+        PRIVATE
+
+        Builds the DDL for the btree indexes created alongside a collection's table.
+
+        Returns:
+            List[str]: One `create index` statement per indexed column.
+        """
+        return [
+            f"""
+            create index "{self.name}_{column_name}_idx"
+              on vecs."{self.name}"
+              using btree ( {column_name} )
+            """
+            for column_name in ("doc_instance_id", "memento_membership", "app_id")
+        ]
+
+    def _vector_column(self, source=None):
+        """
+        PRIVATE
+
+        The column expression used to read vectors, honoring the client's wire format.
 
         Args:
-            items (str): The identifier of the vector.
+            source (FromClause, optional): The table or subquery to read from. Defaults to the collection's table.
 
         Returns:
-            Record: The fetched vector.
+            ColumnElement: The `vec` column, or its binary send format when the client
+                has `binary_vectors` enabled. Either is labeled `vec` and decodes to a numpy array.
+                Half precision vectors are read as `vector`, so they decode to float32 like any other.
         """
-        if not isinstance(items, str):
-            raise ArgError("items must be a string id")
+        vec = (self.table if source is None else source).c.vec
+        if self.storage == VectorStorage.halfvec:
+            vec = cast(vec, Vector(self.dimension))
+        if self.client.binary_vectors:
+            return type_coerce(func.vector_send(vec), BinaryVector()).label("vec")
+        if self.storage == VectorStorage.halfvec:
+            return vec.label("vec")
+        return vec
+
+    def _half_precision_index(self, index: Optional[IndexInfo]) -> bool:
+        """
+        PRIVATE
 
-        row = self.fetch([items])
+        Checks whether a vector index indexes the collection's `vector` column cast to `halfvec`.
 
-        if row == []:
-            raise KeyError("no item found with requested id")
-        return row[0]
+        Args:
+            index (Optional[IndexInfo]): The index, or None.
 
-    def query(
-        self,
-        data: Union[Iterable[Numeric], Any],
-        limit: int = 10,
-        filters: Optional[Dict] = None,
-        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
-        include_value: bool = False,
-        include_metadata: bool = False,
-        include_text: bool = False,
-        *,
-        probes: Optional[int] = None,
-        ef_search: Optional[int] = None,
-        skip_adapter: bool = False,
-    ) -> Union[List[Record], List[str]]:
+        Returns:
+            bool: True if searches must order by the cast `vec` column to use the index.
         """
-        Executes a similarity search in the collection.
+        return (
+            index is not None
+            and self.storage == VectorStorage.vector
+            and index.ops in INDEX_MEASURE_TO_HALFVEC_OPS.values()
+        )
 
-        The return type is dependent on arguments *include_value* and *include_metadata*
+    def _search_vector_type(self, half_precision: bool):
+        """
+        PRIVATE
+
+        The type query vectors are compared to the collection's vectors as.
 
         Args:
-            data (Any): The vector to use as the query.
-            limit (int, optional): The maximum number of results to return. Defaults to 10.
-            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
-            measure (Union[IndexMeasure, str], optional): The distance measure to use for the search. Defaults to 'cosine_distance'.
-            include_value (bool, optional): Whether to include the distance value in the results. Defaults to False.
-            include_metadata (bool, optional): Whether to include the metadata in the results. Defaults to False.
-            probes (Optional[Int], optional): Number of ivfflat index lists to query. Higher increases accuracy but decreases speed
-            ef_search (Optional[Int], optional): Size of the dynamic candidate list for HNSW index search. Higher increases accuracy but decreases speed
-            skip_adapter (bool, optional): When True, skips any associated adapter and queries using a literal vector provided to *data*
+            half_precision (bool): Whether the search orders by the `vec` column cast to `halfvec`,
+                see `_half_precision_index`.
 
         Returns:
-            Union[List[Record], List[str]]: The result of the similarity search.
+            Vector | HalfVector: The SQLAlchemy type.
+        """
+        if half_precision or self.storage == VectorStorage.halfvec:
+            return HalfVector(self.dimension)
+        return Vector(self.dimension)
+
+    def _search_column(self, half_precision: bool):
+        """
+        PRIVATE
+
+        The column expression similarity searches order by.
+
+        Args:
+            half_precision (bool): Whether to cast the `vec` column to `halfvec`, see `_half_precision_index`.
+
+        Returns:
+            ColumnElement: The `vec` column, matching the expression of the index serving the search.
+        """
+        if half_precision:
+            return cast(self.table.c.vec, HalfVector(self.dimension))
+        return self.table.c.vec
+
+    def _hamming_distance(self, query_vec):
+        """
+        PRIVATE
+
+        The Hamming distance between the binary quantized `vec` column and query vector.
+
+        The column side matches the expression of binary quantized indexes, see `_index_expression`.
+
+        Args:
+            query_vec (BindParameter): The query vector.
+
+        Returns:
+            ColumnElement: The distance expression.
+        """
+        bits = postgresql.BIT(self.dimension)
+        return cast(func.binary_quantize(self.table.c.vec), bits).op(
+            "<~>", return_type=Float
+        )(func.binary_quantize(cast(query_vec, query_vec.type)))
+
+    def _vector_prefix(self, vec, prefix_dimension: int, half_precision: bool):
+        """
+        PRIVATE
+
+        The first *prefix_dimension* dimensions of a vector.
+
+        Matches the expression of prefix indexes, see `_index_expression`.
+
+        Args:
+            vec (ColumnElement): The `vec` column or the query vector.
+            prefix_dimension (int): The number of leading dimensions to keep.
+            half_precision (bool): Whether the prefix index serving the search is half precision,
+                see `_half_precision_index`.
+
+        Returns:
+            ColumnElement: The prefix expression.
+        """
+        return cast(
+            func.subvector(
+                vec, literal_column("1"), literal_column(str(int(prefix_dimension)))
+            ),
+            (
+                HalfVector
+                if half_precision or self.storage == VectorStorage.halfvec
+                else Vector
+            )(prefix_dimension),
+        )
+
+    def _record_columns(self) -> List[Any]:
+        """
+        PRIVATE
+
+        The columns that make up a record, in table order.
+
+        Returns:
+            List[ColumnElement]: The collection's columns with `vec` read through `_vector_column`.
+        """
+        return [
+            self._vector_column() if col.name == "vec" else col for col in self.table.c
+        ]
+
+    def _query_args(
+        self,
+        limit: Optional[int],
+        measure: Union[IndexMeasure, str],
+        probes: Optional[int],
+        ef_search: Optional[int],
+    ) -> Tuple[IndexMeasure, int, int]:
+        """
+        PRIVATE
+
+        Validates the search arguments shared by `Collection.query` and `Collection.query_many`.
+
+        Returns:
+            Tuple[IndexMeasure, int, int]: The measure to order by, and the ivfflat probes and
+                hnsw ef_search values to search with.
+
+        Raises:
+            ArgError: If any argument is invalid.
         """
 
         if probes is None:
@@ -552,7 +1088,7 @@ class Collection:
         if probes < 1:
             raise ArgError("probes must be >= 1")
 
-        if limit > 1000:
+        if limit is not None and limit > 1000:
             raise ArgError("limit must be <= 1000")
 
         # ValueError on bad input
@@ -561,13 +1097,24 @@ class Collection:
         except ValueError:
             raise ArgError("Invalid index measure")
 
-        if not self.is_indexed_for_measure(imeasure):
-            warnings.warn(
-                UserWarning(
-                    f"Query does not have a covering index for {imeasure}. See Collection.create_index"
-                )
-            )
+        return imeasure, probes, ef_search
+
+    def _adapt_query(self, data: Union[Iterable[Numeric], Any], skip_adapter: bool):
+        """
+        PRIVATE
+
+        Transforms a query input into a query vector using the collection's adapter.
+
+        Args:
+            data (Any): The query input.
+            skip_adapter (bool): When True, *data* is returned unchanged.
 
+        Returns:
+            Iterable[Numeric]: The query vector.
+
+        Raises:
+            ArgError: If the adapter does not produce exactly one vector.
+        """
         if skip_adapter:
             adapted_query = [("", data, {}, "", None, None, None, None)]
         else:
@@ -583,207 +1130,865 @@ class Collection:
         if len(adapted_query) != 1:
             raise ArgError("Failed to produce exactly one query vector from input")
 
-        vec = adapted_query[0][1]
+        return adapted_query[0][1]
 
-        distance_lambda = INDEX_MEASURE_TO_SQLA_ACC.get(imeasure)
-        if distance_lambda is None:
-            # unreachable
-            raise ArgError("invalid distance_measure")  # pragma: no cover
+    def _query_columns(
+        self,
+        distance_clause,
+        include_value: bool,
+        include_metadata: bool,
+        include_text: bool,
+        include_vector: bool,
+        source=None,
+    ) -> List[Any]:
+        """
+        PRIVATE
+
+        The columns selected by a similarity search, in result order.
 
-        distance_clause = distance_lambda(self.table.c.vec)(vec)
+        Args:
+            source (FromClause, optional): The table or subquery to select from. Defaults to the collection's table.
 
-        cols = [self.table.c.id]
+        Returns:
+            List[ColumnElement]: The requested columns, starting with `id`.
+        """
+        c = (self.table if source is None else source).c
+        cols = [c.id]
 
         if include_value:
             cols.append(distance_clause)
 
         if include_metadata:
-            cols.append(self.table.c.metadata)
-            cols.append(self.table.c.doc_instance_id)
-            cols.append(self.table.c.order)
-            cols.append(self.table.c.memento_membership)
-            cols.append(self.table.c.app_id)
+            cols.append(c.metadata)
+            cols.append(c.doc_instance_id)
+            cols.append(c.order)
+            cols.append(c.memento_membership)
+            cols.append(c.app_id)
 
         if include_text:
-            cols.append(self.table.c.text)
-
-        stmt = select(*cols)
-        if filters:
-            stmt = stmt.filter(
-                build_filters(self.table.c.metadata, filters)  # type: ignore
-            )
+            cols.append(c.text)
 
-        stmt = stmt.order_by(distance_clause)
-        stmt = stmt.limit(limit)
+        if include_vector:
+            cols.append(self._vector_column(source))
 
-        with self.client.Session() as sess:
-            with sess.begin():
-                # index ignored if greater than n_lists
-                sess.execute(
-                    text("set local ivfflat.probes = :probes").bindparams(probes=probes)
-                )
-                if self.client._supports_hnsw():
-                    sess.execute(
-                        text("set local hnsw.ef_search = :ef_search").bindparams(
-                            ef_search=ef_search
-                        )
-                    )
-                if len(cols) == 1:
-                    return [str(x) for x in sess.scalars(stmt).fetchall()]
-                return sess.execute(stmt).fetchall() or []
+        return cols
 
-    @classmethod
-    def _list_collections(cls, client: "Client") -> List["Collection"]:
+    def _search_settings(
+        self, probes: int, ef_search: int, max_scan_tuples: Optional[int] = None
+    ) -> Dict[str, str]:
         """
         PRIVATE
 
-        Retrieves all collections from the database.
+        The settings that apply the index search parameters.
 
         Args:
-            client (Client): The database client.
+            probes (int): Number of ivfflat index lists to query.
+            ef_search (int): Size of the dynamic candidate list for HNSW index search.
+            max_scan_tuples (Optional[int]): Enables iterative HNSW index scans that visit up to this
+                many records. Ignored unless pgvector supports them.
 
         Returns:
-            List[Collection]: A list of all existing collections.
+            Dict[str, str]: Setting names and values.
         """
+        # index ignored if greater than n_lists
+        settings = {"ivfflat.probes": str(probes)}
+        if self.client._supports_hnsw():
+            settings["hnsw.ef_search"] = str(ef_search)
+        if self.client._supports_iterative_scan():
+            # always set, so that a pooled connection does not carry an iterative scan into other searches
+            if max_scan_tuples is None:
+                settings["hnsw.iterative_scan"] = "off"
+            else:
+                settings["hnsw.iterative_scan"] = "strict_order"
+                settings["hnsw.max_scan_tuples"] = str(max_scan_tuples)
+        return settings
 
-        query = text(
-            """
-        select
-            relname as table_name,
-            atttypmod as embedding_dim
-        from
-            pg_class pc
-            join pg_attribute pa
-                on pc.oid = pa.attrelid
-        where
-            pc.relnamespace = 'vecs'::regnamespace
-            and pc.relkind = 'r'
-            and pa.attname = 'vec'
-            and not pc.relname ^@ '_'
-        """
-        )
-        xc = []
-        with client.Session() as sess:
-            for name, dimension in sess.execute(query):
-                existing_collection = cls(name, dimension, client)
-                xc.append(existing_collection)
-        return xc
-
-    @classmethod
-    def _does_collection_exist(cls, client: "Client", name: str) -> bool:
+    def _filtered_search_plan(
+        self,
+        index: Optional[IndexInfo],
+        probes: int,
+        ef_search: int,
+        max_rounds: int,
+        max_scan_tuples: int,
+    ) -> List[Tuple[int, int, Optional[int]]]:
         """
         PRIVATE
 
-        Checks if a collection with a given name exists within the database
+        Plans the rounds of a filtered search, see `Collection.query_filtered`.
+
+        Each round widens the candidate pool of the index that serves the search, by growing
+        hnsw ef_search or ivfflat probes by `FILTERED_SEARCH_GROWTH`, until the pool can not grow
+        further or *max_rounds* is reached. HNSW searches use a single iterative index scan
+        instead when pgvector supports it.
 
         Args:
-            client (Client): The database client.
-            name (str): The name of the collection
+            index (Optional[IndexInfo]): The index serving the search, or None for an exact search.
+            probes (int): The ivfflat probes of the first round.
+            ef_search (int): The hnsw ef_search of the first round.
+            max_rounds (int): The maximum number of rounds.
+            max_scan_tuples (int): The maximum number of records an iterative index scan visits.
 
         Returns:
-            Exists: Whether the collection exists or not
+            List[Tuple[int, int, Optional[int]]]: The probes, ef_search and iterative scan budget of each round.
         """
-
-        try:
-            client.get_collection(name)
-            return True
-        except CollectionNotFound:
-            return False
-
-    @property
-    def index(self) -> Optional[str]:
+        if index is None:
+            # exact searches find every match in a single round
+            return [(probes, ef_search, None)]
+
+        if index.method == IndexMethod.hnsw and self.client._supports_iterative_scan():
+            return [(probes, ef_search, max_scan_tuples)]
+
+        rounds: List[Tuple[int, int, Optional[int]]] = [(probes, ef_search, None)]
+        while len(rounds) < max_rounds:
+            if index.method == IndexMethod.hnsw:
+                if ef_search >= HNSW_MAX_EF_SEARCH:
+                    break
+                ef_search = min(ef_search * FILTERED_SEARCH_GROWTH, HNSW_MAX_EF_SEARCH)
+            else:
+                # probing every list is an exact search
+                n_lists = int(index.options.get("lists", 100))
+                if probes >= n_lists:
+                    break
+                probes = min(probes * FILTERED_SEARCH_GROWTH, n_lists)
+            rounds.append((probes, ef_search, None))
+        return rounds
+
+    def _app_id_clause(
+        self,
+        app_id: Optional[int],
+        imeasure: IndexMeasure,
+        info: Optional[CollectionInfo],
+        params: Dict[str, Any],
+        bind: bool = True,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> Tuple[Any, Any]:
         """
         PRIVATE
 
-        Note:
-            The `index` property is private and expected to undergo refactoring.
-            Do not rely on it's output.
+        Builds the clause that restricts a similarity search to a single tenant.
 
-        Retrieves the SQL name of the collection's vector index, if it exists.
+        When the tenant has its own partial index for *imeasure*, its `app_id` is rendered as a
+        literal so that the planner can prove the index's predicate and search it, even with
+        a generic plan for a prepared statement. Otherwise it is bound as a parameter and added
+        to *params*.
+
+        Args:
+            app_id (Optional[int]): The tenant to restrict the search to, if any.
+            imeasure (IndexMeasure): The measure the search orders by.
+            info (Optional[CollectionInfo]): The collection's catalog entry.
+            params (Dict[str, Any]): The statement's parameters.
+            bind (bool): Whether to bind *app_id* when the tenant has no partial index. False when
+                the search's filters already restrict it to the tenant.
+            binary_quantized (bool): Whether the search shortlists candidates with a binary quantized index.
+            prefix_dimension (Optional[int]): The length of the vector prefix the search shortlists
+                candidates by, if any.
 
         Returns:
-            Optional[str]: The name of the index, or None if no index exists.
+            Tuple[Any, Optional[ColumnElement]]: The part of the statement cache key that
+                identifies the clause, and the clause, or None if no clause is needed.
         """
+        if app_id is None:
+            return None, None
 
-        if self._index is None:
-            query = text(
-                """
-            select
-                relname as table_name
-            from
-                pg_class pc
-            where
-                pc.relnamespace = 'vecs'::regnamespace
-                and relname ilike 'ix_vector%'
-                and pc.relkind = 'i'
-            """
+        tenant_index = self._index_for(
+            info, imeasure, app_id, binary_quantized, prefix_dimension
+        )
+        if tenant_index is not None and tenant_index.app_id == app_id:
+            return ("app_id", int(app_id)), self.table.c.app_id == literal_column(
+                str(int(app_id))
             )
-            with self.client.Session() as sess:
-                ix_name = sess.execute(query).scalar()
-            self._index = ix_name
-        return self._index
 
-    def is_indexed_for_measure(self, measure: IndexMeasure):
+        if not bind:
+            return None, None
+
+        params["app_id"] = app_id
+        return "app_id", self.table.c.app_id == bindparam("app_id", type_=BIGINT)
+
+    def _tenant_clause(
+        self,
+        app_id: Optional[int],
+        imeasure: IndexMeasure,
+        info: Optional[CollectionInfo],
+        filter_shape: Any,
+        params: Dict[str, Any],
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> Tuple[Optional[int], Any, Any]:
         """
-        Checks if the collection is indexed for a specific measure.
+        PRIVATE
 
-        Args:
-            measure (IndexMeasure): The measure to check for.
+        Restricts a similarity search to the tenant given by *app_id*, or pinned by its filters,
+        and warns when the search has no covering index. See `_app_id_clause`.
 
         Returns:
-            bool: True if the collection is indexed for the measure, False otherwise.
+            Tuple[Optional[int], Any, Optional[ColumnElement]]: The tenant the search is restricted to,
+                which indexes must be looked up for, the part of the statement cache key that identifies
+                the clause, and the clause, or None if no clause is needed.
         """
+        if app_id is None:
+            app_id = pinned_app_id(filter_shape, params)
+            clause = self._app_id_clause(
+                app_id,
+                imeasure,
+                info,
+                params,
+                False,
+                binary_quantized,
+                prefix_dimension,
+            )
+        else:
+            clause = self._app_id_clause(
+                app_id,
+                imeasure,
+                info,
+                params,
+                True,
+                binary_quantized,
+                prefix_dimension,
+            )
 
-        index_name = self.index
-        if index_name is None:
-            return False
+        if not self._indexed_for(
+            info, imeasure, app_id, binary_quantized, prefix_dimension
+        ):
+            if binary_quantized:
+                covered = "binary quantized shortlists"
+            elif prefix_dimension is not None:
+                covered = f"{imeasure} over a {prefix_dimension} dimension prefix"
+            else:
+                covered = imeasure
+            warnings.warn(
+                UserWarning(
+                    f"Query does not have a covering index for {covered}. See Collection.create_index"
+                )
+            )
+        return (app_id, *clause)
 
-        ops = INDEX_MEASURE_TO_OPS.get(measure)
-        if ops is None:
-            return False
+    def _cached_stmt(self, key: Tuple[Any, ...], build: Callable[[], Select]) -> Select:
+        """
+        PRIVATE
 
-        if ops in index_name:
-            return True
+        Returns the statement cached for *key*, building and caching it on a miss.
 
-        return False
+        Statements are cached with their values as unbound parameters, so one statement
+        serves every query of the same shape. Reusing the statement object lets SQLAlchemy
+        skip both constructing it and generating its compiled cache key.
 
-    def create_index(
-        self,
-        measure: IndexMeasure = IndexMeasure.cosine_distance,
-        method: IndexMethod = IndexMethod.auto,
-        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]] = None,
-        replace=True,
-    ) -> None:
-        """
-        Creates an index for the collection.
+        Args:
+            key (Tuple[Any, ...]): The shape of the statement.
+            build (Callable[[], Select]): Builds the statement on a cache miss.
 
-        Note:
-            When `vecs` creates an index on a pgvector column in PostgreSQL, it uses a multi-step
-            process that enables performant indexes to be built for large collections with low end
-            database hardware.
+        Returns:
+            Select: The statement.
+        """
+        stmt = self._stmt_cache.get(key)
+        if stmt is None:
+            stmt = build()
+            with self._stmt_cache_lock:
+                if len(self._stmt_cache) >= STMT_CACHE_SIZE:
+                    # evict the oldest entry
+                    self._stmt_cache.pop(next(iter(self._stmt_cache)))
+                self._stmt_cache[key] = stmt
+        return stmt
+
+    def _query_stmt(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        limit: Optional[int] = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        rerank: Optional[int] = None,
+        shortlist: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+        info: Optional[CollectionInfo] = None,
+    ) -> Tuple[Select, Dict[str, Any], IndexMeasure, int, int, Optional[int]]:
+        """
+        PRIVATE
 
-            Those steps are:
+        Validates the arguments of a similarity search and builds its statement.
+        Arguments match those of `Collection.query`, plus the collection's catalog entry
+        *info* used to find per tenant indexes. A *limit* of None selects every matching record
+        in distance order, for streaming with a server side cursor.
 
-            - Creates a new table with a different name
-            - Randomly selects records from the existing table
-            - Inserts the random records from the existing table into the new table
-            - Creates the requested vector index on the new table
-            - Upserts all data from the existing table into the new table
-            - Drops the existing table
-            - Renames the new table to the existing tables name
+        When *rerank* is set the statement instead selects `limit * rerank` candidates as
+        rows of `id`, the requested metadata and text columns, and the vector, ready for
+        `rerank_results`. Their distances are left to be computed client side.
+
+        When *shortlist* is set, a subquery first selects that many candidates by the Hamming
+        distance between their binary quantized vectors and the query's, which a binary quantized
+        index can serve. The statement orders only the shortlist by the search's measure.
+        With *prefix_dimension*, the shortlist is instead selected by the search's measure over
+        the first *prefix_dimension* dimensions of the vectors, which a prefix index can serve.
+
+        Returns:
+            Tuple[Select, Dict[str, Any], IndexMeasure, int, int, Optional[int]]: The statement, the
+                parameters to execute it with, the measure it orders by, the ivfflat probes and hnsw
+                ef_search values to search with, and the tenant it is restricted to, given by *app_id*
+                or pinned by *filters*.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        imeasure, probes, ef_search = self._query_args(
+            limit, measure, probes, ef_search
+        )
+
+        radius = distance_threshold(imeasure, max_distance, min_similarity)
+
+        if rerank is not None:
+            if not isinstance(rerank, int) or rerank < 1:
+                raise ArgError("rerank must be an integer >= 1")
+            limit = limit * rerank  # type: ignore
+            include_value = False
+            include_vector = True
+            # hnsw index scans return at most ef_search records
+            ef_search = max(ef_search, min(limit, HNSW_MAX_EF_SEARCH))
+
+        if shortlist is not None:
+            if not isinstance(shortlist, int) or shortlist < limit:
+                raise ArgError("shortlist must be an integer >= the number of results")
+            if prefix_dimension is not None:
+                self._check_prefix_dimension(prefix_dimension)
+            elif not self.client._supports_binary_quantize():
+                raise ArgError(
+                    "binary_quantize Unavailable. Upgrade your pgvector installation to >= 0.7.0 to enable shortlists"
+                )
+            ef_search = max(ef_search, min(shortlist, HNSW_MAX_EF_SEARCH))
+        elif prefix_dimension is not None:
+            raise ArgError("prefix_dimension requires a shortlist")
+
+        vec = self._adapt_query(data, skip_adapter)
+
+        filter_shape, params = parameterize_filters(filters) if filters else (None, {})
+        id_list_shape, id_list_params = parameterize_id_lists(allow, deny)
+        params.update(id_list_params)
+        params["query_vec"] = vec
+        if radius is not None:
+            params["max_distance"] = radius
+        binary_quantized = shortlist is not None and prefix_dimension is None
+        app_id, app_id_key, app_id_clause = self._tenant_clause(
+            app_id,
+            imeasure,
+            info,
+            filter_shape,
+            params,
+            binary_quantized,
+            prefix_dimension,
+        )
+        # a shortlist is ordered by the collection's vectors as stored
+        half_precision = shortlist is None and self._half_precision_index(
+            self._index_for(info, imeasure, app_id)
+        )
+        half_prefix = prefix_dimension is not None and self._half_precision_index(
+            self._index_for(info, imeasure, app_id, prefix_dimension=prefix_dimension)
+        )
+
+        def build() -> Select:
+            distance_lambda = INDEX_MEASURE_TO_SQLA_ACC.get(imeasure)
+            if distance_lambda is None:
+                # unreachable
+                raise ArgError("invalid distance_measure")  # pragma: no cover
+
+            query_vec = bindparam(
+                "query_vec", type_=self._search_vector_type(half_precision)
+            )
+
+            clauses = []
+            if filters:
+                clauses.append(
+                    build_filter_clause(self.table.c.metadata, filter_shape)  # type: ignore
+                )
+            if app_id_clause is not None:
+                clauses.append(app_id_clause)
+            clauses.extend(build_id_list_clauses(self.table, id_list_shape))
+
+            source = None
+            search_column = self._search_column(half_precision)
+            if shortlist is not None:
+                if prefix_dimension is None:
+                    shortlist_order = self._hamming_distance(query_vec)
+                else:
+                    shortlist_order = distance_lambda(
+                        self._vector_prefix(
+                            self.table.c.vec, prefix_dimension, half_prefix
+                        )
+                    )(
+                        self._vector_prefix(
+                            cast(query_vec, query_vec.type),
+                            prefix_dimension,
+                            half_prefix,
+                        )
+                    )
+                source = (
+                    select(self.table)
+                    .filter(*clauses)
+                    .order_by(shortlist_order)
+                    .limit(shortlist)
+                    .subquery("shortlist")
+                )
+                search_column = source.c.vec
+                clauses = []
+
+            distance_clause = distance_lambda(search_column)(query_vec)
+
+            cols = self._query_columns(
+                distance_clause,
+                include_value,
+                include_metadata,
+                include_text,
+                include_vector,
+                source,
+            )
+
+            if radius is not None:
+                clauses.append(
+                    distance_clause <= bindparam("max_distance", type_=Float)
+                )
+
+            stmt = select(*cols).filter(*clauses)
+            stmt = stmt.order_by(distance_clause)
+            return stmt if limit is None else stmt.limit(limit)
+
+        key = (
+            "query",
+            imeasure,
+            limit,
+            include_value,
+            include_metadata,
+            include_text,
+            include_vector,
+            bool(filters),
+            filter_shape,
+            app_id_key,
+            id_list_shape,
+            half_precision,
+            shortlist,
+            prefix_dimension,
+            half_prefix,
+            radius is not None,
+        )
+        return (
+            self._cached_stmt(key, build),
+            params,
+            imeasure,
+            probes,
+            ef_search,
+            app_id,
+        )
+
+    def _query_many_stmt(
+        self,
+        data: Iterable[Union[Iterable[Numeric], Any]],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        info: Optional[CollectionInfo] = None,
+    ) -> Tuple[Select, Dict[str, Any], int, IndexMeasure, int, int]:
+        """
+        PRIVATE
+
+        Validates the arguments of a batched similarity search and builds its statement.
+        Arguments match those of `Collection.query_many`, plus the collection's catalog entry
+        *info* used to find per tenant indexes.
+
+        The query vectors are bound as a single `vector[]` parameter and unnested with their
+        position. Each one drives a `LATERAL` top-*limit* search over the collection, so the
+        whole batch runs as one statement. Every result row starts with the zero based
+        position of the query vector it belongs to.
+
+        Returns:
+            Tuple[Select, Dict[str, Any], int, IndexMeasure, int, int]: The statement, the parameters
+                to execute it with, the number of query vectors, the measure it orders by, and the
+                ivfflat probes and hnsw ef_search values to search with.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        imeasure, probes, ef_search = self._query_args(
+            limit, measure, probes, ef_search
+        )
+
+        vecs = [self._adapt_query(x, skip_adapter) for x in data]
+
+        filter_shape, params = parameterize_filters(filters) if filters else (None, {})
+        id_list_shape, id_list_params = parameterize_id_lists(allow, deny)
+        params.update(id_list_params)
+        params["query_vecs"] = vecs
+        app_id, app_id_key, app_id_clause = (
+            self._tenant_clause(app_id, imeasure, info, filter_shape, params)
+            if vecs
+            else (app_id, None, None)
+        )
+        half_precision = self._half_precision_index(
+            self._index_for(info, imeasure, app_id)
+        )
+
+        def build() -> Select:
+            distance_lambda = INDEX_MEASURE_TO_SQLA_ACC.get(imeasure)
+            if distance_lambda is None:
+                # unreachable
+                raise ArgError("invalid distance_measure")  # pragma: no cover
+
+            vec_type = self._search_vector_type(half_precision)
+            vec_array_type = postgresql.ARRAY(vec_type, dimensions=1)
+            queries = (
+                func.unnest(
+                    cast(bindparam("query_vecs", type_=vec_array_type), vec_array_type)
+                )
+                .table_valued(column("vec", vec_type), with_ordinality="ix")
+                .render_derived(name="q")
+            )
+
+            distance_clause = distance_lambda(self._search_column(half_precision))(
+                queries.c.vec
+            )
+
+            cols = self._query_columns(
+                distance_clause.label("distance"),
+                include_value,
+                include_metadata,
+                include_text,
+                include_vector,
+            )
+            if not include_value:
+                # Always selected so that the outer query can restore the order of each result list
+                cols.append(distance_clause.label("distance"))
+
+            nearest = select(*cols)
+            if filters:
+                nearest = nearest.filter(
+                    build_filter_clause(self.table.c.metadata, filter_shape)  # type: ignore
+                )
+            if app_id_clause is not None:
+                nearest = nearest.filter(app_id_clause)
+            nearest = nearest.filter(*build_id_list_clauses(self.table, id_list_shape))
+            nearest = nearest.order_by(distance_clause).limit(limit).lateral("r")
+
+            result_cols = [
+                c for c in nearest.c if include_value or c.name != "distance"
+            ]
+
+            return (
+                select((queries.c.ix - 1).label("query_ix"), *result_cols)
+                .select_from(queries.join(nearest, true()))
+                .order_by(queries.c.ix, nearest.c.distance)
+            )
+
+        key = (
+            "query_many",
+            imeasure,
+            limit,
+            include_value,
+            include_metadata,
+            include_text,
+            include_vector,
+            bool(filters),
+            filter_shape,
+            app_id_key,
+            id_list_shape,
+            half_precision,
+        )
+        return (
+            self._cached_stmt(key, build),
+            params,
+            len(vecs),
+            imeasure,
+            probes,
+            ef_search,
+        )
+
+    def _iter_records_stmt(
+        self,
+        filters: Optional[Metadata],
+        allow: Optional[Dict[str, Iterable[Any]]],
+        deny: Optional[Dict[str, Iterable[Any]]],
+        columns: Optional[Iterable[str]],
+        batch_size: int,
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        PRIVATE
+
+        Validates the arguments of `Collection.iter_records` and builds its statement.
+
+        Returns:
+            Tuple[Select, Dict[str, Any]]: The statement, selecting `id` then the requested columns
+                in primary key order, and the parameters to execute it with.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ArgError("batch_size must be an integer >= 1")
+
+        names = [col.name for col in self.table.c]
+        if columns is None:
+            selected = names
+        else:
+            if isinstance(columns, str):
+                raise ArgError("columns must be a list of column names")
+            selected = ["id"] + [name for name in columns if name != "id"]
+            unknown = set(selected).difference(names)
+            if unknown:
+                raise ArgError(f"unknown columns: {', '.join(sorted(unknown))}")
+
+        cols = [
+            self._vector_column() if name == "vec" else self.table.c[name]
+            for name in selected
+        ]
+        id_list_shape, params = parameterize_id_lists(allow, deny)
+        clauses = build_id_list_clauses(self.table, id_list_shape)
+        if filters:
+            clauses.insert(0, build_filters(self.table.c.metadata, filters))
+        stmt = select(*cols).where(*clauses).order_by(self.table.c.id)
+        return stmt, params
+
+    def _hnsw_scan_cap(
+        self,
+        info: Optional[CollectionInfo],
+        measure: IndexMeasure,
+        app_id: Optional[int],
+        ef_search: int,
+    ) -> Optional[int]:
+        """
+        PRIVATE
+
+        The number of records after which a streamed search's HNSW index scan ends.
 
-            If you create dependencies (like views) on the table that underpins
-            a `vecs.Collection` the `create_index` step may require you to drop those dependencies before
-            it will succeed.
+        Without iterative index scans, an HNSW index scan returns at most `ef_search` records
+        however many more match, which a streamed search cannot tell apart from the end of the results.
 
         Args:
-            measure (IndexMeasure, optional): The measure to index for. Defaults to 'cosine_distance'.
-            method (IndexMethod, optional): The indexing method to use. Defaults to 'auto'.
-            index_arguments: (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments
-            replace (bool, optional): Whether to replace the existing index. Defaults to True.
+            info (Optional[CollectionInfo]): The collection's catalog entry, or None if it does not exist.
+            measure (IndexMeasure): The measure searched by.
+            app_id (Optional[int]): The tenant the search is restricted to, if any.
+            ef_search (int): The hnsw ef_search value searched with.
+
+        Returns:
+            Optional[int]: *ef_search* if an HNSW index serves the search and pgvector does not
+                support iterative index scans, otherwise None.
+        """
+        if self.client._supports_iterative_scan():
+            return None
+        index = self._index_for(info, measure, app_id)
+        if index is None or index.method != IndexMethod.hnsw:
+            return None
+        return ef_search
+
+    def _query_iter_stmt(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        filters: Optional[Dict],
+        measure: Union[IndexMeasure, str],
+        include_value: bool,
+        include_metadata: bool,
+        include_text: bool,
+        *,
+        limit: Optional[int],
+        probes: Optional[int],
+        ef_search: Optional[int],
+        skip_adapter: bool,
+        include_vector: bool,
+        app_id: Optional[int],
+        allow: Optional[Dict[str, Iterable[Any]]],
+        deny: Optional[Dict[str, Iterable[Any]]],
+        batch_size: int,
+        info: Optional[CollectionInfo],
+    ) -> Tuple[Select, Dict[str, Any], int, int, Optional[int]]:
+        """
+        PRIVATE
+
+        Validates the arguments of a streamed similarity search and builds its statement.
+        Arguments match those of `Collection.query_iter`.
+
+        The statement has no `limit`. The caller stops reading after *limit* results instead, which
+        also ends the index scan.
+
+        Returns:
+            Tuple[Select, Dict[str, Any], int, int, Optional[int]]: The statement, the parameters to execute
+                it with, the ivfflat probes and hnsw ef_search values to search with, and the number of
+                records the HNSW index scan ends after, see `_hnsw_scan_cap`.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ArgError("limit must be an integer >= 1")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ArgError("batch_size must be an integer >= 1")
+
+        stmt, params, _, probes, ef_search, app_id = self._query_stmt(
+            data,
+            None,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+        if not self.client._supports_iterative_scan():
+            # hnsw index scans without iterative scans return at most ef_search records
+            ef_search = max(
+                ef_search,
+                HNSW_MAX_EF_SEARCH if limit is None else min(limit, HNSW_MAX_EF_SEARCH),
+            )
+        scan_cap = self._hnsw_scan_cap(info, IndexMeasure(measure), app_id, ef_search)
+        return stmt, params, probes, ef_search, scan_cap
+
+    def _query_within_stmt(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        max_distance: Optional[float],
+        min_similarity: Optional[float],
+        filters: Optional[Dict],
+        measure: Union[IndexMeasure, str],
+        include_metadata: bool,
+        include_text: bool,
+        *,
+        probes: Optional[int],
+        ef_search: Optional[int],
+        skip_adapter: bool,
+        include_vector: bool,
+        app_id: Optional[int],
+        allow: Optional[Dict[str, Iterable[Any]]],
+        deny: Optional[Dict[str, Iterable[Any]]],
+        batch_size: int,
+        info: Optional[CollectionInfo],
+    ) -> Tuple[Select, Dict[str, Any], float, int, int, Optional[int]]:
+        """
+        PRIVATE
+
+        Validates the arguments of a radius search and builds its statement. Arguments match
+        those of `Collection.query_within`.
+
+        The statement selects every matching record in distance order, always including the
+        distance, and does not restrict the distance itself. A `where` clause on the distance
+        would keep the index scan running past the radius, so the caller stops reading at the
+        first record beyond it instead.
+
+        Returns:
+            Tuple[Select, Dict[str, Any], float, int, int, Optional[int]]: The statement, the parameters
+                to execute it with, the radius as a distance, the ivfflat probes and hnsw ef_search values
+                to search with, and the number of records the HNSW index scan ends after, see `_hnsw_scan_cap`.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ArgError("batch_size must be an integer >= 1")
+
+        try:
+            imeasure = IndexMeasure(measure)
+        except ValueError:
+            raise ArgError("Invalid index measure")
+        radius = distance_threshold(imeasure, max_distance, min_similarity)
+        if radius is None:
+            raise ArgError("max_distance or min_similarity is required")
+
+        stmt, params, _, probes, ef_search, app_id = self._query_stmt(
+            data,
+            None,
+            filters,
+            imeasure,
+            True,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+        if not self.client._supports_iterative_scan():
+            # the number of records within the radius is unknown, so search as widely as hnsw allows
+            ef_search = max(ef_search, HNSW_MAX_EF_SEARCH)
+        scan_cap = self._hnsw_scan_cap(info, imeasure, app_id, ef_search)
+        return stmt, params, radius, probes, ef_search, scan_cap
+
+    def _check_prefix_dimension(self, prefix_dimension: int) -> None:
+        """
+        PRIVATE
+
+        Validates the length of a vector prefix to index or shortlist candidates by.
+
+        Args:
+            prefix_dimension (int): The number of leading dimensions.
+
+        Raises:
+            ArgError: If *prefix_dimension* is not shorter than the collection's vectors, or
+                pgvector does not support `subvector`.
+        """
+        if (
+            not isinstance(prefix_dimension, int)
+            or isinstance(prefix_dimension, bool)
+            or not 1 <= prefix_dimension < self.dimension
+        ):
+            raise ArgError(
+                f"prefix_dimension must be an integer between 1 and {self.dimension - 1}"
+            )
+        if not self.client._supports_subvector():
+            raise ArgError(
+                "subvector Unavailable. Upgrade your pgvector installation to >= 0.7.0 to enable prefix indexes"
+            )
+
+    def _resolve_index_method(
+        self,
+        measure: IndexMeasure,
+        method: IndexMethod,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]],
+        half_precision: bool = False,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> Tuple[IndexMethod, str]:
+        """
+        PRIVATE
+
+        Validates the arguments of `create_index` and resolves `IndexMethod.auto`.
+
+        Indexes on a `halfvec` collection always use a halfvec operator class. With *half_precision*,
+        so does an index on a `vector` collection, which then indexes the vectors cast to `halfvec`.
+        With *binary_quantized*, the index uses `BINARY_QUANTIZED_OPS` whatever the measure.
+        With *prefix_dimension*, the index uses the operator class for *measure* on a vector prefix.
+
+        Returns:
+            Tuple[IndexMethod, str]: The concrete index method and the pgvector operator class for *measure*.
 
         Raises:
-            ArgError: If an invalid index method is used, or if *replace* is False and an index already exists.
+            ArgError: If the method, measure and index arguments are invalid or incompatible.
         """
 
         if method not in (IndexMethod.ivfflat, IndexMethod.hnsw, IndexMethod.auto):
@@ -821,167 +2026,2747 @@ class Collection:
                 "HNSW Unavailable. Upgrade your pgvector installation to > 0.5.0 to enable HNSW support"
             )
 
-        ops = INDEX_MEASURE_TO_OPS.get(measure)
-        if ops is None:
-            raise ArgError("Unknown index measure")
+        if prefix_dimension is not None:
+            if binary_quantized:
+                raise ArgError(
+                    "prefix_dimension and binary_quantized indexes are mutually exclusive"
+                )
+            self._check_prefix_dimension(prefix_dimension)
 
-        unique_string = str(uuid.uuid4()).replace("-", "_")[0:7]
+        if binary_quantized:
+            if half_precision:
+                raise ArgError(
+                    "half_precision and binary_quantized indexes are mutually exclusive"
+                )
+            if not self.client._supports_binary_quantize():
+                raise ArgError(
+                    "binary_quantize Unavailable. Upgrade your pgvector installation to >= 0.7.0 to enable binary quantized indexes"
+                )
+            if measure not in INDEX_MEASURE_TO_OPS:
+                raise ArgError("Unknown index measure")
+            return method, BINARY_QUANTIZED_OPS
 
-        with self.client.Session() as sess:
-            with sess.begin():
-                if self.index is not None:
-                    if replace:
-                        sess.execute(text(f'drop index vecs."{self.index}";'))
-                        self._index = None
-                    else:
-                        raise ArgError("replace is set to False but an index exists")
+        half_precision = half_precision or self.storage == VectorStorage.halfvec
+        if half_precision and not self.client._supports_halfvec():
+            raise ArgError(
+                "halfvec Unavailable. Upgrade your pgvector installation to >= 0.7.0 to enable half precision indexes"
+            )
 
-                if method == IndexMethod.ivfflat:
-                    if not index_arguments:
-                        n_records: int = sess.execute(func.count(self.table.c.id)).scalar()  # type: ignore
+        ops = (
+            INDEX_MEASURE_TO_HALFVEC_OPS if half_precision else INDEX_MEASURE_TO_OPS
+        ).get(measure)
+        if ops is None:
+            raise ArgError("Unknown index measure")
 
-                        n_lists = (
-                            int(max(n_records / 1000, 30))
-                            if n_records < 1_000_000
-                            else int(math.sqrt(n_records))
-                        )
-                    else:
-                        # The following mypy error is ignored because mypy
-                        # complains that `index_arguments` is typed as a union
-                        # of IndexArgsIVFFlat and IndexArgsHNSW types,
-                        # which both don't necessarily contain the `n_lists`
-                        # parameter, however we have validated that the
-                        # correct type is being used above.
-                        n_lists = index_arguments.n_lists  # type: ignore
-
-                    sess.execute(
-                        text(
-                            f"""
-                            create index ix_{ops}_ivfflat_nl{n_lists}_{unique_string}
-                              on vecs."{self.table.name}"
-                              using ivfflat (vec {ops}) with (lists={n_lists})
-                            """
-                        )
-                    )
+        return method, ops
 
-                if method == IndexMethod.hnsw:
-                    if not index_arguments:
-                        index_arguments = IndexArgsHNSW()
-
-                    # See above for explanation of why the following lines
-                    # are ignored
-                    m = index_arguments.m  # type: ignore
-                    ef_construction = index_arguments.ef_construction  # type: ignore
-
-                    sess.execute(
-                        text(
-                            f"""
-                            create index ix_{ops}_hnsw_m{m}_efc{ef_construction}_{unique_string}
-                              on vecs."{self.table.name}"
-                              using hnsw (vec {ops}) WITH (m={m}, ef_construction={ef_construction});
-                            """
-                        )
-                    )
+    @staticmethod
+    def _ivfflat_n_lists(
+        index_arguments: Optional[IndexArgsIVFFlat], n_records: Optional[int]
+    ) -> int:
+        """
+        PRIVATE
 
-        return None
+        The number of lists of an ivfflat index.
 
+        Args:
+            index_arguments (IndexArgsIVFFlat, optional): User supplied index arguments.
+            n_records (int, optional): The number of records in the collection.
 
-def build_filters(json_col: Column, filters: Dict):
-    """
-    PRIVATE
+        Returns:
+            int: The number of lists in *index_arguments*, or a default sized for *n_records*.
+        """
+        if index_arguments:
+            return index_arguments.n_lists
 
-    Builds filters for SQL query based on provided dictionary.
+        n_records = n_records or 0
+        return (
+            int(max(n_records / 1000, 30))
+            if n_records < 1_000_000
+            else int(math.sqrt(n_records))
+        )
 
-    Args:
-        json_col (Column): The column in the database table.
-        filters (Dict): The dictionary specifying filter conditions.
+    def _ivfflat_sample_size(
+        self,
+        n_lists: int,
+        maintenance_work_mem: int,
+        index_arguments: Optional[IndexArgsIVFFlat],
+    ) -> int:
+        """
+        PRIVATE
 
-    Raises:
-        FilterError: If filter conditions are not correctly formatted.
+        The number of records to train an ivfflat index's centroids on.
 
-    Returns:
-        The filter clause for the SQL query.
-    """
+        pgvector trains on at most 50 records per list, and refuses to build an index
+        when the k-means working set exceeds `maintenance_work_mem`. That working set
+        holds the samples and, per sample, a distance bound for every list, so the
+        default sample is the largest that fits alongside the centroids.
 
-    if not isinstance(filters, dict):
-        raise FilterError("filters must be a dict")
+        Args:
+            n_lists (int): The number of lists in the index.
+            maintenance_work_mem (int): The server's `maintenance_work_mem` in bytes.
+            index_arguments (IndexArgsIVFFlat, optional): User supplied index arguments.
 
-    if len(filters) > 1:
-        raise FilterError("max 1 entry per filter")
+        Returns:
+            int: The sample size.
+        """
+        if index_arguments and index_arguments.sample_size:
+            return index_arguments.sample_size
+
+        float_size = 4
+        centroids_bytes = float_size * n_lists * (2 * self.dimension + n_lists)
+        sample_bytes = float_size * (self.dimension + n_lists) + 16
+        budget = (maintenance_work_mem - centroids_bytes) // sample_bytes
+        return int(max(n_lists, min(n_lists * 50, budget)))
+
+    @staticmethod
+    def _needs_sampled_build(
+        n_records: int, n_lists: int, sample_size: int, app_id: Optional[int]
+    ) -> bool:
+        """
+        PRIVATE
 
-    for key, value in filters.items():
-        if not isinstance(key, str):
-            raise FilterError("*filters* keys must be strings")
+        Whether an ivfflat index must be built by `_sampled_build_ddl` rather than in place.
 
-        if key in ("$and", "$or"):
-            if not isinstance(value, list):
-                raise FilterError(
-                    "$and/$or filters must have associated list of conditions"
-                )
+        pgvector's own k-means already trains on a random sample of 50 records per list, so
+        rebuilding the table only pays off when the centroids must be trained on fewer records:
+        a smaller *sample_size* was requested, or the default sample did not fit in
+        `maintenance_work_mem`.
 
-            if key == "$and":
-                return and_(*[build_filters(json_col, subcond) for subcond in value])
+        Args:
+            n_records (int): The number of records to index.
+            n_lists (int): The number of lists in the index.
+            sample_size (int): The number of records to train the centroids on, see `_ivfflat_sample_size`.
+            app_id (int, optional): The tenant a partial index is restricted to. Per tenant partial
+                indexes are always built in place, since rebuilding the table would block writes
+                for every tenant.
 
-            if key == "$or":
-                return or_(*[build_filters(json_col, subcond) for subcond in value])
+        Returns:
+            bool: True if the table must be rebuilt around the index.
+        """
+        return app_id is None and sample_size < n_lists * 50 and sample_size < n_records
 
-            raise Unreachable()
+    def _count_stmt(self, app_id: Optional[int] = None) -> Select:
+        """
+        PRIVATE
 
-        if isinstance(value, dict):
-            if len(value) > 1:
-                raise FilterError("only one operator permitted")
-            for operator, clause in value.items():
-                if operator not in ("$eq", "$ne", "$lt", "$lte", "$gt", "$gte", "$in"):
-                    raise FilterError("unknown operator")
+        Builds a statement that counts the collection's records.
 
-                # equality of singular values can take advantage of the metadata index
-                # using containment operator. Containment can not be used to test equality
-                # of lists or dicts so we restrict to single values with a __len__ check.
-                if operator == "$eq" and not hasattr(clause, "__len__"):
-                    contains_value = cast({key: clause}, postgresql.JSONB)
-                    return json_col.op("@>")(contains_value)
+        Args:
+            app_id (int, optional): Counts only the records of a single tenant.
 
-                if operator == "$in":
-                    if not isinstance(clause, list):
-                        raise FilterError("argument to $in filter must be a list")
+        Returns:
+            Select: The statement.
+        """
+        stmt = select(func.count(self.table.c.id))
+        if app_id is not None:
+            stmt = stmt.where(self.table.c.app_id == app_id)
+        return stmt
 
-                    for elem in clause:
-                        if not isinstance(elem, (int, str, float)):
-                            raise FilterError(
-                                "argument to $in filter must be a list or scalars"
-                            )
+    def _large_tenants_stmt(self, min_records: int) -> Select:
+        """
+        PRIVATE
 
-                    # cast the array of scalars to a postgres array of jsonb so we can
-                    # directly compare json types in the query
-                    contains_value = [cast(elem, postgresql.JSONB) for elem in clause]
-                    return json_col.op("->")(key).in_(contains_value)
+        Builds a statement that selects the tenants with at least *min_records* records.
 
-                matches_value = cast(clause, postgresql.JSONB)
+        Args:
+            min_records (int): The minimum number of records.
 
-                # handles non-singular values
-                if operator == "$eq":
-                    return json_col.op("->")(key) == matches_value
+        Returns:
+            Select: The statement, selecting one `app_id` per row, in ascending order.
+        """
+        n_records = func.count(self.table.c.id)
+        return (
+            select(self.table.c.app_id)
+            .where(self.table.c.app_id.isnot(None))
+            .group_by(self.table.c.app_id)
+            .having(n_records >= min_records)
+            .order_by(self.table.c.app_id)
+        )
 
-                elif operator == "$ne":
-                    return json_col.op("->")(key) != matches_value
+    def _sampled_build_ddl(
+        self,
+        shadow_name: str,
+        sample_fraction: float,
+        sample_size: int,
+        index_ddl: str,
+        rebuild_ddl: List[str],
+    ) -> List[str]:
+        """
+        PRIVATE
 
-                elif operator == "$lt":
-                    return json_col.op("->")(key) < matches_value
+        Builds the statements that rebuild the collection's table around a vector index
+        trained on a random sample of its records.
 
-                elif operator == "$lte":
-                    return json_col.op("->")(key) <= matches_value
+        The records are copied into a new table without indexes, starting with the sample.
+        The vector index is built while the new table holds only the sample, so its
+        centroids are trained on it. The remaining records are then inserted through the
+        index, and the new table replaces the collection's table. The new table copies the
+        columns' defaults, constraints, storage and comments, and *rebuild_ddl* restores the
+        rest. The statements must run in one transaction holding a lock that blocks writes
+        to the collection.
 
-                elif operator == "$gt":
-                    return json_col.op("->")(key) > matches_value
+        Args:
+            shadow_name (str): The name of the new table.
+            sample_fraction (float): The fraction of records to sample, between 0 and 1.
+            sample_size (int): The maximum number of records to sample.
+            index_ddl (str): The `create index` statement, targeting the new table.
+            rebuild_ddl (List[str]): Statements that recreate the collection's other
+                constraints and indexes, its triggers, privileges and policies, see `REBUILD_DDL_QUERY`.
 
-                elif operator == "$gte":
-                    return json_col.op("->")(key) >= matches_value
+        Returns:
+            List[str]: The statements, in execution order.
+        """
+        table_name = self.table.name
+        return [
+            f"""
+            create table vecs."{shadow_name}" (
+              like vecs."{table_name}" including all excluding indexes
+            )
+            """,
+            # a row level sample, so that records clustered on disk don't bias the centroids,
+            # shuffled before it is cut to size so that the whole table is sampled
+            f"""
+            insert into vecs."{shadow_name}"
+            select * from (
+              select * from vecs."{table_name}"
+                tablesample bernoulli ({100 * sample_fraction})
+            ) sample
+            order by random()
+            limit {sample_size}
+            """,
+            index_ddl,
+            f"""
+            insert into vecs."{shadow_name}"
+            select * from vecs."{table_name}" t
+            where not exists (
+              select 1 from vecs."{shadow_name}" s where s.id = t.id
+            )
+            """,
+            f'drop table vecs."{table_name}"',
+            f'alter table vecs."{shadow_name}" rename to "{table_name}"',
+            *rebuild_ddl,
+        ]
 
-                else:
-                    raise Unreachable()
+    def _index_ddl(
+        self,
+        method: IndexMethod,
+        ops: str,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]],
+        n_records: Optional[int] = None,
+        table_name: Optional[str] = None,
+        *,
+        index_name: Optional[str] = None,
+        concurrently: bool = False,
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> str:
+        """
+        PRIVATE
 
+        Builds the `create index` statement for a vector index.
 
-def build_table(name: str, meta: MetaData, dimension: int) -> Table:
+        Args:
+            method (IndexMethod): The concrete index method, see `_resolve_index_method`.
+            ops (str): The pgvector operator class to index.
+            index_arguments (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments.
+            n_records (int, optional): The number of records in the collection. Required to size
+                an ivfflat index when *index_arguments* are not provided.
+            table_name (str, optional): The table to index. Defaults to the collection's table.
+            index_name (str, optional): The name of the index. Defaults to a new name, see `_new_index_name`.
+            concurrently (bool, optional): Whether to build the index without blocking writes. Defaults to False.
+            app_id (int, optional): Restricts the index to the records of a single tenant. Defaults to None.
+            prefix_dimension (int, optional): Indexes only this many leading dimensions of the vectors. Defaults to None.
+
+        Returns:
+            str: The DDL statement.
+        """
+        table_name = table_name or self.table.name
+        index_name = index_name or self._new_index_name(
+            method, ops, index_arguments, n_records, app_id, prefix_dimension
+        )
+        create = "create index concurrently" if concurrently else "create index"
+        where = "" if app_id is None else f"where app_id = {int(app_id)}"
+        vec = self._index_expression(ops, prefix_dimension)
+
+        if method == IndexMethod.ivfflat:
+            n_lists = self._ivfflat_n_lists(index_arguments, n_records)  # type: ignore
+
+            return f"""
+                {create} {index_name}
+                  on vecs."{table_name}"
+                  using ivfflat ({vec} {ops}) with (lists={n_lists})
+                  {where}
+                """
+
+        if method == IndexMethod.hnsw:
+            if not index_arguments:
+                index_arguments = IndexArgsHNSW()
+
+            # See above for explanation of why the following lines
+            # are ignored
+            m = index_arguments.m  # type: ignore
+            ef_construction = index_arguments.ef_construction  # type: ignore
+
+            return f"""
+                {create} {index_name}
+                  on vecs."{table_name}"
+                  using hnsw ({vec} {ops}) WITH (m={m}, ef_construction={ef_construction})
+                  {where};
+                """
+
+        raise Unreachable()
+
+    def _index_expression(
+        self, ops: str, prefix_dimension: Optional[int] = None
+    ) -> str:
+        """
+        PRIVATE
+
+        The expression a vector index with operator class *ops* indexes.
+
+        Args:
+            ops (str): The pgvector operator class to index.
+            prefix_dimension (Optional[int]): The number of leading dimensions a prefix index covers.
+
+        Returns:
+            str: `vec`, or `vec` cast to `halfvec` for a half precision index on a `vector` column,
+                or `vec` binary quantized for a binary quantized index, or the first
+                *prefix_dimension* dimensions of `vec` for a prefix index.
+        """
+        if prefix_dimension is not None:
+            prefix_type = (
+                "halfvec" if ops in INDEX_MEASURE_TO_HALFVEC_OPS.values() else "vector"
+            )
+            k = int(prefix_dimension)
+            return f"(subvector(vec, 1, {k})::{prefix_type}({k}))"
+        if ops == BINARY_QUANTIZED_OPS:
+            return f"(binary_quantize(vec)::bit({self.dimension}))"
+        if self._half_precision_index(IndexInfo("", "", ops)):
+            return f"(vec::halfvec({self.dimension}))"
+        return "vec"
+
+    def _new_index_name(
+        self,
+        method: IndexMethod,
+        ops: str,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]],
+        n_records: Optional[int] = None,
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> str:
+        """
+        PRIVATE
+
+        Names a new vector index after its operator class, build parameters and tenant.
+
+        Args:
+            method (IndexMethod): The concrete index method, see `_resolve_index_method`.
+            ops (str): The pgvector operator class to index.
+            index_arguments (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments.
+            n_records (int, optional): The number of records in the collection.
+            app_id (int, optional): The tenant a partial index is restricted to.
+            prefix_dimension (int, optional): The number of leading dimensions a prefix index covers.
+
+        Returns:
+            str: The name, made unique with a random suffix.
+        """
+        unique_string = str(uuid.uuid4()).replace("-", "_")[0:7]
+        if app_id is not None:
+            unique_string = f"app{int(app_id)}_{unique_string}".replace("-", "n")
+        if prefix_dimension is not None:
+            unique_string = f"d{int(prefix_dimension)}_{unique_string}"
+
+        if method == IndexMethod.ivfflat:
+            n_lists = self._ivfflat_n_lists(index_arguments, n_records)  # type: ignore
+            return f"ix_{ops}_ivfflat_nl{n_lists}_{unique_string}"
+
+        if method == IndexMethod.hnsw:
+            if not index_arguments:
+                index_arguments = IndexArgsHNSW()
+            m = index_arguments.m  # type: ignore
+            ef_construction = index_arguments.ef_construction  # type: ignore
+            return f"ix_{ops}_hnsw_m{m}_efc{ef_construction}_{unique_string}"
+
+        raise Unreachable()
+
+    @staticmethod
+    def _build_settings(
+        maintenance_work_mem: Optional[str],
+        max_parallel_maintenance_workers: Optional[int],
+    ) -> Dict[str, str]:
+        """
+        PRIVATE
+
+        The settings that control the resources available to an index build.
+
+        Args:
+            maintenance_work_mem (str, optional): Memory available to the build, e.g. '2GB'.
+            max_parallel_maintenance_workers (int, optional): Parallel workers available to the build.
+
+        Returns:
+            Dict[str, str]: Setting names and values, for the arguments that were provided.
+
+        Raises:
+            ArgError: If *max_parallel_maintenance_workers* is not a non-negative integer.
+        """
+        settings = {}
+        if maintenance_work_mem is not None:
+            settings["maintenance_work_mem"] = str(maintenance_work_mem)
+        if max_parallel_maintenance_workers is not None:
+            if (
+                not isinstance(max_parallel_maintenance_workers, int)
+                or max_parallel_maintenance_workers < 0
+            ):
+                raise ArgError(
+                    "max_parallel_maintenance_workers must be an integer >= 0"
+                )
+            settings["max_parallel_maintenance_workers"] = str(
+                max_parallel_maintenance_workers
+            )
+        return settings
+
+
+class Collection(BaseCollection):
+    """
+    The `vecs.Collection` class represents a collection of vectors within a PostgreSQL database with pgvector support.
+    It provides methods to manage (create, delete, fetch, upsert), index, and perform similarity searches on these vector collections.
+
+    The collections are stored in separate tables in the database, with each vector associated with an identifier and optional metadata.
+
+    Example usage:
+
+        with vecs.create_client(DB_CONNECTION) as vx:
+            collection = vx.create_collection(name="docs", dimension=3)
+            collection.upsert([("id1", [1, 1, 1], {"key": "value"})])
+            # Further operations on 'collection'
+
+    Public Attributes:
+        name: The name of the vector collection.
+        dimension: The dimension of vectors in the collection.
+
+    Note: Some methods of this class can raise exceptions from the `vecs.exc` module if errors occur.
+    """
+
+    def __len__(self) -> int:
+        """
+        Returns the number of vectors in the collection.
+
+        Returns:
+            int: The number of vectors in the collection.
+        """
+        with self.client.Session() as sess:
+            with sess.begin():
+                stmt = select(func.count()).select_from(self.table)
+                return sess.execute(stmt).scalar() or 0
+
+    def _create_if_not_exists(self):
+        """
+        PRIVATE
+
+        Creates a new collection in the database if it doesn't already exist
+
+        Returns:
+            Collection: The found or created collection.
+        """
+        info = self.client._collection_info(self.name)
+        collection_dimension = info.dimension if info else None
+
+        reported_dimensions = set(
+            [x for x in [self.dimension, collection_dimension] if x is not None]
+        )
+        if len(reported_dimensions) > 1:
+            raise MismatchedDimension(
+                "Dimensions reported by adapter, dimension, and existing collection do not match"
+            )
+        self._check_storage(info)
+
+        if not collection_dimension:
+            self.table.create(self.client.engine)
+
+            with self.client.Session() as sess:
+                for ddl in self._column_index_ddl():
+                    sess.execute(text(ddl))
+                sess.commit()
+            self.client._invalidate_catalog()
+
+        return self
+
+    def _create(self):
+        """
+        PRIVATE
+
+        Creates a new collection in the database. Raises a `vecs.exc.CollectionAlreadyExists`
+        exception if a collection with the specified name already exists.
+
+        Returns:
+            Collection: The newly created collection.
+        """
+
+        collection_exists = self.__class__._does_collection_exist(
+            self.client, self.name
+        )
+        if collection_exists:
+            raise CollectionAlreadyExists(
+                "Collection with requested name already exists"
+            )
+        self._check_storage(None)
+        self.table.create(self.client.engine)
+
+        with self.client.Session() as sess:
+            for ddl in self._column_index_ddl():
+                sess.execute(text(ddl))
+            sess.commit()
+        self.client._invalidate_catalog()
+        return self
+
+    def _drop(self):
+        """
+        PRIVATE
+
+        Deletes the collection from the database. Raises a `vecs.exc.CollectionNotFound`
+        exception if no collection with the specified name exists.
+
+        Returns:
+            Collection: The deleted collection.
+        """
+        from sqlalchemy.schema import DropTable
+
+        with self.client.Session() as sess:
+            sess.execute(DropTable(self.table, if_exists=True))
+            sess.commit()
+        self.client._invalidate_catalog()
+
+        return self
+
+    def upsert(
+        self,
+        records: Iterable[Tuple[str, Any, Metadata]],
+        skip_adapter: bool = False,
+        method: Union[UpsertMethod, str] = UpsertMethod.insert,
+        workers: int = 1,
+    ) -> None:
+        """
+        Inserts or updates *vectors* records in the collection.
+
+        Args:
+            records (Iterable[Tuple[str, Any, Metadata]]): An iterable of content to upsert.
+                Each record is a tuple where:
+                  - the first element is a unique string identifier
+                  - the second element is an iterable of numeric values or relevant input type for the
+                    adapter assigned to the collection
+                  - the third element is metadata associated with the vector
+
+            skip_adapter (bool): Should the adapter be skipped while upserting. i.e. if vectors are being
+                provided, rather than a media type that needs to be transformed
+            method (Union[UpsertMethod, str], optional): The strategy used to write records. Defaults to 'insert'.
+                Use 'copy' for large loads, where rendering multi-row insert statements dominates.
+            workers (int, optional): The number of connections to write through concurrently. Defaults to 1.
+                When greater than 1, each worker writes its share of the chunks in its own transaction,
+                so a failure in one worker does not roll back chunks already committed by another.
+
+        Raises:
+            ArgError: If an invalid upsert method or number of workers is used.
+            UpsertError: If any worker of a parallel upsert fails.
+        """
+        try:
+            umethod = UpsertMethod(method)
+        except ValueError:
+            raise ArgError("Invalid upsert method")
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ArgError("workers must be an integer >= 1")
+
+        chunk_size = 500 if umethod == UpsertMethod.insert else 5000
+
+        if skip_adapter:
+            pipeline = flu(records).chunk(chunk_size)
+        else:
+            # Construct a lazy pipeline of steps to transform and chunk user input
+            pipeline = flu(self.adapter(records, AdapterContext("upsert"))).chunk(
+                chunk_size
+            )
+
+        return self._write_chunks(pipeline, umethod, workers, self._upsert_chunk)
+
+    def upsert_arrays(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Optional[Sequence[Optional[Metadata]]] = None,
+        text: Optional[Sequence[Optional[str]]] = None,
+        doc_instance_id: Optional[Sequence[Optional[int]]] = None,
+        order: Optional[Sequence[Optional[int]]] = None,
+        memento_membership: Optional[Sequence[Optional[int]]] = None,
+        app_id: Optional[Sequence[Optional[int]]] = None,
+        *,
+        workers: int = 1,
+    ) -> None:
+        """
+        Inserts or updates records supplied as parallel columns.
+
+        Vectors are streamed to the database in chunks with binary `COPY`, so the
+        matrix may be a `np.memmap` larger than available memory. The collection's
+        adapter is not applied.
+
+        Args:
+            ids (Sequence[str]): The unique identifier of each record.
+            vectors (np.ndarray): A numeric array of shape (len(ids), dimension).
+            metadata (Optional[Sequence[Optional[Metadata]]], optional): Metadata per record.
+            text (Optional[Sequence[Optional[str]]], optional): Text per record.
+            doc_instance_id (Optional[Sequence[Optional[int]]], optional): Document instance id per record.
+            order (Optional[Sequence[Optional[int]]], optional): Order per record.
+            memento_membership (Optional[Sequence[Optional[int]]], optional): Memento membership per record.
+            app_id (Optional[Sequence[Optional[int]]], optional): App id per record.
+            workers (int, optional): The number of connections to write through concurrently. Defaults to 1.
+
+        Raises:
+            ArgError: If the shapes of the inputs do not match each other or the collection's dimension.
+            UpsertError: If any worker of a parallel upsert fails.
+        """
+        if isinstance(ids, str):
+            raise ArgError("ids must be a sequence of strings")
+
+        if not isinstance(vectors, np.ndarray) or vectors.ndim != 2:
+            raise ArgError("vectors must be a 2 dimensional numpy array")
+
+        if not np.issubdtype(vectors.dtype, np.number):
+            raise ArgError("vectors must have a numeric dtype")
+
+        if vectors.shape[1] != self.dimension:
+            raise ArgError(
+                f"vectors have dimension {vectors.shape[1]} but the collection has dimension {self.dimension}"
+            )
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ArgError("workers must be an integer >= 1")
+
+        n_records = len(ids)
+        columns = dict(
+            metadata=metadata,
+            text=text,
+            doc_instance_id=doc_instance_id,
+            order=order,
+            memento_membership=memento_membership,
+            app_id=app_id,
+        )
+        for name, values in [("vectors", vectors), *columns.items()]:
+            if values is not None and len(values) != n_records:
+                raise ArgError(f"{name} must have one entry per id")
+
+        def copy_slice(sess, chunk: slice, staging_table) -> None:
+            payload = encode_copy_binary_columns(
+                ids[chunk],
+                vectors[chunk],
+                **{
+                    name: None if values is None else values[chunk]
+                    for name, values in columns.items()
+                },
+                half=self.storage == VectorStorage.halfvec,
+            )
+            self._copy_into_collection(sess, staging_table, payload, binary=True)
+
+        chunk_size = 5000
+        chunks = (
+            slice(start, start + chunk_size)
+            for start in range(0, n_records, chunk_size)
+        )
+        return self._write_chunks(chunks, UpsertMethod.copy, workers, copy_slice)
+
+    def _write_chunks(
+        self,
+        chunks: Iterable[Any],
+        method: UpsertMethod,
+        workers: int,
+        write: Callable[[Any, Any, Any], None],
+    ) -> None:
+        """
+        PRIVATE
+
+        Writes chunks in a single transaction, or spreads them over several connections
+        when *workers* is greater than 1.
+
+        Args:
+            chunks (Iterable[Any]): The chunks to write.
+            method (UpsertMethod): The strategy used to write each chunk.
+            workers (int): The number of worker threads and connections.
+            write (Callable): Called with a session, a chunk and the staging table
+                (None unless *method* is 'copy') to write each chunk.
+
+        Raises:
+            UpsertError: If any worker of a parallel upsert fails.
+        """
+        if workers > 1:
+            return self._parallel_upsert(chunks, method, workers, write)
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                staging_table = None
+                if method == UpsertMethod.copy:
+                    staging_table = self._create_staging_table(sess)
+
+                for chunk in chunks:
+                    write(sess, chunk, staging_table)
+        return None
+
+    def _parallel_upsert(
+        self,
+        chunks: Iterable[Any],
+        method: UpsertMethod,
+        workers: int,
+        write: Callable[[Any, Any, Any], None],
+    ) -> None:
+        """
+        PRIVATE
+
+        Spreads chunks over *workers* pooled connections. Chunks are handed to the
+        workers through a bounded queue so that at most two chunks per worker are
+        held in memory at once. Each worker writes in a single transaction that is
+        rolled back, rather than committed, if any other worker has failed by the
+        time it finishes.
+
+        Args:
+            chunks (Iterable[Any]): The chunks to write.
+            method (UpsertMethod): The strategy used to write each chunk.
+            workers (int): The number of worker threads and connections.
+            write (Callable): Writes one chunk. See `_write_chunks`.
+
+        Raises:
+            UpsertError: If any worker, or the iterable producing chunks, fails.
+        """
+        pending: queue.Queue = queue.Queue(maxsize=2 * workers)
+        errors: List[Exception] = []
+        failed = threading.Event()
+
+        def work() -> None:
+            chunk: Any = []
+            try:
+                with self.client.Session() as sess:
+                    sess.begin()
+                    staging_table = None
+                    if method == UpsertMethod.copy:
+                        staging_table = self._create_staging_table(sess)
+
+                    while True:
+                        chunk = pending.get()
+                        if chunk is None:
+                            break
+                        if not failed.is_set():
+                            write(sess, chunk, staging_table)
+
+                    if failed.is_set():
+                        sess.rollback()
+                    else:
+                        sess.commit()
+            except Exception as e:
+                errors.append(e)
+                failed.set()
+                # Keep consuming until this worker's sentinel arrives so the producer never blocks
+                while chunk is not None:
+                    chunk = pending.get()
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for chunk in chunks:
+                if failed.is_set():
+                    break
+                pending.put(chunk)
+        except Exception as e:
+            errors.append(e)
+            failed.set()
+        finally:
+            for _ in threads:
+                pending.put(None)
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise UpsertError(
+                f"{len(errors)} error(s) occurred during parallel upsert", errors
+            )
+        return None
+
+    def _upsert_chunk(self, sess, chunk: List[Any], staging_table=None) -> None:
+        """
+        PRIVATE
+
+        Writes one chunk of records in the session's open transaction.
+
+        Args:
+            sess (Session): A session with an open transaction.
+            chunk (List[Any]): The records to write.
+            staging_table (TableClause, optional): When provided, the chunk is written with `COPY`
+                through this staging table. Otherwise a multi-row insert statement is used.
+        """
+        if staging_table is not None and self.client.binary_vectors:
+            payload = encode_copy_binary_rows(
+                chunk, self.dimension, self.storage == VectorStorage.halfvec
+            )
+            self._copy_into_collection(sess, staging_table, payload, binary=True)
+        elif staging_table is not None:
+            payload = (
+                encode_copy_text_row(record, self.dimension).encode("utf-8")
+                for record in chunk
+            )
+            self._copy_into_collection(sess, staging_table, payload)
+        else:
+            stmt = postgresql.insert(self.table).values(chunk)
+            sess.execute(self._on_conflict_update(stmt))
+
+    def _create_staging_table(self, sess):
+        """
+        PRIVATE
+
+        Creates a temporary table with the same columns as the collection that is
+        dropped when the current transaction commits.
+
+        Args:
+            sess (Session): A session with an open transaction.
+
+        Returns:
+            TableClause: A lightweight table clause referencing the staging table.
+        """
+        staging_table, ddl = self._staging_table()
+        sess.execute(text(ddl))
+        return staging_table
+
+    def _copy_into_collection(
+        self, sess, staging_table, payload: Iterable[bytes], binary: bool = False
+    ) -> None:
+        """
+        PRIVATE
+
+        Streams encoded records into the staging table with `COPY` and merges
+        them into the collection.
+
+        Args:
+            sess (Session): A session with an open transaction.
+            staging_table (TableClause): The table returned by `_create_staging_table`.
+            payload (Iterable[bytes]): `COPY` input with columns ordered like `COPY_COLUMNS`.
+            binary (bool, optional): Whether *payload* is in the binary, rather than text, `COPY` format.
+        """
+        column_list = ", ".join(f'"{name}"' for name in COPY_COLUMNS)
+        copy_format = "binary" if binary else "text"
+        reader = CopyReader(payload)
+        dbapi_connection = sess.connection().connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f'truncate "{staging_table.name}"')
+            try:
+                cursor.copy_expert(
+                    f'copy "{staging_table.name}" ({column_list}) from stdin with (format {copy_format})',
+                    reader,
+                )
+            except Exception:
+                # Surface errors raised while encoding records, e.g. a bad dimension
+                if reader.error is not None:
+                    raise reader.error
+                raise
+
+        sess.execute(self._merge_staging_stmt(staging_table))
+
+    def fetch(self, ids: Iterable[str]) -> List[Record]:
+        """
+        Fetches vectors from the collection by their identifiers.
+
+        The identifiers are sent as a single array parameter, so any number of records is
+        fetched in one round trip. See `fetch_iter` to stream large fetches.
+
+        Args:
+            ids (Iterable[str]): An iterable of vector identifiers.
+
+        Returns:
+            List[Record]: A list of the fetched vectors.
+        """
+        ids = self._id_list(ids)
+        if not ids:
+            return []
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                return sess.execute(self._fetch_stmt(), {"allow_id": ids}).fetchall()
+
+    def fetch_iter(
+        self,
+        ids: Iterable[str],
+        *,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+        as_blocks: bool = False,
+    ) -> Iterator[Union[Record, str, RecordBlock]]:
+        """
+        Streams records from the collection by their identifiers, in primary key order.
+
+        Records are read through a server side cursor *batch_size* at a time as they arrive,
+        rather than collected into a list like `fetch`.
+
+        Args:
+            ids (Iterable[str]): An iterable of vector identifiers.
+            columns (Optional[Iterable[str]], optional): The columns to read, see `iter_records`.
+                Defaults to None, which reads every column.
+            batch_size (int, optional): The number of records read from the cursor at a time. Defaults to 1000.
+            as_blocks (bool, optional): Whether to yield one `RecordBlock` per batch, with the batch's
+                vectors stacked into a single numpy array. Defaults to False.
+
+        Returns:
+            Iterator[Union[Record, str, RecordBlock]]: The fetched records, in the forms yielded
+                by `iter_records`.
+
+        Raises:
+            ArgError: If any argument is invalid. *ids* are validated on the call, before any
+                record is read.
+        """
+        return self.iter_records(
+            allow={"id": self._id_list(ids)},
+            columns=columns,
+            batch_size=batch_size,
+            as_blocks=as_blocks,
+        )
+
+    def delete(
+        self,
+        ids: Optional[Iterable[str]] = None,
+        filters: Optional[Metadata] = None,
+        *,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+    ) -> List[str]:
+        """
+        Deletes vectors from the collection by matching filters or ids.
+
+        Records are matched either by *ids*, or by all of *filters*, *allow* and *deny* that are provided.
+
+        Args:
+            ids (Iterable[str], optional): An iterable of vector identifiers.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            allow (Optional[Dict[str, Iterable]], optional): Restricts the deletion to allowed records,
+                see `Collection.query`. Defaults to None.
+            deny (Optional[Dict[str, Iterable]], optional): Excludes denied records from the deletion,
+                see `Collection.query`. Defaults to None.
+
+        Returns:
+            List[str]: A list of the identifiers of the deleted vectors.
+        """
+        has_filters = filters is not None or allow is not None or deny is not None
+
+        if ids is None and not has_filters:
+            raise ArgError("Either ids or filters must be provided.")
+
+        if ids is not None and has_filters:
+            raise ArgError("Either ids or filters must be provided, not both.")
+
+        ids = [] if ids is None else self._id_list(ids)
+        filters = filters or {}
+        id_list_shape, id_list_params = parameterize_id_lists(allow, deny)
+        del_ids = []
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                if ids:
+                    stmt = self._delete_ids_stmt()
+                    del_ids.extend(sess.execute(stmt, {"allow_id": ids}).scalars())
+
+                if filters or id_list_shape:
+                    clauses = build_id_list_clauses(self.table, id_list_shape)
+                    if filters:
+                        clauses.insert(0, build_filters(self.table.c.metadata, filters))
+                    stmt = (
+                        delete(self.table).where(*clauses).returning(self.table.c.id)  # type: ignore
+                    )
+                    result = sess.execute(stmt, id_list_params).scalars()
+                    del_ids.extend(result.fetchall())
+
+        return del_ids
+
+    def iter_records(
+        self,
+        filters: Optional[Metadata] = None,
+        *,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+        as_blocks: bool = False,
+    ) -> Iterator[Union[Record, str, RecordBlock]]:
+        """
+        Streams every record in the collection, or every record matching *filters*, *allow* and *deny*,
+        in primary key order.
+
+        Records are read through a server side cursor *batch_size* at a time, so collections of
+        any size can be exported or re-embedded in bounded memory. The transaction holding the
+        cursor stays open until the iterator is exhausted or closed.
+
+        Args:
+            filters (Optional[Dict], optional): Filters records must match. Defaults to None.
+            allow (Optional[Dict[str, Iterable]], optional): Restricts the scan to allowed records,
+                see `Collection.query`. Defaults to None.
+            deny (Optional[Dict[str, Iterable]], optional): Excludes denied records from the scan,
+                see `Collection.query`. Defaults to None.
+            columns (Optional[Iterable[str]], optional): The columns to read, e.g. `["vec", "text"]`.
+                `id` is always read first. Defaults to None, which reads every column.
+            batch_size (int, optional): The number of records read from the cursor at a time. Defaults to 1000.
+            as_blocks (bool, optional): Whether to yield one `RecordBlock` per batch, with the batch's
+                vectors stacked into a single numpy array. Defaults to False.
+
+        Yields:
+            Union[Record, str, RecordBlock]: Each record as a tuple of the requested columns, or its id
+                when only `id` is read, or with *as_blocks*, each batch of records.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        stmt, params = self._iter_records_stmt(
+            filters, allow, deny, columns, batch_size
+        )
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                result = sess.execute(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                )
+                for rows in result.partitions():
+                    if as_blocks:
+                        yield record_block(rows, list(result.keys()))
+                    else:
+                        for row in rows:
+                            yield str(row[0]) if len(row) == 1 else row
+
+    def replace_document(
+        self,
+        doc_instance_id: int,
+        chunks: Iterable[Tuple[Any, ...]],
+        skip_adapter: bool = False,
+    ) -> ReplaceDocumentResult:
+        """
+        Replaces the stored chunks of a document with *chunks*, writing only what changed.
+
+        The document's stored chunks are locked and compared with the new chunks by their `order`
+        and the md5 hash of their text, see `diff_document`. Unchanged chunks are left as stored,
+        new and changed chunks are written with every column overwritten, and chunks that are no
+        longer part of the document are deleted, all in a single transaction. Small edits to large
+        documents therefore write few rows and cause little index churn.
+
+        Args:
+            doc_instance_id (int): The document to replace.
+            chunks (Iterable[Tuple]): The document's chunks, as records in the form accepted by `upsert`.
+                Each must have an `order`, unique within the document. A missing `doc_instance_id`
+                is set to *doc_instance_id*.
+            skip_adapter (bool): Should the adapter be skipped, see `upsert`.
+
+        Returns:
+            ReplaceDocumentResult: The ids of the chunks written, deleted and left unchanged.
+
+        Raises:
+            ArgError: If any argument is invalid, or a chunk's id belongs to a record of another
+                document, in which case nothing is written.
+        """
+        records = self._document_chunks(doc_instance_id, chunks, skip_adapter)
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                sess.execute(
+                    DOCUMENT_LOCK_QUERY, {"key": f"vecs.{self.name}:{doc_instance_id}"}
+                )
+                stored = sess.execute(
+                    self._stored_chunks_stmt(), {"doc_instance_id": doc_instance_id}
+                ).fetchall()
+                writes, deletes, unchanged = diff_document(records, stored)
+                if deletes:
+                    sess.execute(self._delete_ids_stmt(), {"allow_id": deletes})
+                for chunk in flu(writes).chunk(500):
+                    written = sess.execute(self._replace_chunks_stmt(chunk))
+                    check_replaced_chunks(chunk, written.scalars().all())
+
+        return ReplaceDocumentResult(
+            written=[record[0] for record in writes],
+            deleted=deletes,
+            unchanged=unchanged,
+        )
+
+    def __getitem__(self, items):
+        """
+        Fetches a vector from the collection by its identifier.
+
+        Args:
+            items (str): The identifier of the vector.
+
+        Returns:
+            Record: The fetched vector.
+        """
+        if not isinstance(items, str):
+            raise ArgError("items must be a string id")
+
+        row = self.fetch([items])
+
+        if row == []:
+            raise KeyError("no item found with requested id")
+        return row[0]
+
+    def query(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        shortlist: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+        rerank: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Union[List[Record], List[str]]:
+        """
+        Executes a similarity search in the collection.
+
+        The return type is dependent on arguments *include_value* and *include_metadata*
+
+        Args:
+            data (Any): The vector to use as the query.
+            limit (int, optional): The maximum number of results to return. Defaults to 10.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            measure (Union[IndexMeasure, str], optional): The distance measure to use for the search. Defaults to 'cosine_distance'.
+            include_value (bool, optional): Whether to include the distance value in the results. Defaults to False.
+            include_metadata (bool, optional): Whether to include the metadata in the results. Defaults to False.
+            probes (Optional[Int], optional): Number of ivfflat index lists to query. Higher increases accuracy but decreases speed
+            ef_search (Optional[Int], optional): Size of the dynamic candidate list for HNSW index search. Higher increases accuracy but decreases speed
+            skip_adapter (bool, optional): When True, skips any associated adapter and queries using a literal vector provided to *data*
+            include_vector (bool, optional): Whether to include each record's vector, as a numpy array, as the last element of the results. Defaults to False.
+            app_id (Optional[int], optional): Restricts the search to records of a single tenant. The tenant's
+                partial index is used when it has one, see `create_index`. Defaults to None.
+            allow (Optional[Dict[str, Iterable]], optional): Restricts the search to records whose `id`,
+                `doc_instance_id` or `memento_membership` is in the list given for that column, e.g.
+                `{"id": ["a", "b"]}`. Each list is sent as a single array parameter. Defaults to None.
+            deny (Optional[Dict[str, Iterable]], optional): Excludes records whose `id`, `doc_instance_id` or
+                `memento_membership` is in the list given for that column. Defaults to None.
+            shortlist (Optional[int], optional): When set, the search first selects this many candidates by the
+                Hamming distance between binary quantized vectors, which a binary quantized index serves (see
+                `create_index`), then orders them by *measure* in the same statement. Larger shortlists increase
+                recall. Must be at least *limit*. Defaults to None.
+            prefix_dimension (Optional[int], optional): When set with *shortlist*, candidates are instead
+                shortlisted by *measure* over the first *prefix_dimension* dimensions of the vectors, which a
+                prefix index serves (see `create_index`). Intended for Matryoshka embeddings. Defaults to None.
+            rerank (Optional[int], optional): When set, the index search fetches `limit * rerank` candidates
+                with their vectors, and the closest *limit* of them by distances recomputed exactly with
+                numpy are returned. Larger factors recover more of the recall lost to low `probes` or
+                `ef_search` settings. `ef_search` is raised to the number of candidates, as an hnsw index
+                returns no more than `ef_search` records. Defaults to None.
+            max_distance (Optional[float], optional): When set, only records within this distance of the query
+                vector are returned. Defaults to None.
+            min_similarity (Optional[float], optional): When set, only records at least this similar to the query
+                vector are returned, where similarity is `1 - distance` for cosine distance and the inner
+                product for max inner product. Not defined for l2 distance. Defaults to None.
+
+        Returns:
+            Union[List[Record], List[str]]: The result of the similarity search.
+        """
+
+        info = self.client._collection_info(self.name)
+        stmt, params, imeasure, probes, ef_search, _ = self._query_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            shortlist=shortlist,
+            prefix_dimension=prefix_dimension,
+            rerank=rerank,
+            max_distance=max_distance,
+            min_similarity=min_similarity,
+            info=info,
+        )
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                self._set_search_params(sess, probes, ef_search)
+                if len(stmt.selected_columns) == 1:
+                    return [str(x) for x in sess.scalars(stmt, params).fetchall()]
+                rows = sess.execute(stmt, params).fetchall()
+
+        if rerank is not None:
+            return rerank_results(
+                rows,
+                params["query_vec"],
+                imeasure,
+                limit,
+                include_value,
+                include_vector,
+            )
+        return rows or []
+
+    def query_many(
+        self,
+        data: Iterable[Union[Iterable[Numeric], Any]],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+    ) -> List[Union[List[Tuple[Any, ...]], List[str]]]:
+        """
+        Executes a similarity search for each of a batch of query vectors.
+
+        The whole batch is searched server side by a single statement, so the cost of a
+        round trip to the database is paid once rather than once per query vector.
+
+        Args:
+            data (Iterable[Any]): The vectors to use as queries.
+            limit (int, optional): The maximum number of results to return per query vector. Defaults to 10.
+            filters (Optional[Dict], optional): Filters to apply to every search. Defaults to None.
+            measure (Union[IndexMeasure, str], optional): The distance measure to use for the search. Defaults to 'cosine_distance'.
+            include_value (bool, optional): Whether to include the distance value in the results. Defaults to False.
+            include_metadata (bool, optional): Whether to include the metadata in the results. Defaults to False.
+            include_text (bool, optional): Whether to include the text in the results. Defaults to False.
+            probes (Optional[Int], optional): Number of ivfflat index lists to query. Higher increases accuracy but decreases speed
+            ef_search (Optional[Int], optional): Size of the dynamic candidate list for HNSW index search. Higher increases accuracy but decreases speed
+            skip_adapter (bool, optional): When True, skips any associated adapter and queries using the literal vectors provided to *data*
+            include_vector (bool, optional): Whether to include each record's vector, as a numpy array, as the last element of the results. Defaults to False.
+            app_id (Optional[int], optional): Restricts every search to records of a single tenant. Defaults to None.
+            allow (Optional[Dict[str, Iterable]], optional): Restricts every search to allowed records, see `query`.
+            deny (Optional[Dict[str, Iterable]], optional): Excludes denied records from every search, see `query`.
+
+        Returns:
+            List[Union[List[Tuple], List[str]]]: One result list per query vector, in the order of *data*.
+                Each result list has the form returned by `Collection.query` for the same arguments.
+        """
+
+        info = self.client._collection_info(self.name)
+        stmt, params, n_queries, imeasure, probes, ef_search = self._query_many_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+
+        if n_queries == 0:
+            return []
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                self._set_search_params(sess, probes, ef_search)
+                rows = sess.execute(stmt, params).fetchall()
+
+        return group_query_results(rows, n_queries)
+
+    def query_filtered(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        max_rounds: int = 4,
+        max_scan_tuples: int = 20000,
+    ) -> FilteredQueryResult:
+        """
+        Executes a similarity search that widens its candidate pool until it finds *limit* results.
+
+        Indexes return a fixed number of candidates (hnsw `ef_search`, or the records in ivfflat's
+        `probes` lists) before filters are applied, so a selective filter can leave fewer than *limit*
+        results. When that happens the search is repeated with ef_search or probes grown by
+        `FILTERED_SEARCH_GROWTH`, up to *max_rounds* searches. With pgvector 0.8.0 and later, HNSW
+        searches instead use a single iterative index scan that visits up to *max_scan_tuples* records.
+
+        Arguments not listed below match those of `Collection.query`.
+
+        Args:
+            max_rounds (int, optional): The maximum number of searches to run. Defaults to 4.
+            max_scan_tuples (int, optional): The maximum number of records an iterative index scan
+                visits. Defaults to 20000.
+
+        Returns:
+            FilteredQueryResult: The results, and the number of rounds and the search parameters it took to find them.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        if max_rounds < 1:
+            raise ArgError("max_rounds must be >= 1")
+
+        info = self.client._collection_info(self.name)
+        stmt, params, imeasure, probes, ef_search, app_id = self._query_stmt(
+            data,
+            limit,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            info=info,
+        )
+        plan = self._filtered_search_plan(
+            self._index_for(info, imeasure, app_id),
+            probes,
+            ef_search,
+            max_rounds,
+            max_scan_tuples,
+        )
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                for rounds, (probes, ef_search, scan_tuples) in enumerate(plan, 1):
+                    self._set_search_params(sess, probes, ef_search, scan_tuples)
+                    if len(stmt.selected_columns) == 1:
+                        results: Union[List[Record], List[str]] = [
+                            str(x) for x in sess.scalars(stmt, params).fetchall()
+                        ]
+                    else:
+                        results = sess.execute(stmt, params).fetchall() or []
+                    if len(results) >= limit:
+                        break
+
+        return FilteredQueryResult(results, rounds, probes, ef_search)
+
+    def query_iter(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        limit: Optional[int] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        batch_size: int = 100,
+        max_scan_tuples: int = 20000,
+    ) -> Iterator[Union[Record, str]]:
+        """
+        Streams the results of a similarity search, nearest first, without the 1000 result cap of `query`.
+
+        Results are read through a server side cursor *batch_size* at a time, so memory use is
+        bounded however many are consumed. Stopping early, or closing the iterator, ends the index
+        scan. With pgvector 0.8.0 and later, HNSW searches use an iterative index scan that visits up
+        to *max_scan_tuples* records. Older versions return at most `ef_search` records from an HNSW
+        index, so `ef_search` is raised to *limit*, or to 1000 without a *limit*, and a `UserWarning`
+        is issued if the scan ends there.
+
+        The stream runs in a single transaction that stays open, holding a pooled connection and its
+        snapshot, until the iterator is exhausted or closed. Long lived transactions hold back vacuum,
+        so consume or close the iterator promptly rather than keeping it between requests.
+
+        Arguments not listed below match those of `Collection.query`.
+
+        Args:
+            limit (Optional[int], optional): The maximum number of results to stream. Defaults to None,
+                which streams every matching record.
+            batch_size (int, optional): The number of records read from the cursor at a time. Defaults to 100.
+            max_scan_tuples (int, optional): The maximum number of records an iterative index scan
+                visits. Defaults to 20000.
+
+        Yields:
+            Union[Record, str]: The results, in the form returned by `Collection.query`.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        stmt, params, probes, ef_search, scan_cap = self._query_iter_stmt(
+            data,
+            filters,
+            measure,
+            include_value,
+            include_metadata,
+            include_text,
+            limit=limit,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            batch_size=batch_size,
+            info=self.client._collection_info(self.name),
+        )
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                self._set_search_params(sess, probes, ef_search, max_scan_tuples)
+                rows = sess.execute(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                )
+                n_rows = 0
+                for row in islice(rows, limit):
+                    yield str(row[0]) if len(row) == 1 else row
+                    n_rows += 1
+                if limit is None or n_rows < limit:
+                    warn_truncated_scan(scan_cap, n_rows)
+
+    def query_within(
+        self,
+        data: Union[Iterable[Numeric], Any],
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+        filters: Optional[Dict] = None,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        include_value: bool = False,
+        include_metadata: bool = False,
+        include_text: bool = False,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        skip_adapter: bool = False,
+        include_vector: bool = False,
+        app_id: Optional[int] = None,
+        allow: Optional[Dict[str, Iterable[Any]]] = None,
+        deny: Optional[Dict[str, Iterable[Any]]] = None,
+        batch_size: int = 100,
+        max_scan_tuples: int = 20000,
+    ) -> Iterator[Union[Record, str]]:
+        """
+        Streams every record within a distance of the query vector, nearest first.
+
+        Records are read in distance order through a server side cursor, *batch_size* at a time,
+        and the index scan stops at the first record beyond the radius, so there is no *limit*
+        to size. Exactly one of *max_distance* and *min_similarity* must be given. With pgvector
+        0.8.0 and later, HNSW searches use an iterative index scan that visits up to *max_scan_tuples*
+        records. Older versions return at most `ef_search` records from an HNSW index, so `ef_search`
+        is raised to 1000 and a `UserWarning` is issued if the scan ends there.
+
+        The transaction holding the cursor stays open until the iterator is exhausted or closed.
+
+        Arguments not listed below match those of `Collection.query`.
+
+        Args:
+            max_distance (Optional[float], optional): The distance from the query vector records must be within.
+            min_similarity (Optional[float], optional): The similarity to the query vector records must reach,
+                see `Collection.query`.
+            batch_size (int, optional): The number of records read from the cursor at a time. Defaults to 100.
+            max_scan_tuples (int, optional): The maximum number of records an iterative index scan
+                visits. Defaults to 20000.
+
+        Yields:
+            Union[Record, str]: The records within the radius, in the form returned by `Collection.query`.
+
+        Raises:
+            ArgError: If any argument is invalid.
+        """
+        stmt, params, radius, probes, ef_search, scan_cap = self._query_within_stmt(
+            data,
+            max_distance,
+            min_similarity,
+            filters,
+            measure,
+            include_metadata,
+            include_text,
+            probes=probes,
+            ef_search=ef_search,
+            skip_adapter=skip_adapter,
+            include_vector=include_vector,
+            app_id=app_id,
+            allow=allow,
+            deny=deny,
+            batch_size=batch_size,
+            info=self.client._collection_info(self.name),
+        )
+
+        with self.client.Session() as sess:
+            with sess.begin():
+                self._set_search_params(sess, probes, ef_search, max_scan_tuples)
+                n_rows = 0
+                for row in sess.execute(
+                    stmt, params, execution_options={"yield_per": batch_size}
+                ):
+                    if row[1] > radius:
+                        # closing the cursor ends the index scan
+                        break
+                    yield radius_result(row, include_value)
+                    n_rows += 1
+                else:
+                    warn_truncated_scan(scan_cap, n_rows)
+
+    def _set_search_params(
+        self,
+        sess,
+        probes: int,
+        ef_search: int,
+        max_scan_tuples: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Applies the index search parameters to the session's connection.
+
+        Args:
+            sess (Session): A session with an open transaction.
+            probes (int): Number of ivfflat index lists to query.
+            ef_search (int): Size of the dynamic candidate list for HNSW index search.
+            max_scan_tuples (Optional[int]): Enables iterative HNSW index scans, see `_search_settings`.
+        """
+        self.client._apply_settings(
+            sess, self._search_settings(probes, ef_search, max_scan_tuples)
+        )
+
+    @classmethod
+    def _list_collections(cls, client: "Client") -> List["Collection"]:
+        """
+        PRIVATE
+
+        Retrieves all collections from the database.
+
+        Args:
+            client (Client): The database client.
+
+        Returns:
+            List[Collection]: A list of all existing collections.
+        """
+
+        catalog = client._load_catalog()
+        return [
+            cls(info.name, info.dimension, client, storage=info.storage)
+            for info in catalog.values()
+        ]
+
+    @classmethod
+    def _does_collection_exist(cls, client: "Client", name: str) -> bool:
+        """
+        PRIVATE
+
+        Checks if a collection with a given name exists within the database
+
+        Args:
+            client (Client): The database client.
+            name (str): The name of the collection
+
+        Returns:
+            Exists: Whether the collection exists or not
+        """
+
+        return client._collection_info(name) is not None
+
+    @property
+    def index(self) -> Optional[str]:
+        """
+        PRIVATE
+
+        Note:
+            The `index` property is private and expected to undergo refactoring.
+            Do not rely on it's output.
+
+        Retrieves the SQL name of the collection's vector index, if it exists.
+        Binary quantized and prefix indexes, which only shortlist candidates, are skipped.
+        When a collection has several vector indexes, the first by name is returned.
+        See `index_for_measure`.
+
+        Returns:
+            Optional[str]: The name of the index, or None if no index exists.
+        """
+
+        return self._index_name(self.client._collection_info(self.name))
+
+    def index_for_measure(
+        self,
+        measure: Union[IndexMeasure, str] = IndexMeasure.cosine_distance,
+        app_id: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Retrieves the SQL name of the vector index that serves queries for a distance measure.
+
+        A collection may have one index per measure, e.g. an HNSW index for cosine distance alongside
+        an IVFFlat index for max inner product. Queries are served by the index whose operator class
+        matches their measure.
+
+        Args:
+            measure (IndexMeasure | str, optional): The measure to find an index for. Defaults to 'cosine_distance'.
+            app_id (Optional[int], optional): The tenant queries are restricted to. When the tenant has its own
+                partial index for *measure* it is returned. Defaults to None.
+
+        Returns:
+            Optional[str]: The name of the index, or None if no index covers the measure.
+        """
+        index = self._index_for(self.client._collection_info(self.name), measure, app_id)  # type: ignore
+        return None if index is None else index.name
+
+    def is_indexed_for_measure(self, measure: IndexMeasure):
+        """
+        Checks if the collection is indexed for a specific measure.
+
+        Args:
+            measure (IndexMeasure): The measure to check for.
+
+        Returns:
+            bool: True if the collection is indexed for the measure, False otherwise.
+        """
+        return self._indexed_for(self.client._collection_info(self.name), measure)
+
+    def create_index(
+        self,
+        measure: IndexMeasure = IndexMeasure.cosine_distance,
+        method: IndexMethod = IndexMethod.auto,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]] = None,
+        replace=True,
+        *,
+        concurrently: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+        max_parallel_maintenance_workers: Optional[int] = None,
+        progress: Optional[Callable[[IndexBuildProgress], None]] = None,
+        app_id: Optional[int] = None,
+        half_precision: bool = False,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        Creates an index for the collection.
+
+        A collection may have one index per measure. Indexes for other measures are kept, so the
+        same vectors can be queried efficiently with more than one measure.
+
+        With *app_id*, a partial index covering only that tenant's records is created instead. It
+        coexists with the index for the whole collection, and queries passing the same *app_id*
+        search it. See `create_tenant_indexes`.
+
+        Note:
+            When `vecs` creates an IVFFlat index whose training sample (see `IndexArgsIVFFlat.sample_size`)
+            is smaller than both the collection and the 50 records per list that pgvector samples itself,
+            because a smaller `sample_size` was passed or the default sample does not fit in
+            `maintenance_work_mem`, it uses a multi-step process that enables performant indexes to be
+            built for large collections with low end database hardware. Writes to the collection are
+            blocked while it runs. Otherwise the index is built in place.
+
+            Those steps are:
+
+            - Creates a new table with a different name
+            - Randomly selects records from the existing table
+            - Inserts the random records from the existing table into the new table
+            - Creates the requested vector index on the new table
+            - Upserts all data from the existing table into the new table
+            - Drops the existing table
+            - Renames the new table to the existing tables name
+            - Recreates the existing table's indexes, triggers, owner, privileges, row level
+              security policies and comment on the new table
+
+            The collection's table therefore gets a new OID. If you create dependencies (like views
+            or foreign keys) on the table that underpins a `vecs.Collection` the `create_index` step
+            may require you to drop those dependencies before it will succeed.
+
+            With *concurrently*, the index is instead built in place with `create index concurrently`,
+            which does not block reads or writes. The existing index is only dropped once the new one
+            is valid, so queries remain indexed throughout.
+
+        Args:
+            measure (IndexMeasure, optional): The measure to index for. Defaults to 'cosine_distance'.
+            method (IndexMethod, optional): The indexing method to use. Defaults to 'auto'.
+            index_arguments: (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments
+            replace (bool, optional): Whether to replace the existing index for *measure*. Defaults to True.
+            concurrently (bool, optional): Whether to build the index without blocking writes. Defaults to False.
+            maintenance_work_mem (str, optional): Memory available to the build, e.g. '2GB'.
+                Defaults to the server's setting.
+            max_parallel_maintenance_workers (int, optional): Parallel workers available to the build.
+                Defaults to the server's setting.
+            progress (Callable[[IndexBuildProgress], None], optional): Called periodically, from a
+                background thread, with the progress of the build.
+            app_id (int, optional): Restricts the index to the records of a single tenant. Defaults to None.
+            half_precision (bool, optional): Whether to index a `vector` collection's vectors cast to `halfvec`,
+                halving the size of the index. The table keeps full precision vectors, so `query(..., rerank=k)`
+                can restore their exact order. Indexes on `halfvec` collections are always half precision.
+                Defaults to False.
+            binary_quantized (bool, optional): Whether to index the vectors binary quantized, for
+                `query(..., shortlist=n)`. The index serves every measure, and replaces only other binary
+                quantized indexes. Defaults to False.
+            prefix_dimension (int, optional): Index only the first *prefix_dimension* dimensions of the
+                vectors, for `query(..., shortlist=n, prefix_dimension=...)`. A prefix index coexists with the
+                index for *measure*, and replaces only the measure's other prefix index. Defaults to None.
+
+        Raises:
+            ArgError: If an invalid index method is used, or if *replace* is False and an index for *measure* already exists.
+        """
+
+        method, ops = self._resolve_index_method(
+            measure,
+            method,
+            index_arguments,
+            half_precision,
+            binary_quantized,
+            prefix_dimension,
+        )
+        build_settings = self._build_settings(
+            maintenance_work_mem, max_parallel_maintenance_workers
+        )
+
+        # Indexes may have been created or dropped by other clients
+        self.client._invalidate_catalog()
+        replaces = self._replaced_indexes(
+            self.client._collection_info(self.name), ops, app_id, prefix_dimension
+        )
+
+        if replaces and not replace:
+            raise ArgError(f"replace is set to False but an index exists for {measure}")
+
+        try:
+            if concurrently:
+                self._create_index_concurrently(
+                    method,
+                    ops,
+                    index_arguments,
+                    replaces,
+                    build_settings,
+                    progress,
+                    app_id,
+                    prefix_dimension,
+                )
+                return None
+
+            with self.client.Session() as sess:
+                with sess.begin():
+                    if build_settings:
+                        sess.execute(*set_config_stmt(build_settings, is_local=True))
+                    pid = sess.execute(BACKEND_PID_QUERY).scalar()
+
+                    with self._report_index_progress(pid, progress):
+                        for index_name in replaces:
+                            sess.execute(text(f'drop index vecs."{index_name}";'))
+
+                        if method == IndexMethod.ivfflat:
+                            self._create_ivfflat_index(
+                                sess,
+                                ops,
+                                index_arguments,  # type: ignore
+                                app_id,
+                                prefix_dimension,
+                            )
+                        else:
+                            sess.execute(
+                                text(
+                                    self._index_ddl(
+                                        method,
+                                        ops,
+                                        index_arguments,
+                                        app_id=app_id,
+                                        prefix_dimension=prefix_dimension,
+                                    )
+                                )
+                            )
+        finally:
+            self.client._invalidate_catalog()
+
+        return None
+
+    def create_tenant_indexes(
+        self,
+        min_records: int,
+        measure: IndexMeasure = IndexMeasure.cosine_distance,
+        method: IndexMethod = IndexMethod.auto,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]] = None,
+        *,
+        concurrently: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+        max_parallel_maintenance_workers: Optional[int] = None,
+        half_precision: bool = False,
+        binary_quantized: bool = False,
+        prefix_dimension: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Creates a partial index for each tenant with at least *min_records* records that does not have one.
+
+        Intended to be run periodically, so that tenants get their own index as they grow. Tenants
+        that already have a partial index for *measure* are skipped. See `create_index`.
+
+        Args:
+            min_records (int): The number of records above which a tenant gets its own index.
+            measure (IndexMeasure, optional): The measure to index for. Defaults to 'cosine_distance'.
+            method (IndexMethod, optional): The indexing method to use. Defaults to 'auto'.
+            index_arguments: (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments
+            concurrently (bool, optional): Whether to build the indexes without blocking writes. Defaults to False.
+            maintenance_work_mem (str, optional): Memory available to each build, e.g. '2GB'.
+            max_parallel_maintenance_workers (int, optional): Parallel workers available to each build.
+            half_precision (bool, optional): Whether to index the vectors cast to `halfvec`, see `create_index`.
+            binary_quantized (bool, optional): Whether to index the vectors binary quantized, see `create_index`.
+            prefix_dimension (int, optional): Index only this many leading dimensions, see `create_index`.
+
+        Returns:
+            List[int]: The `app_id` of each tenant an index was created for.
+
+        Raises:
+            ArgError: If an invalid index method is used.
+        """
+        method, ops = self._resolve_index_method(
+            measure,
+            method,
+            index_arguments,
+            half_precision,
+            binary_quantized,
+            prefix_dimension,
+        )
+
+        with self.client.Session() as sess:
+            app_ids = (
+                sess.execute(self._large_tenants_stmt(min_records)).scalars().all()
+            )
+
+        self.client._invalidate_catalog()
+        info = self.client._collection_info(self.name)
+
+        created = []
+        for app_id in app_ids:
+            if self._replaced_indexes(info, ops, app_id, prefix_dimension):
+                continue
+            self.create_index(
+                measure,
+                method,
+                index_arguments,
+                concurrently=concurrently,
+                maintenance_work_mem=maintenance_work_mem,
+                max_parallel_maintenance_workers=max_parallel_maintenance_workers,
+                app_id=app_id,
+                half_precision=half_precision,
+                binary_quantized=binary_quantized,
+                prefix_dimension=prefix_dimension,
+            )
+            created.append(app_id)
+        return created
+
+    def _create_index_concurrently(
+        self,
+        method: IndexMethod,
+        ops: str,
+        index_arguments: Optional[Union[IndexArgsIVFFlat, IndexArgsHNSW]],
+        replaces: List[str],
+        build_settings: Dict[str, str],
+        progress: Optional[Callable[[IndexBuildProgress], None]],
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Builds a vector index with `create index concurrently`, then drops the indexes it replaces.
+
+        Args:
+            method (IndexMethod): The concrete index method, see `_resolve_index_method`.
+            ops (str): The pgvector operator class to index.
+            index_arguments (IndexArgsIVFFlat | IndexArgsHNSW, optional): Index type specific arguments.
+            replaces (List[str]): The names of the indexes to drop once the new index is valid.
+            build_settings (Dict[str, str]): Settings to apply for the duration of the build.
+            progress (Callable[[IndexBuildProgress], None], optional): Receives the progress of the build.
+            app_id (int, optional): Restricts the index to the records of a single tenant.
+            prefix_dimension (int, optional): Indexes only this many leading dimensions of the vectors.
+        """
+        n_records = None
+        if method == IndexMethod.ivfflat and not index_arguments:
+            with self.client.Session() as sess:
+                n_records = sess.execute(self._count_stmt(app_id)).scalar()
+
+        index_name = self._new_index_name(
+            method, ops, index_arguments, n_records, app_id, prefix_dimension
+        )
+
+        # concurrent builds and drops can not run inside a transaction block
+        with self.client.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            restore_settings = {}
+            if build_settings:
+                restore_settings = {
+                    name: conn.execute(
+                        text("select current_setting(:name)"), {"name": name}
+                    ).scalar()
+                    for name in build_settings
+                }
+                conn.execute(*set_config_stmt(build_settings, is_local=False))
+
+            try:
+                pid = conn.execute(BACKEND_PID_QUERY).scalar()
+                with self._report_index_progress(pid, progress):
+                    try:
+                        conn.execute(
+                            text(
+                                self._index_ddl(
+                                    method,
+                                    ops,
+                                    index_arguments,
+                                    n_records,
+                                    index_name=index_name,
+                                    concurrently=True,
+                                    app_id=app_id,
+                                    prefix_dimension=prefix_dimension,
+                                )
+                            )
+                        )
+                    except Exception:
+                        # a failed concurrent build leaves an invalid index behind
+                        conn.execute(
+                            text(
+                                f'drop index concurrently if exists vecs."{index_name}"'
+                            )
+                        )
+                        raise
+
+                for replaced in replaces:
+                    conn.execute(
+                        text(f'drop index concurrently if exists vecs."{replaced}"')
+                    )
+            finally:
+                if restore_settings:
+                    conn.execute(*set_config_stmt(restore_settings, is_local=False))
+
+    @contextmanager
+    def _report_index_progress(
+        self,
+        pid: int,
+        progress: Optional[Callable[[IndexBuildProgress], None]],
+    ) -> Iterator[None]:
+        """
+        PRIVATE
+
+        Polls the progress of the index build running in backend *pid* from a background
+        thread and passes it to *progress* until the context exits.
+
+        Args:
+            pid (int): The process id of the backend running the build.
+            progress (Callable[[IndexBuildProgress], None], optional): Receives the progress.
+                Nothing is polled when None.
+        """
+        if progress is None:
+            yield
+            return
+
+        done = threading.Event()
+
+        def poll() -> None:
+            with self.client.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as conn:
+                while not done.wait(INDEX_PROGRESS_INTERVAL):
+                    row = conn.execute(INDEX_PROGRESS_QUERY, {"pid": pid}).fetchone()
+                    if row is not None:
+                        progress(IndexBuildProgress(*row))
+
+        thread = threading.Thread(target=poll, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _create_ivfflat_index(
+        self,
+        sess,
+        ops: str,
+        index_arguments: Optional[IndexArgsIVFFlat],
+        app_id: Optional[int] = None,
+        prefix_dimension: Optional[int] = None,
+    ) -> None:
+        """
+        PRIVATE
+
+        Creates an ivfflat index, training its centroids on a bounded random sample
+        of the collection's records. See `create_index`.
+
+        The table is only rebuilt around the index when the sample is smaller than the one
+        pgvector trains on, see `_needs_sampled_build`.
+
+        Args:
+            sess (Session): A session with an open transaction.
+            ops (str): The pgvector operator class to index.
+            index_arguments (IndexArgsIVFFlat, optional): User supplied index arguments.
+            app_id (int, optional): Restricts the index to the records of a single tenant.
+            prefix_dimension (int, optional): Indexes only this many leading dimensions of the vectors.
+        """
+        n_records = sess.execute(self._count_stmt(app_id)).scalar() or 0
+        n_lists = self._ivfflat_n_lists(index_arguments, n_records)
+        sample_size = self._ivfflat_sample_size(
+            n_lists, sess.execute(MAINTENANCE_WORK_MEM_QUERY).scalar(), index_arguments
+        )
+
+        if not self._needs_sampled_build(n_records, n_lists, sample_size, app_id):
+            sess.execute(
+                text(
+                    self._index_ddl(
+                        IndexMethod.ivfflat,
+                        ops,
+                        index_arguments,
+                        n_records,
+                        app_id=app_id,
+                        prefix_dimension=prefix_dimension,
+                    )
+                )
+            )
+            return
+
+        # conflicts with itself, so that concurrent builds queue here rather than deadlock
+        # when upgrading to the lock taken by `drop table`
+        sess.execute(
+            text(f'lock table vecs."{self.table.name}" in share row exclusive mode')
+        )
+        rebuild_ddl = [
+            ddl
+            for _, ddl in sess.execute(
+                REBUILD_DDL_QUERY, {"table_name": f'vecs."{self.table.name}"'}
+            )
+        ]
+
+        shadow_name = "_vecs_build_" + str(uuid.uuid4()).replace("-", "_")[0:7]
+        index_ddl = self._index_ddl(
+            IndexMethod.ivfflat,
+            ops,
+            index_arguments,
+            n_records,
+            shadow_name,
+            prefix_dimension=prefix_dimension,
+        )
+        # oversample so that the sample is rarely short of sample_size
+        sample_fraction = min(1.0, 2 * sample_size / n_records)
+        for ddl in self._sampled_build_ddl(
+            shadow_name, sample_fraction, sample_size, index_ddl, rebuild_ddl
+        ):
+            sess.execute(text(ddl))
+
+
+def group_query_results(
+    rows: Sequence[Any], n_queries: int
+) -> List[Union[List[Tuple[Any, ...]], List[str]]]:
+    """
+    PRIVATE
+
+    Splits the rows returned by a `_query_many_stmt` statement into one result list per query vector.
+
+    Args:
+        rows (Sequence[Row]): Result rows whose first column is the position of their query vector.
+        n_queries (int): The number of query vectors.
+
+    Returns:
+        List[Union[List[Tuple], List[str]]]: The grouped results. Rows with a single remaining
+            column are reduced to the record's id.
+    """
+    results: List[List[Any]] = [[] for _ in range(n_queries)]
+    for row in rows:
+        if len(row) == 2:
+            results[row[0]].append(str(row[1]))
+        else:
+            results[row[0]].append(tuple(row[1:]))
+    return results
+
+
+def exact_distances(
+    measure: IndexMeasure, query: Iterable[Numeric], vectors: np.ndarray
+) -> np.ndarray:
+    """
+    PRIVATE
+
+    Computes the distance from *query* to each of *vectors* the way pgvector's operators do.
+
+    Args:
+        measure (IndexMeasure): The distance measure.
+        query (Iterable[Numeric]): The query vector.
+        vectors (np.ndarray): A 2 dimensional array with one vector per row.
+
+    Returns:
+        np.ndarray: One float64 distance per row of *vectors*.
+    """
+    q = np.asarray(query, dtype=np.float64)
+    vectors = np.asarray(vectors, dtype=np.float64)
+
+    if measure == IndexMeasure.l2_distance:
+        return np.linalg.norm(vectors - q, axis=1)
+
+    dots = vectors @ q
+    if measure == IndexMeasure.max_inner_product:
+        # pgvector's <#> operator returns the negative inner product
+        return -dots
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 1.0 - dots / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(q))
+
+
+def rerank_results(
+    rows: Sequence[Any],
+    query: Iterable[Numeric],
+    measure: IndexMeasure,
+    limit: int,
+    include_value: bool,
+    include_vector: bool,
+) -> Union[List[Tuple[Any, ...]], List[str]]:
+    """
+    PRIVATE
+
+    Orders the candidates selected by a reranking `_query_stmt` statement by their exact
+    distance to *query* and keeps the closest *limit*.
+
+    Args:
+        rows (Sequence[Row]): Candidate rows of `id`, any metadata and text columns, then the vector.
+        query (Iterable[Numeric]): The query vector.
+        measure (IndexMeasure): The distance measure to order by.
+        limit (int): The number of results to keep.
+        include_value (bool): Whether to insert the exact distance after each result's `id`.
+        include_vector (bool): Whether to keep each result's vector as its last element.
+
+    Returns:
+        Union[List[Tuple], List[str]]: The results, in the form returned by `Collection.query`.
+            Results with a single column are reduced to the record's id.
+    """
+    if not rows:
+        return []
+
+    distances = exact_distances(measure, query, np.stack([row[-1] for row in rows]))
+    # stable, so candidates at equal distances keep the database's order
+    nearest = np.argsort(distances, kind="stable")[:limit]
+
+    results: List[Any] = []
+    for ix in nearest:
+        row = rows[ix]
+        fields = [row[0]]
+        if include_value:
+            fields.append(float(distances[ix]))
+        fields.extend(row[1:-1])
+        if include_vector:
+            fields.append(row[-1])
+        results.append(str(row[0]) if len(fields) == 1 else tuple(fields))
+    return results
+
+
+def record_block(rows: Sequence[Any], names: List[str]) -> RecordBlock:
+    """
+    PRIVATE
+
+    Transposes a batch of rows read by an `_iter_records_stmt` statement into a `RecordBlock`.
+
+    Args:
+        rows (Sequence[Row]): The rows, each starting with `id`.
+        names (List[str]): The column names of the rows.
+
+    Returns:
+        RecordBlock: The batch, with its vectors stacked into a single float32 array.
+    """
+    values = dict(zip(names, map(list, zip(*rows))))
+    ids = [str(id) for id in values.pop("id")]
+    vectors = values.pop("vec", None)
+    return RecordBlock(
+        ids=ids,
+        vectors=None if vectors is None else np.stack(vectors).astype(np.float32),
+        columns=values,
+    )
+
+
+def text_md5(value: Optional[str]) -> Optional[str]:
+    """
+    PRIVATE
+
+    Hashes text the way PostgreSQL's `md5` function does for a UTF-8 database.
+
+    Args:
+        value (Optional[str]): The text. None hashes to None, like NULL.
+
+    Returns:
+        Optional[str]: The hex digest.
+    """
+    if value is None:
+        return None
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def diff_document(
+    records: List[List[Any]], stored: Sequence[Any]
+) -> Tuple[List[List[Any]], List[str], List[str]]:
+    """
+    PRIVATE
+
+    Compares the new chunks of a document with its stored chunks.
+
+    A stored chunk with the same `order` and text hash as a new chunk is unchanged when its id,
+    metadata, memento membership and app id also match. Vectors are not compared, as they are
+    derived from the text. Every other new chunk is written, and every stored chunk that is
+    neither unchanged nor overwritten by id is deleted.
+
+    Args:
+        records (List[List[Any]]): The new chunks, with one field per column.
+        stored (Sequence[Row]): The stored chunks, as read by `_stored_chunks_stmt`.
+
+    Returns:
+        Tuple[List[List[Any]], List[str], List[str]]: The chunks to write, and the ids of the
+            stored chunks to delete and of the unchanged chunks.
+
+    Raises:
+        ArgError: If two new chunks share an id or an order.
+    """
+    if len({record[0] for record in records}) != len(records):
+        raise ArgError("chunk ids must be unique")
+    if len({record[5] for record in records}) != len(records):
+        raise ArgError("chunk orders must be unique")
+
+    stored_by_key = {(row.order, row.text_md5): row for row in stored}
+    writes, unchanged = [], []
+    for record in records:
+        id, _, metadata, text, _, order, memento_membership, app_id = record
+        match = stored_by_key.get((order, text_md5(text)))
+        if match is not None and (
+            match.id,
+            match.metadata,
+            match.memento_membership,
+            match.app_id,
+        ) == (id, metadata or {}, memento_membership, app_id):
+            unchanged.append(id)
+        else:
+            writes.append(record)
+
+    kept = set(unchanged).union(record[0] for record in writes)
+    deletes = [row.id for row in stored if row.id not in kept]
+    return writes, deletes, unchanged
+
+
+def check_replaced_chunks(chunk: List[Any], written: List[str]) -> None:
+    """
+    PRIVATE
+
+    Checks that a `_replace_chunks_stmt` statement wrote every chunk it was given.
+
+    Args:
+        chunk (List[Any]): The records the statement wrote, with one field per column.
+        written (List[str]): The ids the statement returned.
+
+    Raises:
+        ArgError: If any chunk was not written because its id belongs to a record of another
+            document, naming the conflicting ids.
+    """
+    if len(written) == len(chunk):
+        return
+    written_ids = set(written)
+    conflicts = [record[0] for record in chunk if record[0] not in written_ids]
+    raise ArgError(
+        f"chunk ids belong to records of another document: {', '.join(conflicts)}"
+    )
+
+
+def distance_threshold(
+    measure: IndexMeasure,
+    max_distance: Optional[float],
+    min_similarity: Optional[float],
+) -> Optional[float]:
+    """
+    PRIVATE
+
+    Converts the radius of a similarity search to a distance under *measure*.
+
+    Args:
+        measure (IndexMeasure): The distance measure.
+        max_distance (Optional[float]): The maximum distance, if given.
+        min_similarity (Optional[float]): The minimum similarity, if given. Similarity is
+            `1 - distance` for cosine distance, and the inner product for max inner product,
+            whose pgvector distance is the negative inner product.
+
+    Returns:
+        Optional[float]: The maximum distance, or None if neither bound is given.
+
+    Raises:
+        ArgError: If both bounds are given, or *min_similarity* is given for l2 distance.
+    """
+    if max_distance is not None and min_similarity is not None:
+        raise ArgError("max_distance and min_similarity are mutually exclusive")
+
+    if max_distance is not None:
+        return float(max_distance)
+
+    if min_similarity is None:
+        return None
+
+    if measure == IndexMeasure.cosine_distance:
+        return 1.0 - float(min_similarity)
+    if measure == IndexMeasure.max_inner_product:
+        return -float(min_similarity)
+    raise ArgError(f"min_similarity is not defined for {measure}, use max_distance")
+
+
+def warn_truncated_scan(scan_cap: Optional[int], n_rows: int) -> None:
+    """
+    PRIVATE
+
+    Warns that a streamed search may have ended at its HNSW index scan's cap rather than
+    at the end of its results.
+
+    Args:
+        scan_cap (Optional[int]): The number of records the index scan ends after, see
+            `Collection._hnsw_scan_cap`, or None if it is not capped.
+        n_rows (int): The number of records the search read before running out.
+    """
+    if scan_cap is not None and n_rows >= scan_cap:
+        warnings.warn(
+            UserWarning(
+                f"HNSW index scan ended after hnsw.ef_search = {scan_cap} records, so results "
+                "may be incomplete. Upgrade pgvector to >= 0.8.0 to enable iterative index scans"
+            )
+        )
+
+
+def radius_result(row: Any, include_value: bool) -> Union[Tuple[Any, ...], str]:
+    """
+    PRIVATE
+
+    Shapes a row read by a `_query_within_stmt` statement like a `Collection.query` result.
+
+    Args:
+        row (Row): A row of `id`, the distance, then any other requested columns.
+        include_value (bool): Whether to keep the distance.
+
+    Returns:
+        Union[Tuple, str]: The result. Results with a single column are reduced to the record's id.
+    """
+    if include_value:
+        return tuple(row)
+    if len(row) == 2:
+        return str(row[0])
+    return (row[0], *row[2:])
+
+
+# Columns that filters can target directly, by prefixing the column name with "$"
+FILTER_COLUMNS = ("doc_instance_id", "order", "memento_membership", "app_id")
+
+
+def parameterize_filters(filters: Dict) -> Tuple[Any, Dict[str, Any]]:
+    """
+    PRIVATE
+
+    Validates a filter dictionary and separates its structure from its values.
+
+    Filters with the same structure produce the same shape regardless of the values they
+    compare against, so the shape can be used to cache statements. Each value is assigned a
+    bind parameter name that is determined by its position in the structure.
+
+    Keys naming one of `FILTER_COLUMNS` with a "$" prefix, e.g. "$app_id", compare against that
+    column rather than the metadata. Their values must be integers, or None for `$eq` and `$ne`
+    to test for NULL.
+
+    Args:
+        filters (Dict): The dictionary specifying filter conditions.
+
+    Raises:
+        FilterError: If filter conditions are not correctly formatted.
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: The hashable shape of the filters, and the bind parameter values
+            keyed by the names referenced in the shape.
+    """
+    params: Dict[str, Any] = {}
+
+    def parameterize(filters: Dict) -> Any:
+        if not isinstance(filters, dict):
+            raise FilterError("filters must be a dict")
+
+        if len(filters) > 1:
+            raise FilterError("max 1 entry per filter")
+
+        for key, value in filters.items():
+            if not isinstance(key, str):
+                raise FilterError("*filters* keys must be strings")
+
+            if key in ("$and", "$or"):
+                if not isinstance(value, list):
+                    raise FilterError(
+                        "$and/$or filters must have associated list of conditions"
+                    )
+                return (key, tuple(parameterize(subcond) for subcond in value))
+
+            if key.startswith("$") and key[1:] in FILTER_COLUMNS:
+                return parameterize_column(key, value)
+
+            if isinstance(value, dict):
+                if len(value) > 1:
+                    raise FilterError("only one operator permitted")
+                for operator, clause in value.items():
+                    if operator not in (
+                        "$eq",
+                        "$ne",
+                        "$lt",
+                        "$lte",
+                        "$gt",
+                        "$gte",
+                        "$in",
+                    ):
+                        raise FilterError("unknown operator")
+
+                    param_name = f"filter_{len(params)}"
+
+                    # equality of singular values can take advantage of the metadata index
+                    # using containment operator. Containment can not be used to test equality
+                    # of lists or dicts so we restrict to single values with a __len__ check.
+                    if operator == "$eq" and not hasattr(clause, "__len__"):
+                        params[param_name] = {key: clause}
+                        return (key, "$contains", param_name)
+
+                    if operator == "$in":
+                        if not isinstance(clause, list):
+                            raise FilterError("argument to $in filter must be a list")
+
+                        for elem in clause:
+                            if not isinstance(elem, (int, str, float)):
+                                raise FilterError(
+                                    "argument to $in filter must be a list or scalars"
+                                )
+
+                    params[param_name] = clause
+                    return (key, operator, param_name)
+
+        # a key without an operator dict matches nothing
+        return None
+
+    def parameterize_column(key: str, value: Any) -> Any:
+        if not isinstance(value, dict) or len(value) != 1:
+            raise FilterError("column filters must have exactly one operator")
+
+        [(operator, clause)] = value.items()
+        if operator not in ("$eq", "$ne", "$lt", "$lte", "$gt", "$gte", "$in"):
+            raise FilterError("unknown operator")
+
+        def is_integer(x: Any) -> bool:
+            return isinstance(x, int) and not isinstance(x, bool)
+
+        if operator == "$in":
+            if not isinstance(clause, list) or not all(is_integer(x) for x in clause):
+                raise FilterError(
+                    f"argument to $in filter on {key} must be a list of integers"
+                )
+        elif clause is None:
+            if operator not in ("$eq", "$ne"):
+                raise FilterError(f"only $eq and $ne may compare {key} to None")
+            return (key, operator, None)
+        elif not is_integer(clause):
+            raise FilterError(
+                f"argument to {operator} filter on {key} must be an integer"
+            )
+
+        param_name = f"filter_{len(params)}"
+        params[param_name] = clause
+        return (key, operator, param_name)
+
+    return parameterize(filters), params
+
+
+def pinned_app_id(shape: Any, params: Dict[str, Any]) -> Optional[int]:
+    """
+    PRIVATE
+
+    Finds the tenant that filters restrict every result to, if any.
+
+    Args:
+        shape (Any): The shape of the filters, see `parameterize_filters`.
+        params (Dict[str, Any]): The filters' bind parameter values.
+
+    Returns:
+        Optional[int]: The `app_id` compared with `$eq` at the top level of the filters or of a
+            top level `$and`, or None if the filters do not pin a tenant.
+    """
+    if shape is None:
+        return None
+
+    key, operator, *rest = shape
+    if key == "$and":
+        for subshape in operator:
+            app_id = pinned_app_id(subshape, params)
+            if app_id is not None:
+                return app_id
+        return None
+
+    if key == "$app_id" and operator == "$eq" and rest[0] is not None:
+        return params[rest[0]]
+    return None
+
+
+def build_filter_clause(json_col: Column, shape: Any):
+    """
+    PRIVATE
+
+    Builds the filter clause for a shape produced by `parameterize_filters`.
+    Values are referenced as bind parameters and must be supplied at execution.
+
+    Args:
+        json_col (Column): The metadata column of the table. Column filters target the
+            other columns of its table.
+        shape (Any): The shape of the filters.
+
+    Returns:
+        The filter clause for the SQL query.
+    """
+    if shape is None:
+        return None
+
+    key, operator, *rest = shape
+
+    if key == "$and":
+        return and_(*[build_filter_clause(json_col, subshape) for subshape in operator])
+
+    if key == "$or":
+        return or_(*[build_filter_clause(json_col, subshape) for subshape in operator])
+
+    (param_name,) = rest
+
+    if key.startswith("$") and key[1:] in FILTER_COLUMNS:
+        return build_column_clause(json_col.table.c[key[1:]], operator, param_name)
+
+    if operator == "$contains":
+        contains_value = bindparam(param_name, type_=postgresql.JSONB)
+        return json_col.op("@>")(cast(contains_value, postgresql.JSONB))
+
+    if operator == "$in":
+        # bind the scalars as a single postgres array of jsonb so we can directly
+        # compare json types in the query and the statement does not depend on the
+        # number of scalars
+        array_type = postgresql.ARRAY(postgresql.JSONB, dimensions=1)
+        contains_values = cast(bindparam(param_name, type_=array_type), array_type)
+        return json_col.op("->")(key) == any_(contains_values)
+
+    matches_value = cast(
+        bindparam(param_name, type_=postgresql.JSONB), postgresql.JSONB
+    )
+
+    # handles non-singular values
+    if operator == "$eq":
+        return json_col.op("->")(key) == matches_value
+
+    elif operator == "$ne":
+        return json_col.op("->")(key) != matches_value
+
+    elif operator == "$lt":
+        return json_col.op("->")(key) < matches_value
+
+    elif operator == "$lte":
+        return json_col.op("->")(key) <= matches_value
+
+    elif operator == "$gt":
+        return json_col.op("->")(key) > matches_value
+
+    elif operator == "$gte":
+        return json_col.op("->")(key) >= matches_value
+
+    else:
+        raise Unreachable()
+
+
+def build_column_clause(col: Column, operator: str, param_name: Optional[str]):
+    """
+    PRIVATE
+
+    Builds the clause for a filter on one of `FILTER_COLUMNS`.
+
+    Comparisons are made against the typed column, so the planner can use its btree index.
+
+    Args:
+        col (Column): The column to compare.
+        operator (str): The filter operator, e.g. "$eq".
+        param_name (Optional[str]): The name of the bind parameter holding the value, or None
+            to compare with NULL.
+
+    Returns:
+        The filter clause.
+    """
+    if param_name is None:
+        return col.is_(None) if operator == "$eq" else col.isnot(None)
+
+    if operator == "$in":
+        # bound as a single array so that the statement does not depend on the number of values
+        array_type = postgresql.ARRAY(BIGINT, dimensions=1)
+        return col == any_(cast(bindparam(param_name, type_=array_type), array_type))
+
+    value = bindparam(param_name, type_=BIGINT)
+
+    if operator == "$eq":
+        return col == value
+
+    elif operator == "$ne":
+        return col != value
+
+    elif operator == "$lt":
+        return col < value
+
+    elif operator == "$lte":
+        return col <= value
+
+    elif operator == "$gt":
+        return col > value
+
+    elif operator == "$gte":
+        return col >= value
+
+    else:
+        raise Unreachable()
+
+
+# Columns that allow and deny lists can restrict, and the SQL type of their values
+ID_LIST_COLUMNS = {
+    "id": Text,
+    "doc_instance_id": BIGINT,
+    "memento_membership": BIGINT,
+}
+
+
+def parameterize_id_lists(
+    allow: Optional[Dict[str, Iterable[Any]]], deny: Optional[Dict[str, Iterable[Any]]]
+) -> Tuple[Tuple[Tuple[str, str], ...], Dict[str, List[Any]]]:
+    """
+    PRIVATE
+
+    Validates allow and deny lists and separates their structure from their values.
+
+    Each list is bound as a single array parameter, so the statement neither grows nor
+    changes with the number of values.
+
+    Args:
+        allow (Optional[Dict[str, Iterable]]): Values that matching records must have, keyed by column.
+        deny (Optional[Dict[str, Iterable]]): Values that matching records must not have, keyed by column.
+
+    Raises:
+        ArgError: If a column can not be restricted, or a list has values of the wrong type.
+
+    Returns:
+        Tuple[Tuple[Tuple[str, str], ...], Dict[str, List[Any]]]: The hashable shape of the lists as
+            (kind, column) pairs, and the bind parameter values keyed by `<kind>_<column>`.
+    """
+    shape = []
+    params: Dict[str, List[Any]] = {}
+
+    for kind, lists in (("allow", allow), ("deny", deny)):
+        if lists is None:
+            continue
+        if not isinstance(lists, dict):
+            raise ArgError(f"{kind} must be a dict of column names to lists of values")
+
+        for column_name, values in sorted(lists.items()):
+            if column_name not in ID_LIST_COLUMNS:
+                raise ArgError(
+                    f"{kind} lists may only restrict {', '.join(ID_LIST_COLUMNS)}"
+                )
+            if isinstance(values, (str, bytes)):
+                raise ArgError(
+                    f"{kind} list for {column_name} must be a list of values"
+                )
+
+            values = list(values)
+            if column_name == "id":
+                valid = all(isinstance(x, str) for x in values)
+            else:
+                valid = all(
+                    isinstance(x, int) and not isinstance(x, bool) for x in values
+                )
+            if not valid:
+                raise ArgError(
+                    f"{kind} list for {column_name} has values of the wrong type"
+                )
+
+            shape.append((kind, column_name))
+            params[f"{kind}_{column_name}"] = values
+
+    return tuple(shape), params
+
+
+def build_id_list_clauses(
+    table: Table, shape: Tuple[Tuple[str, str], ...]
+) -> List[Any]:
+    """
+    PRIVATE
+
+    Builds the clauses for a shape produced by `parameterize_id_lists`.
+    Values are referenced as bind parameters and must be supplied at execution.
+
+    Args:
+        table (Table): The collection's table.
+        shape (Tuple[Tuple[str, str], ...]): The shape of the allow and deny lists.
+
+    Returns:
+        List[ColumnElement]: One clause per list, all of which must hold.
+    """
+    clauses = []
+    for kind, column_name in shape:
+        col = table.c[column_name]
+        array_type = postgresql.ARRAY(ID_LIST_COLUMNS[column_name], dimensions=1)
+        values = cast(bindparam(f"{kind}_{column_name}", type_=array_type), array_type)
+        if kind == "allow":
+            clauses.append(col == any_(values))
+        else:
+            # records without a value are not on the deny list
+            clauses.append(or_(col.is_(None), col != all_(values)))
+    return clauses
+
+
+def build_filters(json_col: Column, filters: Dict):
+    """
+    PRIVATE
+
+    Builds filters for SQL query based on provided dictionary.
+
+    Args:
+        json_col (Column): The column in the database table.
+        filters (Dict): The dictionary specifying filter conditions.
+
+    Raises:
+        FilterError: If filter conditions are not correctly formatted.
+
+    Returns:
+        The filter clause for the SQL query, with the filter values bound.
+    """
+    shape, params = parameterize_filters(filters)
+    clause = build_filter_clause(json_col, shape)
+    if clause is None:
+        return None
+    return clause.params(params)
+
+
+def build_table(
+    name: str,
+    meta: MetaData,
+    dimension: int,
+    storage: VectorStorage = VectorStorage.vector,
+) -> Table:
     """
     PRIVATE
 
@@ -991,14 +4776,18 @@ def build_table(name: str, meta: MetaData, dimension: int) -> Table:
         name (str): The name of the table.
         meta (MetaData): MetaData instance associated with the SQL database.
         dimension: The dimension of the vectors in the collection.
+        storage: The type of the `vec` column.
     Returns:
         Table: The constructed SQL table.
     """
+    vec_type = (
+        HalfVector(dimension) if storage == VectorStorage.halfvec else Vector(dimension)
+    )
     return Table(
         name,
         meta,
         Column("id", String, primary_key=True),
-        Column("vec", Vector(dimension), nullable=True),
+        Column("vec", vec_type, nullable=True),
         Column(
             "metadata",
             postgresql.JSONB,
@@ -1,3 +1,5 @@
+from typing import List
+
 __all__ = [
     "VecsException",
     "CollectionAlreadyExists",
@@ -5,6 +7,7 @@ __all__ = [
     "ArgError",
     "FilterError",
     "IndexNotFound",
+    "UpsertError",
     "Unreachable",
 ]
 
@@ -66,6 +69,19 @@ class IndexNotFound(VecsException):
     ...
 
 
+class UpsertError(VecsException):
+    """
+    Exception raised when one or more workers of a parallel upsert fail.
+
+    Attributes:
+        errors (List[Exception]): The exceptions raised by the failed workers.
+    """
+
+    def __init__(self, message: str, errors: List[Exception]):
+        super().__init__(message)
+        self.errors = errors
+
+
 class Unreachable(VecsException):
     """
     Exception raised when an unreachable part of the code is executed.